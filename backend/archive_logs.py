@@ -0,0 +1,72 @@
+"""
+Runs log retention by hand and reads the log archive (services/log_retention).
+
+  python -m backend.archive_logs run [--dry-run] [--vacuum]
+      Archives every system_logs day past its level's retention, like the
+      nightly job. --dry-run only counts; --vacuum compacts a SQLite file
+      afterwards so it actually shrinks (it locks the database meanwhile).
+
+  python -m backend.archive_logs days
+      Lists the archived days.
+
+  python -m backend.archive_logs query --start 2026-01-01 --end 2026-01-02 [--level ERROR] [--search text] [--limit 100]
+      Prints archived events in the range as NDJSON, newest first.
+"""
+import argparse
+import json
+from datetime import datetime
+
+from sqlalchemy import text
+
+from backend import database
+from backend.services import log_retention
+
+
+def run(args):
+    report = log_retention.run(dry_run=args.dry_run)
+    verb = "Would archive" if args.dry_run else "Archived"
+    print(f"{verb} {sum(report['archived'].values())} events {report['archived']} in {report['files']} files ({report['bytes'] / 1024:.0f} KiB) in {report['seconds']}s")
+    if report["partitions_dropped"] or report["partitions_created"]:
+        print(f"Partitions dropped {report['partitions_dropped']}, created {report['partitions_created']}")
+    if args.vacuum and not args.dry_run and database.engine.dialect.name == "sqlite":
+        with database.engine.connect() as conn:
+            conn.execute(text("VACUUM"))
+        print("Vacuumed")
+
+
+def days(args):
+    for entry in log_retention.archived_days():
+        print(f"{entry['day']}  {','.join(entry['levels']):<28} {entry['files']:>3} files {entry['bytes'] / 1024:>8.0f} KiB")
+
+
+def query(args):
+    events = log_retention.query_archive(
+        datetime.fromisoformat(args.start), datetime.fromisoformat(args.end),
+        level=args.level, event_type=args.event_type, search=args.search, limit=args.limit,
+    )
+    for event in events:
+        print(json.dumps(event, default=str))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("--dry-run", action="store_true")
+    run_parser.add_argument("--vacuum", action="store_true")
+    run_parser.set_defaults(handler=run)
+    commands.add_parser("days").set_defaults(handler=days)
+    query_parser = commands.add_parser("query")
+    query_parser.add_argument("--start", required=True)
+    query_parser.add_argument("--end", required=True)
+    query_parser.add_argument("--level")
+    query_parser.add_argument("--event-type")
+    query_parser.add_argument("--search")
+    query_parser.add_argument("--limit", type=int, default=100)
+    query_parser.set_defaults(handler=query)
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+What keeping article bodies out of the hot row saves: query time and
+memory per 10k articles, and the size of the articles table.
+
+Seeds a temporary SQLite file (fully migrated, with the search index)
+with --articles articles carrying an HTML summary and a --body-words
+content body, like full-text feeds. Then measures, per storage layout:
+
+  eager        every column loaded, as before bodies were deferred
+  deferred     the default: bodies stay in articles, loaded on access
+  compressed   bodies moved to article_bodies by article_bodies.compact()
+
+Workloads: loading all articles like the weekly report queries, paging
+through /articles 100 at a time, building the generate_trend_summary
+lines, and GET /articles/{id}/content. Memory is the tracemalloc peak of
+the report load. Sizes come from SQLite's dbstat, the file after VACUUM.
+
+Usage: python -m backend.benchmarks.bench_article_bodies [--articles 10000] [--body-words 800] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from fastapi import Response
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker, undefer_group
+
+from backend import database, migrations, models
+from backend.benchmarks.bench_search import VOCABULARY, Words
+from backend.routers import articles as articles_router
+from backend.services import ai_service, article_bodies
+
+CHUNK = 1000
+
+
+def paragraphs(words: Words, count: int) -> str:
+    out = []
+    while count > 0:
+        size = min(count, words.rng.randint(40, 90))
+        out.append(f"<p>{' '.join(words.pick(size)).capitalize()}.</p>")
+        count -= size
+    return "\n".join(out)
+
+
+def seed(engine, words: Words, article_count: int, body_words: int):
+    rng, now = words.rng, datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, article_count, CHUNK):
+            rows = []
+            for i in range(start, min(start + CHUNK, article_count)):
+                summary = paragraphs(words, 60)
+                rows.append({
+                    "feed_id": 1, "title": " ".join(words.pick(8)).capitalize(), "url": f"https://example.com/{i}",
+                    "summary": summary, "content": paragraphs(words, body_words),
+                    "plain_text": " ".join(words.pick(body_words)), "excerpt": summary[3:300], "word_count": body_words,
+                    "published_at": now - timedelta(minutes=rng.randrange(0, 60 * 24 * 7)), "created_at": now,
+                    "steepv_category": "Social", "industry": "Retail", "signal_strength": "medium",
+                    "classification_status": "done", "is_featured": False,
+                })
+            conn.execute(models.Article.__table__.insert(), rows)
+        conn.execute(text("ANALYZE"))
+
+
+def table_mb(engine, table: str) -> float:
+    with engine.connect() as conn:
+        return (conn.execute(text(
+            "SELECT sum(pgsize) FROM dbstat WHERE name IN (SELECT name FROM sqlite_master WHERE tbl_name = :table)"
+        ), {"table": table}).scalar() or 0) / 2 ** 20
+
+
+def measure(engine, repeat: int, eager: bool, per: float) -> dict:
+    Session = sessionmaker(bind=engine)
+
+    def report_query(db):
+        query = db.query(models.Article).filter(models.Article.signal_strength.in_(["medium", "strong"]))
+        if eager:
+            query = query.options(undefer_group("body"))
+        return query.all()
+
+    def list_pages(db):
+        cursor, rows = None, 0
+        while True:
+            response = Response()
+            page = articles_router.read_articles(response=response, limit=100, cursor=cursor, db=db)
+            rows += len(page)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return rows
+
+    def summary_lines(db):
+        return "\n".join(ai_service._article_line(article) for article in report_query(db))
+
+    def timed(run) -> float:
+        timings = []
+        for _ in range(repeat):
+            db = Session()
+            start = time.perf_counter()
+            run(db)
+            timings.append(time.perf_counter() - start)
+            db.close()
+        return statistics.median(timings) * 1000
+
+    db = Session()
+    tracemalloc.start()
+    report_query(db)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.close()
+
+    def content(db):
+        for article_id in range(1, 101):
+            article_bodies.get(db, article_id)
+
+    return {
+        "report ms": timed(report_query) * per,
+        "report MiB": peak / 2 ** 20 * per,
+        "/articles ms": timed(list_pages) * per,
+        "summary lines ms": timed(summary_lines) * per,
+        "content ms/call": timed(content) / 100,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--body-words", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="foresight-bodies-")
+    inline_path = os.path.join(tmp_dir, "inline.db")
+    compressed_path = os.path.join(tmp_dir, "compressed.db")
+    engine = database.make_engine(f"sqlite:///{inline_path}")
+    migrations.upgrade(engine)
+    start = time.perf_counter()
+    seed(engine, Words(random.Random(7), VOCABULARY), args.articles, args.body_words)
+    with engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+    engine.dispose()
+    shutil.copy(inline_path, compressed_path)
+    print(f"Seeded {args.articles} articles ({args.body_words}-word bodies) in {time.perf_counter() - start:.1f}s")
+
+    compressed_engine = database.make_engine(f"sqlite:///{compressed_path}")
+    db = sessionmaker(bind=compressed_engine)()
+    start = time.perf_counter()
+    moved = article_bodies.compact(db)
+    db.close()
+    print(f"compact() moved {moved} bodies in {time.perf_counter() - start:.1f}s")
+    with compressed_engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+
+    engine = database.make_engine(f"sqlite:///{inline_path}")
+    per = 10000 / args.articles
+    try:
+        layouts = [
+            ("eager", engine, inline_path, True),
+            ("deferred", engine, inline_path, False),
+            ("compressed", compressed_engine, compressed_path, False),
+        ]
+        results = {name: measure(layout_engine, args.repeat, eager, per) for name, layout_engine, _, eager in layouts}
+        for name, layout_engine, path, _ in layouts:
+            results[name]["articles MiB"] = table_mb(layout_engine, "articles")
+            results[name]["article_bodies MiB"] = table_mb(layout_engine, "article_bodies")
+            results[name]["file MiB"] = os.path.getsize(path) / 2 ** 20
+
+        print(f"Per 10k articles; sizes for {args.articles}")
+        print(f"{'':<20}" + "".join(f"{name:>12}" for name, *_ in layouts))
+        for key in results["eager"]:
+            print(f"{key:<20}" + "".join(f"{results[name][key]:>12.2f}" for name, *_ in layouts))
+    finally:
+        engine.dispose()
+        compressed_engine.dispose()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+LLM calls, tokens and wall time to classify 100 articles with the old
+per-article prompt versus the batched JSON-array prompt.
+
+By default the model is a local stand-in that answers like Gemini would
+(heuristic labels, optional dropped items to exercise re-sends) after a
+fixed per-call latency; token counts are then estimated at ~4 characters
+per token. With --live and GEMINI_API_KEY set, the real API is used and
+its reported token counts are taken instead.
+
+Usage: python -m backend.benchmarks.bench_classification [--articles 100] [--batch-size 20] [--latency 0.8] [--drop 0.05] [--live]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import time
+
+from backend.benchmarks.common import temp_session
+from backend.services import ai_service, settings_service
+
+TOPICS = [
+    "New AI chip doubles data center efficiency",
+    "Central bank signals a change in interest rate policy",
+    "Coastal cities plan for rising sea levels and carbon limits",
+    "Election reform bill passes the senate",
+    "Survey shows trust in institutions keeps falling",
+    "Remote education reshapes demographic trends in small towns",
+]
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class StandInModel:
+    """Answers classification prompts locally after `latency` seconds."""
+
+    def __init__(self, latency: float, drop: float, seed: int = 7):
+        self.latency = latency
+        self.drop = drop
+        self.random = random.Random(seed)
+
+    def generate_content(self, prompt: str):
+        time.sleep(self.latency)
+        if "Noticias (JSON):" in prompt:
+            items = json.loads(prompt.split("Noticias (JSON):", 1)[1])
+            answers = []
+            for item in items:
+                if self.random.random() < self.drop:
+                    continue
+                category, industry, _ = ai_service.categorize_article_heuristic(item["title"], item["summary"])
+                answers.append({"id": item["id"], "category": category, "reason": "Stand-in", "industry": industry})
+            return _Response(json.dumps(answers))
+        title = re.search(r"Noticia: (.*?) –", prompt).group(1)
+        category, industry, _ = ai_service.categorize_article_heuristic(title, "")
+        return _Response(f'{{"category": "{category}"}}\n{{"reason": "Stand-in"}}\n{{"industry": "{industry}"}}')
+
+
+def make_items(count: int) -> list:
+    return [
+        {"id": i + 1, "title": f"{TOPICS[i % len(TOPICS)]} ({i})", "summary": f"Excerpt for article {i}: {TOPICS[i % len(TOPICS)].lower()}.", "industry": ""}
+        for i in range(count)
+    ]
+
+
+def run_per_article(db, items, model) -> dict:
+    usage = {}
+    start = time.perf_counter()
+    for item in items:
+        ai_service.categorize_article_with_gemini(item["title"], item["summary"], db, model=model, usage=usage, use_cache=False)
+    return {**usage, "seconds": time.perf_counter() - start, "classified": len(items)}
+
+
+def run_batched(db, items, model, batch_size: int) -> dict:
+    usage = {}
+    start = time.perf_counter()
+    results = ai_service.categorize_articles_with_gemini(items, db, batch_size=batch_size, model=model, usage=usage, use_cache=False)
+    return {**usage, "seconds": time.perf_counter() - start, "classified": len(results)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=ai_service.CLASSIFICATION_BATCH_SIZE)
+    parser.add_argument("--latency", type=float, default=0.8, help="Stand-in seconds per call")
+    parser.add_argument("--drop", type=float, default=0.05, help="Stand-in share of items left out of a batch reply")
+    parser.add_argument("--live", action="store_true", help="Call Gemini (needs GEMINI_API_KEY)")
+    args = parser.parse_args()
+
+    db = temp_session()
+    if args.live:
+        settings_service.set_value(db, "gemini_api_key", os.environ["GEMINI_API_KEY"])
+        model = ai_service.get_llm_client(db)
+    else:
+        model = StandInModel(args.latency, args.drop)
+
+    items = make_items(args.articles)
+    scale = 100 / args.articles
+    print(f"{args.articles} articles, batch size {args.batch_size}, {'live Gemini' if args.live else 'stand-in model'}")
+    print(f"{'path':<12} {'calls':>7} {'prompt tok':>11} {'output tok':>11} {'seconds':>9} {'classified':>11}   (per 100 articles)")
+    for name, stats in [
+        ("per-article", run_per_article(db, items, model)),
+        ("batched", run_batched(db, items, model, args.batch_size)),
+    ]:
+        print(
+            f"{name:<12} {stats['calls'] * scale:>7.1f} {stats['prompt_tokens'] * scale:>11.0f} "
+            f"{stats['output_tokens'] * scale:>11.0f} {stats['seconds'] * scale:>9.2f} {stats['classified']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
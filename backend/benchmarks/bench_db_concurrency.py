@@ -0,0 +1,136 @@
+"""
+Concurrent ingest writes and /articles reads on SQLite, with the default
+rollback journal versus the WAL mode and pragmas database.make_engine applies.
+
+One writer thread stores batches of new entries through
+rss_service.store_entries (plus their classification jobs) and commits each
+batch, like a feed poll. Reader threads call the /articles endpoint
+function with random filters. Reported: read latency percentiles, reads and
+articles written per second, and "database is locked" errors on either side.
+
+Usage: python -m backend.benchmarks.bench_db_concurrency [--seconds 10] [--readers 4] [--batch 50] [--seed-articles 20000]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend import database, migrations, models
+from backend.benchmarks.explain_plans import seed
+from backend.routers import articles as articles_router
+from backend.services import rss_service
+
+CATEGORIES = [None, "Social", "Technological", "Economic", "Environmental", "Political", "Values"]
+
+
+def make_records(start: int, count: int) -> list:
+    now = datetime.utcnow()
+    return [
+        {
+            "url": f"https://feed.example.com/{i}", "title": f"Entry {i}", "summary": f"<p>Summary of entry {i}</p>",
+            "content": None, "published_at": now, "image_url": None,
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def run(tuned: bool, seconds: float, readers: int, batch: int, seed_articles: int) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="foresight-concurrency-")
+    os.close(fd)
+    engine = database.make_engine(f"sqlite:///{path}", tuned=tuned)
+    migrations.upgrade(engine)
+    seed(engine, seed_articles, 0)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as db:
+        feed = models.Feed(name="Bench", url="https://feed.example.com/rss")
+        db.add(feed)
+        db.commit()
+        feed_id = feed.id
+
+    stop = time.monotonic() + seconds
+    latencies, stats, lock = [], {"written": 0, "write_errors": 0, "read_errors": 0}, threading.Lock()
+
+    def writer():
+        db = Session()
+        feed = db.get(models.Feed, feed_id)
+        cutoff = datetime.utcnow() - timedelta(days=7)
+        next_id = 0
+        while time.monotonic() < stop:
+            try:
+                result = rss_service.store_entries(db, feed, make_records(next_id, batch), cutoff)
+                db.commit()
+                next_id += batch
+                with lock:
+                    stats["written"] += result["new"]
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    stats["write_errors"] += 1
+        db.close()
+
+    def reader(seed_value: int):
+        rng = random.Random(seed_value)
+        db = Session()
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            try:
+                articles_router.read_articles(category=rng.choice(CATEGORIES), db=db)
+                db.rollback() # end the read transaction like the request's session close would
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    stats["read_errors"] += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+        db.close()
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    latencies.sort()
+    return {
+        "reads_per_second": len(latencies) / seconds,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        "written_per_second": stats["written"] / seconds,
+        "read_errors": stats["read_errors"],
+        "write_errors": stats["write_errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=50, help="Entries per ingest commit")
+    parser.add_argument("--seed-articles", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers of /articles and 1 ingest writer ({args.batch} entries per commit) for {args.seconds:.0f}s over {args.seed_articles} articles")
+    print(f"{'mode':<9} {'reads/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'written/s':>10} {'read errs':>10} {'write errs':>11}")
+    for name, tuned in (("default", False), ("wal", True)):
+        r = run(tuned, args.seconds, args.readers, args.batch, args.seed_articles)
+        print(
+            f"{name:<9} {r['reads_per_second']:>8.0f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['max_ms']:>8.1f} "
+            f"{r['written_per_second']:>10.0f} {r['read_errors']:>10} {r['write_errors']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Cost of logging to the caller: the old log_event (a row and a commit on the
+caller's session per event) versus the queued background writer.
+
+Scenarios, each against its own throwaway SQLite file:
+  sync       legacy row-and-commit per event
+  sink       logger.EventSink with the default queue and batch size
+  burst      a sink with a --small-queue queue, so part of the burst is dropped
+  sampled    a sink keeping --sample-rate of FEED events below WARNING
+
+Reported: caller-side microseconds per event, time until everything is
+written, rows in system_logs, write batches and dropped events.
+
+Usage: python -m backend.benchmarks.bench_event_sink [--events 20000] [--small-queue 500] [--sample-rate 0.1]
+"""
+import argparse
+import time
+
+from backend import models
+from backend.benchmarks.bench_ingest import legacy_log
+from backend.benchmarks.common import temp_engine, temp_session
+from backend.services import logger
+
+
+def events(count: int):
+    for i in range(count):
+        level = "ERROR" if i % 50 == 0 else "INFO"
+        yield level, "FEED", f"Fetched {i % 7} new articles from Feed {i % 40}", {"feed_id": i % 40, "new": i % 7}
+
+
+def run_sync(count: int) -> dict:
+    db = temp_session(temp_engine())
+    start = time.perf_counter()
+    for level, event_type, message, details in events(count):
+        legacy_log(db, level, event_type, message, details)
+    seconds = time.perf_counter() - start
+    rows = db.query(models.SystemLog).count()
+    db.close()
+    return {"caller_us": seconds / count * 1e6, "written_s": seconds, "rows": rows, "batches": count, "dropped": 0}
+
+
+def run_sink(count: int, **options) -> dict:
+    engine = temp_engine()
+    sink = logger.EventSink(**options)
+    start = time.perf_counter()
+    for level, event_type, message, details in events(count):
+        sink.emit(engine, level, event_type, message, details)
+    caller = time.perf_counter() - start
+    sink.flush(timeout=60)
+    written = time.perf_counter() - start
+    sink.shutdown()
+    db = temp_session(engine)
+    rows = db.query(models.SystemLog).count()
+    db.close()
+    stats = sink.stats()
+    return {"caller_us": caller / count * 1e6, "written_s": written, "rows": rows, "batches": stats["batches"], "dropped": stats["dropped"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--small-queue", type=int, default=500)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("sync", lambda: run_sync(args.events)),
+        ("sink", lambda: run_sink(args.events)),
+        ("burst", lambda: run_sink(args.events, queue_size=args.small_queue)),
+        ("sampled", lambda: run_sink(args.events, sample_rates={"FEED": args.sample_rate})),
+    ]
+    print(f"{args.events} events, 1 in 50 at ERROR")
+    print(f"{'scenario':<9} {'caller us/event':>16} {'all written s':>14} {'rows':>7} {'batches':>8} {'dropped':>8}")
+    for name, run in scenarios:
+        r = run()
+        print(f"{name:<9} {r['caller_us']:>16.1f} {r['written_s']:>14.2f} {r['rows']:>7} {r['batches']:>8} {r['dropped']:>8}")
+
+
+if __name__ == "__main__":
+    main()
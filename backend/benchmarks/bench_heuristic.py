@@ -0,0 +1,108 @@
+"""
+Throughput and accuracy of the keyword fallback classifier: the old
+substring scan versus heuristic_classifier.
+
+Throughput is measured on a synthetic corpus. Accuracy is checked against
+curated labels in the database: articles an editor has rated (signal
+strength other than pending) whose STEEPV category is one of the six.
+
+Usage: python -m backend.benchmarks.bench_heuristic [--articles 20000] [--db sqlite:///./foresight.db]
+"""
+import argparse
+import random
+import time
+
+from sqlalchemy import create_engine, text
+
+from backend import database
+from backend.services import ai_service, heuristic_classifier
+
+# Words that contain a keyword without being one ("said", "media", "email"...) are what the old scan misfired on
+FILLER = (
+    "the a of to in and said media report company growth new year first week after before against maintain "
+    "detail plain aid paid email remain certain campaign domain obtain medal remedy lawn gasp storey shopping"
+).split()
+KEYWORDS = "people market policy climate energy data health election trust trade investment software government carbon education belief bank solar".split()
+
+
+def legacy_heuristic(title: str, summary: str):
+    """The previous fallback: maps rebuilt per call and plain substring checks."""
+    text = (title + " " + summary).lower()
+    steepv_map = {
+        "Social": ["society", "people", "culture", "demographic", "education", "health"],
+        "Technological": ["ai", "software", "hardware", "digital", "tech", "cyber", "data"],
+        "Economic": ["money", "market", "finance", "trade", "economy", "business", "investment"],
+        "Environmental": ["climate", "carbon", "nature", "green", "energy", "sustainability"],
+        "Political": ["law", "government", "policy", "regulation", "vote", "election"],
+        "Values": ["ethics", "moral", "belief", "religion", "trust"]
+    }
+    detected_steepv = "Uncategorized"
+    for category, keywords in steepv_map.items():
+        if any(k in text for k in keywords):
+            detected_steepv = category
+            break
+    industry_map = {
+        "Technology": ["tech", "software", "saas"],
+        "Finance": ["bank", "crypto", "stock"],
+        "Healthcare": ["health", "med", "pharma"],
+        "Energy": ["oil", "gas", "solar", "wind"],
+        "Retail": ["shop", "commerce", "store"]
+    }
+    detected_industry = "General"
+    for industry, keywords in industry_map.items():
+        if any(k in text for k in keywords):
+            detected_industry = industry
+            break
+    return detected_steepv, detected_industry, "Heuristic fallback"
+
+
+def make_corpus(count: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+
+    def words(k):
+        # Roughly one keyword in twenty words, like real news copy
+        return " ".join(rng.choice(KEYWORDS) if rng.random() < 0.05 else rng.choice(FILLER) for _ in range(k))
+
+    return [(words(10).capitalize(), words(60)) for _ in range(count)]
+
+
+def curated_labels(url: str) -> list:
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT title, COALESCE(excerpt, summary, ''), steepv_category FROM articles "
+            "WHERE signal_strength IS NOT NULL AND signal_strength != 'pending'"
+        )).fetchall()
+    return [(row[0] or "", row[1] or "", row[2]) for row in rows if row[2] in ai_service.STEEPV_CATEGORIES]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--db", default=database.SQLALCHEMY_DATABASE_URL, help="Database URL with curated articles")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.articles)
+    print(f"Throughput over {args.articles} synthetic articles")
+    for name, run in [
+        ("legacy", lambda: [legacy_heuristic(t, s) for t, s in corpus]),
+        ("compiled", lambda: heuristic_classifier.classify_many(corpus)),
+    ]:
+        start = time.perf_counter()
+        results = run()
+        seconds = time.perf_counter() - start
+        tech_share = sum(1 for r in results if r[0] == "Technological") / len(results)
+        print(f"  {name:<9} {seconds:>7.3f}s  {len(corpus) / seconds:>10.0f} articles/s  Technological share {tech_share:.0%}")
+
+    labelled = curated_labels(args.db)
+    if not labelled:
+        print(f"No curated articles with a STEEPV label in {args.db}; skipping the accuracy check")
+        return
+    print(f"Accuracy against {len(labelled)} curated labels in {args.db}")
+    for name, classify in [("legacy", legacy_heuristic), ("compiled", heuristic_classifier.classify)]:
+        correct = sum(1 for title, summary, label in labelled if classify(title, summary)[0] == label)
+        print(f"  {name:<9} {correct / len(labelled):.1%} ({correct}/{len(labelled)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Peak RSS and wall time of the full (feedparser) and incremental parsers on a
+large synthetic RSS feed where only the first few entries are new.
+
+Each run happens in a fresh process so peak RSS is not shared between runs.
+
+Usage: python -m backend.benchmarks.bench_incremental_parse [--entries 20000] [--new 20]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+
+
+def write_feed(path: str, entries: int):
+    now = datetime.utcnow()
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><title>Synthetic</title>\n')
+        for i in range(entries):
+            published = format_datetime(now - timedelta(minutes=10 * i))
+            f.write(
+                f"<item><title>Synthetic paper {i}</title><link>https://example.com/abs/{i}</link>"
+                f"<description>&lt;p&gt;Abstract {i}: {'lorem ipsum dolor sit amet ' * 20}&lt;/p&gt;</description>"
+                f"<content:encoded>&lt;p&gt;{'Body text for the paper. ' * 40}&lt;/p&gt;</content:encoded>"
+                f"<pubDate>{published}</pubDate></item>\n"
+            )
+        f.write("</channel></rss>\n")
+
+
+def _run(path: str, mode: str, new: int, queue):
+    from backend.services import feed_parser
+
+    with open(path, "rb") as f:
+        body = f.read()
+    known = {f"https://example.com/abs/{i}" for i in range(new, new + 50)}
+    cutoff = datetime.utcnow() - timedelta(days=7)
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = feed_parser.parse_feed(body, "https://example.com/feed", "application/rss+xml", cutoff, known, mode=mode)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put({
+        "mode": mode,
+        "seconds": elapsed,
+        "peak_rss_mb": peak / 1024,
+        "parse_rss_mb": (peak - baseline) / 1024,
+        "records": len(result["records"]),
+        "entries_seen": result["entries_seen"],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--new", type=int, default=20)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".xml", prefix="foresight-bench-")
+    os.close(fd)
+    try:
+        write_feed(path, args.entries)
+        print(f"Feed: {args.entries} entries, {os.path.getsize(path) / 1e6:.1f} MB, {args.new} new")
+        context = multiprocessing.get_context("spawn")
+        for mode in ("full", "incremental"):
+            queue = context.Queue()
+            process = context.Process(target=_run, args=(path, mode, args.new, queue))
+            process.start()
+            r = queue.get()
+            process.join()
+            print(f"{r['mode']:12} time={r['seconds'] * 1000:9.1f} ms  peak_rss={r['peak_rss_mb']:7.1f} MB  "
+                  f"parse_rss=+{r['parse_rss_mb']:6.1f} MB  entries_seen={r['entries_seen']:6}  records={r['records']}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
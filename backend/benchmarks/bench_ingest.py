@@ -0,0 +1,94 @@
+"""
+Compares the old per-entry ingestion loop with the batched path in
+rss_service.store_entries: queries issued and wall time per feed.
+
+Usage: python -m backend.benchmarks.bench_ingest [--entries 200]
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from backend import models
+from backend.benchmarks.common import QueryCounter, temp_engine, temp_session, timed
+from backend.services import ai_service, rss_service
+
+
+def make_records(feed_index: int, count: int) -> list:
+    now = datetime.utcnow()
+    return [
+        {
+            "title": f"Synthetic article {feed_index}-{i} on energy markets",
+            "url": f"https://example.com/{feed_index}/{i}",
+            "summary": f"<p>Summary for article {i}</p>",
+            "content": f"<p>Content for article {i}</p>",
+            "image_url": None,
+            "published_at": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_log(db, level, event_type, message, details):
+    """logger.log_event as it was: a row on the caller's session and a commit."""
+    db.add(models.SystemLog(level=level, event_type=event_type, message=message, details=details))
+    db.commit()
+
+
+def legacy_store(db, feed, records, cutoff):
+    """The pre-batching loop: one lookup, one add and one log commit per entry."""
+    new = 0
+    for record in records:
+        existing = db.query(models.Article).filter(models.Article.url == record["url"]).first()
+        if existing:
+            legacy_log(db, "DEBUG", "FEED", f"Skipping existing article: {record['title']}", {"feed_id": feed.id, "url": record["url"]})
+            continue
+        if record["published_at"] and record["published_at"] < cutoff:
+            continue
+        steepv, ai_industry, reason = ai_service.categorize_article(record["title"], record["summary"], db)
+        db.add(models.Article(
+            feed_id=feed.id, title=record["title"], url=record["url"], summary=record["summary"],
+            content=record["content"], image_url=record["image_url"], published_at=record["published_at"],
+            steepv_category=steepv, industry=feed.category or ai_industry, ai_reasoning=reason, is_featured=False,
+        ))
+        new += 1
+        legacy_log(db, "INFO", "FEED", f"New article found: {record['title']}", {"feed_id": feed.id})
+    db.commit()
+    return new
+
+
+def batched_store(db, feed, records, cutoff):
+    stats = rss_service.store_entries(db, feed, records, cutoff)
+    db.commit()
+    return stats["new"]
+
+
+def run(store, entries: int, feed_index: int) -> dict:
+    engine = temp_engine()
+    db = temp_session(engine)
+    feed = models.Feed(name="Bench", url=f"https://example.com/feed/{feed_index}", category="Energy")
+    db.add(feed)
+    db.commit()
+
+    records = make_records(feed_index, entries)
+    cutoff = datetime.utcnow() - timedelta(days=7)
+    results = {}
+
+    for phase in ("all new", "all existing"):
+        with QueryCounter(engine) as counter, timed(results, phase):
+            new = store(db, feed, records, cutoff)
+        results[phase] = {"queries": counter.count, "seconds": results[phase], "new": new}
+    db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=200)
+    args = parser.parse_args()
+
+    for index, (name, store) in enumerate((("legacy", legacy_store), ("batched", batched_store))):
+        for phase, r in run(store, args.entries, index).items():
+            print(f"{name:8} {phase:13} new={r['new']:4}  queries={r['queries']:5}  time={r['seconds'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
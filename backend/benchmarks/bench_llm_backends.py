@@ -0,0 +1,128 @@
+"""
+AI throughput under each LLM backend: classification throughput, trend
+report latency and retry behavior under simulated quota pressure.
+
+Scenarios:
+  heuristic   in-process HeuristicModel: the pipeline's own overhead
+  standin     the HTTP stand-in with --latency per call and no faults
+  quota       the stand-in enforcing --quota-rpm and answering a share of
+              calls with random 429s, while the rate limiter is set to
+              --limiter-rpm (above the quota, so calls do get throttled)
+
+The stand-in server runs in this process on a free port. Classification
+runs --workers threads, each sending batches of --batch-size like the
+queue workers do. Change those, the map concurrency (TREND_MAP_CONCURRENCY)
+or the latency to tune them offline.
+
+Usage: python -m backend.benchmarks.bench_llm_backends [--articles 400] [--batch-size 20] [--workers 2] [--report-articles 200] [--latency 0.3] [--quota-rpm 60] [--limiter-rpm 90] [--throttle-rate 0.05]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.benchmarks.common import temp_engine
+from backend.benchmarks.bench_classification import make_items
+from backend.benchmarks.bench_trend_summary import make_articles
+from backend.services import ai_service, llm_backends, llm_rate_limiter
+from backend import standin_llm_server
+
+
+def classify(Session, items: list, batch_size: int, workers: int) -> dict:
+    """Batches of batch_size spread over `workers` threads, one session each."""
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+    def run(batch):
+        db = Session()
+        try:
+            return len(ai_service.categorize_articles_with_gemini(batch, db, batch_size=batch_size, use_cache=False))
+        except Exception:
+            return 0
+        finally:
+            db.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        classified = sum(executor.map(run, batches))
+    seconds = time.perf_counter() - start
+    return {"classified": classified, "seconds": seconds, "per_second": classified / seconds}
+
+
+def report(Session, articles: list) -> dict:
+    db = Session()
+    stats, events, first_text = {}, [], []
+    start = time.perf_counter()
+    try:
+        text = ai_service.generate_trend_summary(
+            articles, db, use_cache=False, stats=stats, progress=events.append,
+            on_text=lambda chunk: first_text or first_text.append(time.perf_counter() - start),
+        )
+    finally:
+        db.close()
+    return {
+        "seconds": time.perf_counter() - start,
+        "first_text": first_text[0] if first_text else None,
+        "calls": stats.get("llm_calls", 0),
+        "ok": not text.startswith(("Error", "Failed")),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=400)
+    parser.add_argument("--batch-size", type=int, default=ai_service.CLASSIFICATION_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--report-articles", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.3, help="Stand-in seconds per call")
+    parser.add_argument("--quota-rpm", type=int, default=60, help="Stand-in quota in the quota scenario")
+    parser.add_argument("--limiter-rpm", type=int, default=90, help="Rate limiter budget in the quota scenario")
+    parser.add_argument("--throttle-rate", type=float, default=0.05, help="Share of random 429s in the quota scenario")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    args = parser.parse_args()
+
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=temp_engine())
+    items = make_items(args.articles)
+    articles = make_articles(args.report_articles)
+    scenarios = [
+        ("heuristic", None, 100000),
+        ("standin", standin_llm_server.StandIn(latency=args.latency, jitter=args.latency / 4, seed=1), 100000),
+        ("quota", standin_llm_server.StandIn(
+            latency=args.latency, jitter=args.latency / 4, rpm=args.quota_rpm,
+            throttle_rate=args.throttle_rate, retry_after=args.retry_after, seed=1,
+        ), args.limiter_rpm),
+    ]
+
+    print(f"{args.articles} articles to classify (batch {args.batch_size}, {args.workers} workers), "
+          f"report over {args.report_articles} articles (map concurrency {ai_service.TREND_MAP_CONCURRENCY})")
+    print(f"{'scenario':<10} {'classified':>10} {'art/s':>8} {'report s':>9} {'1st text s':>10} {'calls':>6} "
+          f"{'429s':>5} {'retries':>8} {'errors':>7} {'wait p95 s':>10}")
+    for name, standin, rpm in scenarios:
+        server = None
+        if standin is None:
+            llm_backends.configure("heuristic")
+        else:
+            server = standin_llm_server.serve(standin, port=0)
+            llm_backends.configure("standin", url=f"http://127.0.0.1:{server.server_address[1]}")
+        llm_rate_limiter.configure(rpm)
+        try:
+            classification = classify(Session, items, args.batch_size, args.workers)
+            summary = report(Session, articles)
+        finally:
+            if server:
+                server.shutdown()
+        lanes = llm_rate_limiter.metrics()["lanes"]
+        limiter = SimpleNamespace(**{key: sum(lane[key] for lane in lanes.values()) for key in ("throttled", "retries", "errors")})
+        p95 = max(lane["wait_p95_seconds"] for lane in lanes.values())
+        first_text = f"{summary['first_text']:.2f}" if summary["first_text"] is not None else "-"
+        print(
+            f"{name:<10} {classification['classified']:>10} {classification['per_second']:>8.1f} "
+            f"{summary['seconds']:>9.2f} {first_text:>10} {summary['calls']:>6} "
+            f"{limiter.throttled:>5} {limiter.retries:>8} {limiter.errors:>7} {p95:>10.2f}"
+            + ("" if summary["ok"] else "  (report failed)")
+        )
+
+
+if __name__ == "__main__":
+    main()
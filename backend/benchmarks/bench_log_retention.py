@@ -0,0 +1,116 @@
+"""
+What log retention does to system_logs: table size and /logs latency before
+and after archiving, the archive's size and archive query latency.
+
+Seeds a temporary SQLite file (with the m0003 search index) with --logs
+events spread over 90 days, 80% INFO, 10% WARNING, 10% ERROR, then runs
+log_retention.run with the default per-level retention into a temporary
+archive directory. Sizes come from SQLite's dbstat table: system_logs with
+its indexes and full-text index. The file size is shown after VACUUM,
+since deleted pages are otherwise only reused, not returned.
+
+Usage: python -m backend.benchmarks.bench_log_retention [--logs 1000000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from fastapi import Response
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from backend import database, migrations
+from backend.benchmarks.bench_search import VOCABULARY, Words, seed
+from backend.routers import logs as logs_router
+from backend.services import log_retention
+
+
+def log_bytes(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT sum(pgsize) FROM dbstat WHERE name IN (SELECT name FROM sqlite_master WHERE tbl_name LIKE 'system_logs%')"
+        )).scalar() or 0
+
+
+def measure(engine, path: str, repeat: int, term: str) -> dict:
+    db = sessionmaker(bind=engine)()
+
+    def timed(run) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        db.expunge_all()
+        return statistics.median(timings) * 1000
+
+    try:
+        return {
+            "rows": db.execute(text("SELECT count(*) FROM system_logs")).scalar(),
+            "table_mb": log_bytes(engine) / 2 ** 20,
+            "file_mb": os.path.getsize(path) / 2 ** 20,
+            "first page": timed(lambda: logs_router.get_logs(response=Response(), db=db)),
+            "level=ERROR": timed(lambda: logs_router.get_logs(response=Response(), level="ERROR", db=db)),
+            "search": timed(lambda: logs_router.get_logs(response=Response(), search=term, db=db)),
+            "offset 10k": timed(lambda: logs_router.get_logs(response=Response(), skip=10000, db=db)),
+            "count(*)": timed(lambda: db.execute(text("SELECT count(*) FROM system_logs")).scalar()),
+            "full export": timed(lambda: db.execute(text("SELECT * FROM system_logs")).fetchall()),
+        }
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logs", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="foresight-retention-")
+    os.close(fd)
+    archive_dir = tempfile.mkdtemp(prefix="foresight-log-archive-")
+    engine = database.make_engine(f"sqlite:///{path}")
+    migrations.upgrade(engine)
+    words = Words(random.Random(7), VOCABULARY)
+    start = time.perf_counter()
+    seed(engine, words, args.logs, 0, 0)
+    print(f"Seeded {args.logs} logs over 90 days in {time.perf_counter() - start:.1f}s")
+    print(f"Retention: {log_retention.LOG_RETENTION_DAYS_BY_LEVEL}, other levels {log_retention.LOG_RETENTION_DAYS} days")
+
+    try:
+        before = measure(engine, path, args.repeat, words.words[200])
+        report = log_retention.run(engine, archive_dir=archive_dir)
+        print(f"Archived {report['archived']} into {report['files']} files, {report['bytes'] / 2 ** 20:.1f} MiB, in {report['seconds']}s")
+        with engine.connect() as conn:
+            conn.execute(text("VACUUM"))
+        after = measure(engine, path, args.repeat, words.words[200])
+
+        print(f"{'':<13} {'before':>10} {'after':>10}")
+        print(f"{'rows':<13} {before['rows']:>10} {after['rows']:>10}")
+        print(f"{'table MiB':<13} {before['table_mb']:>10.1f} {after['table_mb']:>10.1f}")
+        print(f"{'file MiB':<13} {before['file_mb']:>10.1f} {after['file_mb']:>10.1f}")
+        for key in ("first page", "level=ERROR", "search", "offset 10k", "count(*)", "full export"):
+            print(f"{key + ' ms':<13} {before[key]:>10.1f} {after[key]:>10.1f}")
+
+        day = datetime.utcnow() - timedelta(days=40)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            found = log_retention.query_archive(day, day + timedelta(days=1), level="WARNING", limit=100, archive_dir=archive_dir)
+            timings.append(time.perf_counter() - started)
+        print(f"Archive query, one day of WARNING events: {statistics.median(timings) * 1000:.1f} ms ({len(found)} returned)")
+    finally:
+        engine.dispose()
+        shutil.rmtree(archive_dir, ignore_errors=True)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Deep paging of /logs and /articles: offset versus keyset cursor.
+
+Seeds a temporary SQLite file, then times the endpoint functions fetching
+the page at increasing depths. Offset paging has to step over every row
+before the page, so its cost grows with depth; a cursor seeks straight to
+the page through the (sort column, id) index. The cursor for each depth is
+the one the previous page returned, as a client walking the list would have.
+
+Usage: python -m backend.benchmarks.bench_pagination [--logs 1000000] [--articles 200000] [--limit 100] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from fastapi import Response
+from sqlalchemy.orm import sessionmaker
+
+from backend import database, migrations, models
+from backend.benchmarks.explain_plans import seed
+from backend.routers import articles as articles_router, logs as logs_router
+from backend.services import pagination
+
+DEPTHS = [0, 1000, 10000, 100000, 500000, 900000]
+
+
+def time_call(run, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def cursor_at(db, model, sort_column, depth: int) -> str:
+    """The cursor a client would hold after reading the first `depth` rows."""
+    if depth == 0:
+        return None
+    row = db.query(model).order_by(sort_column.desc(), model.id.desc()).offset(depth - 1).first()
+    return pagination.encode_cursor(getattr(row, sort_column.key), row.id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logs", type=int, default=1000000)
+    parser.add_argument("--articles", type=int, default=200000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="foresight-pagination-")
+    os.close(fd)
+    engine = database.make_engine(f"sqlite:///{path}")
+    migrations.upgrade(engine)
+    start = time.perf_counter()
+    seed(engine, args.articles, args.logs)
+    print(f"Seeded {args.articles} articles and {args.logs} logs in {time.perf_counter() - start:.1f}s, page size {args.limit}")
+
+    db = sessionmaker(bind=engine)()
+    endpoints = [
+        ("/logs", args.logs, models.SystemLog, models.SystemLog.timestamp,
+         lambda **kw: logs_router.get_logs(response=Response(), limit=args.limit, db=db, **kw)),
+        ("/articles", args.articles, models.Article, models.Article.published_at,
+         lambda **kw: articles_router.read_articles(response=Response(), limit=args.limit, db=db, **kw)),
+    ]
+    print(f"{'endpoint':<10} {'depth':>8} {'offset ms':>10} {'cursor ms':>10}")
+    try:
+        for name, total, model, sort_column, call in endpoints:
+            for depth in DEPTHS:
+                if depth >= total:
+                    break
+                cursor = cursor_at(db, model, sort_column, depth)
+                offset_ms = time_call(lambda: call(skip=depth), args.repeat)
+                cursor_ms = time_call(lambda: call(cursor=cursor), args.repeat)
+                db.expunge_all()
+                print(f"{name:<10} {depth:>8} {offset_ms:>10.1f} {cursor_ms:>10.1f}")
+    finally:
+        db.close()
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Full-text search latency: /articles/search and the /logs search box, with
+the m0003 indexes versus the LIKE '%term%' scan the logs search used before.
+
+Seeds a temporary SQLite file with synthetic logs and articles whose words
+follow a Zipf distribution over a made-up vocabulary, so there are common,
+middling and rare terms to search for. Rows go in through the normal
+inserts, so the sync triggers are part of the seeding time. Each query is
+timed through the endpoint functions (median of --repeat runs).
+
+Usage: python -m backend.benchmarks.bench_search [--logs 1000000] [--articles 200000] [--repeat 5]
+"""
+import argparse
+import bisect
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from fastapi import Response
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from backend import database, migrations, models
+from backend.routers import articles as articles_router, logs as logs_router
+
+VOCABULARY = 20000
+CHUNK = 10000
+LEVELS = ["INFO"] * 8 + ["WARNING", "ERROR"]
+EVENT_TYPES = ["FEED", "AI", "SYSTEM", "USER"]
+LOG_TEMPLATES = [
+    "Fetched {n} entries from {a} {b}",
+    "Classification failed for {a} {b}: {c}",
+    "Feed {a} returned {n} with {b} {c}",
+    "Trend report generated for {a} and {b}",
+    "Circuit opened for host {a} after {n} failures",
+]
+
+
+class Words:
+    """Made-up words drawn with Zipf frequencies: rank 1 is the most common."""
+
+    def __init__(self, rng: random.Random, size: int):
+        syllables = ["ka", "lo", "mi", "ne", "ru", "ta", "shi", "po", "ve", "dar", "qu", "len", "zo", "bri", "sal"]
+        seen, self.words = set(), []
+        while len(self.words) < size:
+            word = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+            if word not in seen:
+                seen.add(word)
+                self.words.append(word)
+        self.cumulative = list(itertools.accumulate(1 / rank for rank in range(1, size + 1)))
+        self.rng = rng
+
+    def pick(self, count: int = 1) -> list:
+        total = self.cumulative[-1]
+        return [self.words[bisect.bisect_left(self.cumulative, self.rng.random() * total)] for _ in range(count)]
+
+
+def seed(engine, words: Words, log_count: int, article_count: int, body_words: int):
+    rng, now = words.rng, datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, log_count, CHUNK):
+            conn.execute(models.SystemLog.__table__.insert(), [
+                {
+                    "timestamp": now - timedelta(seconds=rng.randrange(0, 3600 * 24 * 90)),
+                    "level": rng.choice(LEVELS), "event_type": rng.choice(EVENT_TYPES),
+                    "message": rng.choice(LOG_TEMPLATES).format(n=rng.randrange(1000), a=words.pick()[0], b=words.pick()[0], c=words.pick()[0]),
+                }
+                for _ in range(start, min(start + CHUNK, log_count))
+            ])
+        for start in range(0, article_count, CHUNK):
+            rows = []
+            for i in range(start, min(start + CHUNK, article_count)):
+                body = " ".join(words.pick(body_words))
+                rows.append({
+                    "feed_id": 1, "title": " ".join(words.pick(8)).capitalize(), "url": f"https://example.com/{i}", "is_featured": False,
+                    "plain_text": body, "excerpt": body[:300], "published_at": now - timedelta(minutes=rng.randrange(0, 60 * 24 * 365)),
+                    "created_at": now, "steepv_category": "Social", "signal_strength": "pending", "classification_status": "done",
+                })
+            conn.execute(models.Article.__table__.insert(), rows)
+        conn.execute(text("ANALYZE"))
+
+
+def time_call(run, repeat: int) -> tuple:
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logs", type=int, default=1000000)
+    parser.add_argument("--articles", type=int, default=200000)
+    parser.add_argument("--body-words", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="foresight-search-")
+    os.close(fd)
+    engine = database.make_engine(f"sqlite:///{path}")
+    migrations.upgrade(engine)
+    words = Words(random.Random(7), VOCABULARY)
+    start = time.perf_counter()
+    seed(engine, words, args.logs, args.articles, args.body_words)
+    print(f"Seeded {args.logs} logs and {args.articles} articles ({args.body_words} words each) in {time.perf_counter() - start:.1f}s")
+
+    common, middling, rare = words.words[0], words.words[200], words.words[15000]
+    queries = [
+        ("common term", common), ("middling term", middling), ("rare term", rare),
+        ("two terms", f"{middling} {words.words[300]}"), ("word prefix", middling[:4]),
+    ]
+    db = sessionmaker(bind=engine)()
+    print(f"{'query':<14} {'/logs ms':>9} {'rows':>5} {'LIKE ms':>9} {'rows':>5} {'/articles/search ms':>20} {'rows':>5}")
+    try:
+        for name, query in queries:
+            logs_ms, logs_rows = time_call(lambda: logs_router.get_logs(response=Response(), search=query, db=db), args.repeat)
+            like_ms, like_rows = time_call(lambda: db.query(models.SystemLog).filter(
+                models.SystemLog.message.contains(query)
+            ).order_by(models.SystemLog.timestamp.desc(), models.SystemLog.id.desc()).limit(50).all(), args.repeat)
+            articles_ms, articles_rows = time_call(lambda: articles_router.search_articles(q=query, limit=20, offset=0, category=None, industry=None, db=db), args.repeat)
+            db.expunge_all()
+            print(f"{name:<14} {logs_ms:>9.1f} {logs_rows:>5} {like_ms:>9.1f} {like_rows:>5} {articles_ms:>20.1f} {articles_rows:>5}")
+    finally:
+        db.close()
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+End-to-end latency of a weekly trend report: the old serial map (fixed
+2-second pause between batches, one final prompt over every partial) versus
+the parallel map and tree reduce in ai_service.generate_trend_summary.
+
+The model is a local stand-in that waits a fixed latency plus a per-token
+cost of the prompt, and returns a summary of fixed size. Calls go through the
+shared rate limiter, so --rpm shows how the report behaves under a real
+quota (e.g. 15 for Gemini Flash on the free tier).
+
+Usage: python -m backend.benchmarks.bench_trend_summary [--articles 300] [--latency 1.5] [--rpm 1000] [--legacy-pause 2]
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+from backend.benchmarks.common import temp_session
+from backend.services import ai_service, llm_rate_limiter
+
+CATEGORIES = ["Social", "Technological", "Economic", "Environmental", "Political", "Values"]
+
+
+class StandInModel:
+    def __init__(self, latency: float, seconds_per_1k_tokens: float = 0.05, reply_chars: int = 2500):
+        self.latency = latency
+        self.seconds_per_1k_tokens = seconds_per_1k_tokens
+        self.reply_chars = reply_chars
+        self.calls = 0
+        self.largest_prompt = 0
+
+    def generate_content(self, prompt: str):
+        self.calls += 1
+        self.largest_prompt = max(self.largest_prompt, len(prompt))
+        time.sleep(self.latency + len(prompt) / 4000 * self.seconds_per_1k_tokens)
+        return SimpleNamespace(text="Trend: " + "x" * self.reply_chars)
+
+
+def make_articles(count: int) -> list:
+    return [
+        SimpleNamespace(
+            id=i + 1,
+            title=f"Signal {i}: new developments in sector {i % 12}",
+            excerpt=f"Short plain-text excerpt for signal {i}. " * 6,
+            summary=None,
+            steepv_category=CATEGORIES[i % len(CATEGORIES)],
+            industry=f"Industry {i % 12}",
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_report(articles: list, model, pause: float) -> str:
+    """The pre-change path: serial batches of 10 with a fixed pause, then one final prompt."""
+    partials = []
+    for i in range(0, len(articles), 10):
+        response = ai_service.generate_content_with_retry(model, ai_service.build_map_prompt(articles[i:i + 10]))
+        partials.append(response.text)
+        time.sleep(pause)
+    return ai_service.generate_content_with_retry(model, ai_service.build_final_prompt(None, "\n\n".join(partials))).text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=1.5, help="Stand-in seconds per call")
+    parser.add_argument("--rpm", type=int, default=1000, help="Rate limiter requests per minute")
+    parser.add_argument("--legacy-pause", type=float, default=2.0)
+    args = parser.parse_args()
+
+    db = temp_session()
+    articles = make_articles(args.articles)
+    print(f"{args.articles} articles, {args.latency}s per call, {args.rpm} RPM, map concurrency {ai_service.TREND_MAP_CONCURRENCY}")
+    print(f"{'path':<14} {'calls':>6} {'seconds':>9} {'largest prompt (chars)':>24}")
+
+    for name in ("serial", "parallel+tree"):
+        llm_rate_limiter.configure(args.rpm)
+        model = StandInModel(args.latency)
+        start = time.perf_counter()
+        if name == "serial":
+            legacy_report(articles, model, args.legacy_pause)
+        else:
+            events = []
+            ai_service.generate_trend_summary(articles, db, model=model, progress=events.append, use_cache=False)
+        print(f"{name:<14} {model.calls:>6} {time.perf_counter() - start:>9.2f} {model.largest_prompt:>24}")
+
+    stages = {}
+    for event in events:
+        stages[(event["stage"], event["level"])] = event["total"]
+    print("stages: " + ", ".join(f"{stage}{'@' + str(level) if stage == 'reduce' else ''}={total}" for (stage, level), total in stages.items()))
+
+
+if __name__ == "__main__":
+    main()
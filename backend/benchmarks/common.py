@@ -0,0 +1,55 @@
+"""
+Shared helpers for the benchmark scripts in this package.
+
+Benchmarks never touch foresight.db: each one runs against a throwaway
+SQLite file with the full schema created from the models.
+"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend import models  # noqa: F401 - registers the tables on Base
+
+
+def temp_engine(path: str = None):
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".db", prefix="foresight-bench-")
+        os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def temp_session(engine=None):
+    engine = engine or temp_engine()
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+class QueryCounter:
+    """Counts statements executed on an engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@contextmanager
+def timed(results: dict, key: str):
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
@@ -0,0 +1,161 @@
+"""
+Checks that the main list and report queries use index plans on a large
+synthetic dataset. Exits with status 1 if any of them scans a whole table
+or sorts it in a temporary b-tree.
+
+The /articles and /logs queries are captured from the router functions
+themselves, so the check follows the endpoints as they change. The report
+query is the one curation and the weekly scheduler run.
+
+Usage: python -m backend.benchmarks.explain_plans [--articles 200000] [--logs 200000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import sessionmaker
+
+from backend import database, migrations, models
+from backend.routers import articles as articles_router, logs as logs_router
+from backend.services import pagination
+
+CATEGORIES = ["Social", "Technological", "Economic", "Environmental", "Political", "Values"]
+INDUSTRIES = ["Technology", "Finance", "Healthcare", "Energy", "Retail", "General"]
+SIGNALS = ["pending"] * 8 + ["low", "medium", "strong", "not_signal"]
+LEVELS = ["INFO"] * 8 + ["WARNING", "ERROR"]
+EVENT_TYPES = ["FEED", "AI", "SYSTEM", "USER"]
+CHUNK = 10000
+
+# A plan row is bad if it reads a whole table or sorts all matches for ORDER BY
+SQLITE_BAD = re.compile(r"^SCAN (articles|system_logs)$|USE TEMP B-TREE FOR ORDER BY")
+POSTGRES_BAD = re.compile(r"Seq Scan on (articles|system_logs)")
+
+
+def seed(engine, article_count: int, log_count: int, seed_value: int = 5):
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, article_count, CHUNK):
+            rows = []
+            for i in range(start, min(start + CHUNK, article_count)):
+                published = now - timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+                rows.append({
+                    "title": f"Article {i}", "url": f"https://example.com/{i}", "excerpt": "Excerpt",
+                    "published_at": published, "created_at": published + timedelta(minutes=rng.randrange(0, 120)),
+                    "steepv_category": rng.choice(CATEGORIES), "industry": rng.choice(INDUSTRIES),
+                    "signal_strength": rng.choice(SIGNALS), "classification_status": "done",
+                })
+            conn.execute(models.Article.__table__.insert(), rows)
+        for start in range(0, log_count, CHUNK):
+            conn.execute(models.SystemLog.__table__.insert(), [
+                {
+                    "timestamp": now - timedelta(seconds=rng.randrange(0, 3600 * 24 * 90)),
+                    "level": rng.choice(LEVELS), "event_type": rng.choice(EVENT_TYPES), "message": "Synthetic log line",
+                }
+                for _ in range(start, min(start + CHUNK, log_count))
+            ])
+        conn.execute(text("ANALYZE"))
+
+
+def capture(engine, run) -> list:
+    """Runs run() and returns the (statement, parameters) it executed."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def explain(engine, statement: str, parameters) -> list:
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if engine.dialect.name == "postgresql":
+            cursor.execute("EXPLAIN " + statement, parameters)
+            return [row[0] for row in cursor.fetchall()]
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    finally:
+        raw.close()
+
+
+def cases(db):
+    month_ago = datetime.utcnow() - timedelta(days=30)
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    cursor = pagination.encode_cursor(month_ago, 10 ** 9)
+    return [
+        ("/articles", lambda: articles_router.read_articles(db=db)),
+        ("/articles?category", lambda: articles_router.read_articles(category="Technological", db=db)),
+        ("/articles?industry", lambda: articles_router.read_articles(industry="Finance", db=db)),
+        ("/articles?category&dates", lambda: articles_router.read_articles(category="Economic", start_date=month_ago, end_date=week_ago, db=db)),
+        ("/articles?page 50", lambda: articles_router.read_articles(skip=5000, db=db)),
+        ("/articles?cursor", lambda: articles_router.read_articles(cursor=cursor, db=db)),
+        ("/articles?category&cursor", lambda: articles_router.read_articles(category="Social", cursor=cursor, db=db)),
+        ("/logs", lambda: logs_router.get_logs(db=db)),
+        ("/logs?level", lambda: logs_router.get_logs(level="ERROR", db=db)),
+        ("/logs?event_type", lambda: logs_router.get_logs(event_type="AI", db=db)),
+        ("/logs?level&event_type", lambda: logs_router.get_logs(level="WARNING", event_type="FEED", db=db)),
+        ("/logs?cursor", lambda: logs_router.get_logs(cursor=cursor, db=db)),
+        ("/logs?level&cursor", lambda: logs_router.get_logs(level="ERROR", cursor=cursor, db=db)),
+        ("report articles", lambda: db.query(models.Article).filter(
+            models.Article.created_at >= week_ago,
+            models.Article.signal_strength.in_(["medium", "strong"]),
+        ).all()),
+        ("weekly category report", lambda: db.query(models.Article).filter(
+            models.Article.created_at >= week_ago,
+            models.Article.steepv_category == "Political",
+            models.Article.signal_strength.in_(["medium", "strong"]),
+        ).all()),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=200000)
+    parser.add_argument("--logs", type=int, default=200000)
+    parser.add_argument("--db", help="Database URL to check instead of a seeded temporary SQLite file (not seeded)")
+    args = parser.parse_args()
+
+    if args.db:
+        engine = database.make_engine(args.db)
+    else:
+        fd, path = tempfile.mkstemp(suffix=".db", prefix="foresight-explain-")
+        os.close(fd)
+        engine = database.make_engine(f"sqlite:///{path}")
+        migrations.upgrade(engine)
+        start = time.perf_counter()
+        seed(engine, args.articles, args.logs)
+        print(f"Seeded {args.articles} articles and {args.logs} logs in {time.perf_counter() - start:.1f}s")
+
+    bad = SQLITE_BAD if engine.dialect.name == "sqlite" else POSTGRES_BAD
+    db = sessionmaker(bind=engine)()
+    failures = 0
+    for name, run in cases(db):
+        start = time.perf_counter()
+        statements = capture(engine, run)
+        seconds = time.perf_counter() - start
+        db.expunge_all()
+        plan = [row for statement, parameters in statements for row in explain(engine, statement, parameters)]
+        ok = not any(bad.search(row) for row in plan)
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name:<26} {seconds * 1000:>8.1f} ms  {' | '.join(plan)}")
+    db.close()
+    if failures:
+        print(f"{failures} quer{'y' if failures == 1 else 'ies'} without an index plan")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
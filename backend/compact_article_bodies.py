@@ -0,0 +1,42 @@
+"""
+Moves the summary and content of existing articles out of the articles
+table into compressed article_bodies rows (services/article_bodies).
+
+  python -m backend.compact_article_bodies [--batch 500] [--vacuum]
+
+Set ARTICLE_BODY_STORE=compressed as well, or newly ingested articles keep
+storing their bodies inline. --vacuum compacts a SQLite file afterwards so
+it actually shrinks (it locks the database meanwhile).
+"""
+import argparse
+import time
+
+from sqlalchemy import text
+
+from backend import database
+from backend.services import article_bodies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch", type=int, default=article_bodies.LOOKUP_CHUNK)
+    parser.add_argument("--vacuum", action="store_true")
+    args = parser.parse_args()
+
+    db = database.SessionLocal()
+    try:
+        start = time.perf_counter()
+        moved = article_bodies.compact(db, batch=args.batch)
+        print(f"Moved {moved} article bodies in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
+    if args.vacuum and database.engine.dialect.name == "sqlite":
+        with database.engine.connect() as conn:
+            conn.execute(text("VACUUM"))
+        print("Vacuumed")
+    if not article_bodies.compressed():
+        print("Note: ARTICLE_BODY_STORE is not 'compressed'; new articles still store bodies inline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database import engine, Base
-import models
+from backend import migrations
+from backend.database import engine
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# Create all tables and bring existing ones up to date
+migrations.upgrade(engine, verbose=True)
 print("Database tables created successfully!")
@@ -1,18 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.database import engine, Base
-from backend.routers import feeds, articles, settings, curation, logs
-from backend.services import scheduler
+from backend import migrations
+from backend.database import engine
+from backend.routers import feeds, articles, settings, curation, logs, classification, ai
+from backend.services import scheduler, feed_parser, logger
 from contextlib import asynccontextmanager
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Create new tables and apply pending schema migrations
+migrations.upgrade(engine)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     scheduler.start_scheduler()
     yield
     scheduler.shutdown_scheduler()
+    feed_parser.shutdown_pool()
+    logger.sink.shutdown()
 
 app = FastAPI(title="Foresight Trend Tool API", lifespan=lifespan)
 
@@ -22,6 +25,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(feeds.router)
@@ -29,6 +33,8 @@ app.include_router(articles.router)
 app.include_router(settings.router)
 app.include_router(curation.router)
 app.include_router(logs.router)
+app.include_router(classification.router)
+app.include_router(ai.router)
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,26 @@
+"""
+Applies or lists schema migrations (see backend/migrations).
+
+Usage: python -m backend.migrate [upgrade|status]
+"""
+import sys
+
+from backend import migrations
+from backend.database import engine
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    if command == "upgrade":
+        applied = migrations.upgrade(engine, verbose=True)
+        print(f"Applied {len(applied)} migration(s)" if applied else "Database is up to date")
+    elif command == "status":
+        for migration in migrations.status(engine):
+            state = f"applied {migration['applied_at']:%Y-%m-%d %H:%M}" if migration["applied_at"] else "pending"
+            print(f"{migration['version']:04d} {migration['name']:<24} {state:<24} {migration['description']}")
+    else:
+        sys.exit(__doc__.strip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Versioned schema migrations.
+
+Every module in this package named mNNNN_<name>.py is one migration: its
+docstring says what it does and upgrade(conn) does it. upgrade() creates any
+table the models define that does not exist yet, then runs the migrations
+not recorded in schema_migrations, in order, each in its own transaction.
+So new tables need no migration; new columns, indexes and data changes on
+existing tables do.
+
+upgrade() runs at API startup; `python -m backend.migrate` runs it by hand
+and shows which migrations are applied.
+"""
+import importlib
+import pkgutil
+import re
+from datetime import datetime
+from typing import List, NamedTuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+
+from backend.database import Base
+from backend import models  # noqa: F401 - registers the tables on Base
+
+MIGRATIONS_TABLE = Table(
+    "schema_migrations", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String),
+    Column("applied_at", DateTime),
+)
+
+_MODULE_NAME = re.compile(r"^m(\d{4})_(\w+)$")
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    description: str
+    module: object
+
+
+def discover() -> List[Migration]:
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        match = _MODULE_NAME.match(info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{__name__}.{info.name}")
+        description = (module.__doc__ or "").strip().splitlines()[0] if module.__doc__ else ""
+        migrations.append(Migration(int(match.group(1)), match.group(2), description, module))
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions in {__name__}: {versions}")
+    return migrations
+
+
+def applied_versions(engine) -> dict:
+    MIGRATIONS_TABLE.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        return {row.version: row.applied_at for row in conn.execute(select(MIGRATIONS_TABLE))}
+
+
+def upgrade(engine, verbose: bool = False) -> List[str]:
+    """Brings the database up to date. Returns the names of the migrations applied."""
+    Base.metadata.create_all(bind=engine)
+    done = applied_versions(engine)
+    applied = []
+    for migration in discover():
+        if migration.version in done:
+            continue
+        if verbose:
+            print(f"Applying {migration.version:04d} {migration.name}: {migration.description}")
+        with engine.begin() as conn:
+            migration.module.upgrade(conn)
+            conn.execute(MIGRATIONS_TABLE.insert().values(
+                version=migration.version, name=migration.name, applied_at=datetime.utcnow(),
+            ))
+        applied.append(f"{migration.version:04d}_{migration.name}")
+    return applied
+
+
+def status(engine) -> List[dict]:
+    done = applied_versions(engine)
+    return [
+        {"version": m.version, "name": m.name, "description": m.description, "applied_at": done.get(m.version)}
+        for m in discover()
+    ]
@@ -0,0 +1,61 @@
+"""
+Columns added to existing tables before migrations existed.
+
+Replaces the add_*_columns.py scripts: each column is added only if the
+table lacks it, so databases that ran some, all or none of those scripts end
+up the same. Articles stored before text normalization get their
+plain_text, excerpt and word_count backfilled.
+"""
+from sqlalchemy import inspect, text
+
+from backend.services import text_normalizer
+
+BACKFILL_BATCH = 500
+
+# (table, column, type and default) in the order the old scripts added them
+COLUMNS = [
+    ("articles", "image_url", "TEXT"),
+    ("articles", "signal_strength", "TEXT DEFAULT 'pending'"),
+    ("articles", "ai_reasoning", "TEXT"),
+    ("articles", "admin_notes", "TEXT"),
+    # Existing articles were classified inline at ingest time, so they start as "done"
+    ("articles", "classification_status", "TEXT DEFAULT 'done'"),
+    ("articles", "plain_text", "TEXT"),
+    ("articles", "excerpt", "TEXT"),
+    ("articles", "word_count", "INTEGER"),
+    ("feeds", "etag", "TEXT"),
+    ("feeds", "last_modified", "TEXT"),
+    ("feeds", "content_hash", "TEXT"),
+    ("feeds", "next_fetch_at", "DATETIME"),
+    ("feeds", "poll_interval_minutes", "INTEGER"),
+    ("feeds", "consecutive_failures", "INTEGER DEFAULT 0"),
+    ("feeds", "last_error", "TEXT"),
+    ("feeds", "last_success_at", "DATETIME"),
+    ("feeds", "last_failure_at", "DATETIME"),
+    ("feeds", "circuit_open_until", "DATETIME"),
+]
+
+
+def upgrade(conn):
+    inspector = inspect(conn)
+    existing = {table: {column["name"] for column in inspector.get_columns(table)} for table in {t for t, _, _ in COLUMNS}}
+    for table, column, column_type in COLUMNS:
+        if column in existing[table]:
+            continue
+        if conn.dialect.name == "postgresql":
+            column_type = column_type.replace("DATETIME", "TIMESTAMP")
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"))
+
+    # Keyed on id so each pass picks up where the last stopped
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, summary, content FROM articles WHERE excerpt IS NULL AND id > :last_id ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": BACKFILL_BATCH}).fetchall()
+        if not rows:
+            break
+        conn.execute(
+            text("UPDATE articles SET plain_text = :plain_text, excerpt = :excerpt, word_count = :word_count WHERE id = :id"),
+            [{"id": row.id, **text_normalizer.normalize(row.summary, row.content)} for row in rows],
+        )
+        last_id = rows[-1].id
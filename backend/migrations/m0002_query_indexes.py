@@ -0,0 +1,32 @@
+"""
+Composite indexes for the queries the app runs, and no index on articles.title.
+
+  /articles                  ORDER BY published_at DESC, optionally filtered
+                             by steepv_category or industry (and a date range)
+  reports (curation, weekly) signal_strength IN (...) AND created_at >= cutoff
+  /logs                      ORDER BY timestamp DESC, optionally filtered by
+                             level, event_type or both
+
+Nothing filters or sorts on title, so its index only slowed down inserts.
+"""
+from sqlalchemy import text
+
+INDEXES = [
+    ("ix_articles_published_at", "articles", "published_at"),
+    ("ix_articles_category_published", "articles", "steepv_category, published_at"),
+    ("ix_articles_industry_published", "articles", "industry, published_at"),
+    ("ix_articles_signal_created", "articles", "signal_strength, created_at"),
+    ("ix_system_logs_timestamp", "system_logs", "timestamp"),
+    ("ix_system_logs_level_timestamp", "system_logs", "level, timestamp"),
+    ("ix_system_logs_level_event_timestamp", "system_logs", "level, event_type, timestamp"),
+    ("ix_system_logs_event_timestamp", "system_logs", "event_type, timestamp"),
+]
+
+
+def upgrade(conn):
+    conn.execute(text("DROP INDEX IF EXISTS ix_articles_title"))
+    for name, table, columns in INDEXES:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+    # Fresh statistics so the planner picks the new indexes
+    conn.execute(text("ANALYZE articles"))
+    conn.execute(text("ANALYZE system_logs"))
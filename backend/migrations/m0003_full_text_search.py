@@ -0,0 +1,73 @@
+"""
+Full-text indexes for article search and the logs search box.
+
+SQLite: FTS5 tables over articles (title, excerpt, plain_text) and
+system_logs (message) that read their text from the base tables, kept in
+sync by triggers on insert, delete and updates of the indexed columns, then
+rebuilt from the existing rows. Skipped if SQLite was built without FTS5;
+search then falls back to LIKE (see services/search.py).
+
+PostgreSQL: a generated tsvector column on articles and an expression on
+system_logs, both GIN-indexed. The logs expression must stay identical to
+the one services/search.py queries with, or the index goes unused.
+"""
+from sqlalchemy import text
+
+SQLITE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, excerpt, plain_text, content='articles', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, excerpt, plain_text) VALUES (new.id, new.title, new.excerpt, new.plain_text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, excerpt, plain_text) VALUES ('delete', old.id, old.title, old.excerpt, old.plain_text);
+    END""",
+    # Only the indexed columns: classification and curation updates leave the index alone
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, excerpt, plain_text ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, excerpt, plain_text) VALUES ('delete', old.id, old.title, old.excerpt, old.plain_text);
+        INSERT INTO articles_fts(rowid, title, excerpt, plain_text) VALUES (new.id, new.title, new.excerpt, new.plain_text);
+    END""",
+    "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS system_logs_fts USING fts5(
+        message, content='system_logs', content_rowid='id', tokenize='unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS system_logs_fts_insert AFTER INSERT ON system_logs BEGIN
+        INSERT INTO system_logs_fts(rowid, message) VALUES (new.id, new.message);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS system_logs_fts_delete AFTER DELETE ON system_logs BEGIN
+        INSERT INTO system_logs_fts(system_logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS system_logs_fts_update AFTER UPDATE OF message ON system_logs BEGIN
+        INSERT INTO system_logs_fts(system_logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+        INSERT INTO system_logs_fts(rowid, message) VALUES (new.id, new.message);
+    END""",
+    "INSERT INTO system_logs_fts(system_logs_fts) VALUES ('rebuild')",
+]
+
+POSTGRES = [
+    # Stored, so ranking reads the vector instead of re-parsing every candidate's body
+    """ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(excerpt, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(plain_text, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search ON articles USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_system_logs_search ON system_logs USING GIN ((to_tsvector('simple', coalesce(message, ''))))",
+]
+
+
+def _sqlite_has_fts5(conn) -> bool:
+    options = {row[0] for row in conn.execute(text("PRAGMA compile_options"))}
+    return "ENABLE_FTS5" in options
+
+
+def upgrade(conn):
+    if conn.dialect.name == "postgresql":
+        statements = POSTGRES
+    elif conn.dialect.name == "sqlite" and _sqlite_has_fts5(conn):
+        statements = SQLITE
+    else:
+        return
+    for statement in statements:
+        conn.execute(text(statement))
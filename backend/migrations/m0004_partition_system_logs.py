@@ -0,0 +1,70 @@
+"""
+Daily partitions for system_logs on PostgreSQL.
+
+The table is recreated as PARTITION BY RANGE (timestamp) with a partition
+per day that has rows, the next LOG_PARTITION_DAYS_AHEAD days and a default
+partition, and the existing rows are copied over. The primary key becomes
+(id, timestamp), as partitioning requires; ids keep coming from the same
+sequence. The indexes of m0002 and m0003 are recreated on the parent, which
+gives every partition its own. Retention then drops whole partitions (see
+services/log_retention.py). Nothing to do on SQLite.
+"""
+from datetime import datetime
+
+from sqlalchemy import text
+
+from backend.migrations.m0002_query_indexes import INDEXES
+from backend.services import log_retention
+
+SEARCH_INDEX = "CREATE INDEX IF NOT EXISTS ix_system_logs_search ON system_logs USING GIN ((to_tsvector('simple', coalesce(message, ''))))"
+
+
+def upgrade(conn):
+    if conn.dialect.name != "postgresql":
+        return
+    partitioned = conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table JOIN pg_class ON pg_class.oid = pg_partitioned_table.partrelid WHERE pg_class.relname = 'system_logs'"
+    )).first()
+    if partitioned:
+        return
+
+    log_indexes = [(name, columns) for name, table, columns in INDEXES if table == "system_logs"]
+    conn.execute(text("ALTER TABLE system_logs RENAME TO system_logs_unpartitioned"))
+    # Free the index names for the new table
+    for name, _ in log_indexes + [("ix_system_logs_search", None), ("ix_system_logs_id", None)]:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    conn.execute(text("""
+        CREATE TABLE system_logs (
+            id INTEGER NOT NULL DEFAULT nextval('system_logs_id_seq'),
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            level VARCHAR,
+            event_type VARCHAR,
+            message VARCHAR,
+            details JSON,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """))
+    # Owned by the new column, or dropping the old table would drop the sequence
+    conn.execute(text("ALTER SEQUENCE system_logs_id_seq OWNED BY system_logs.id"))
+    conn.execute(text("CREATE TABLE system_logs_default PARTITION OF system_logs DEFAULT"))
+
+    days = conn.execute(text(
+        "SELECT DISTINCT CAST(timestamp AS DATE) FROM system_logs_unpartitioned WHERE timestamp IS NOT NULL"
+    )).scalars().all()
+    for day in days:
+        log_retention.create_partition(conn, day)
+    log_retention.ensure_partitions(conn, datetime.utcnow().date())
+
+    conn.execute(text("""
+        INSERT INTO system_logs (id, timestamp, level, event_type, message, details)
+        SELECT id, coalesce(timestamp, now() AT TIME ZONE 'utc'), level, event_type, message, details
+        FROM system_logs_unpartitioned
+    """))
+    conn.execute(text("DROP TABLE system_logs_unpartitioned"))
+
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_system_logs_id ON system_logs (id)"))
+    for name, columns in log_indexes:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON system_logs ({columns})"))
+    conn.execute(text(SEARCH_INDEX))
+    conn.execute(text("ANALYZE system_logs"))
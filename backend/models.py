@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, Index, LargeBinary
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 from .database import Base
 import enum
@@ -11,6 +11,17 @@ class SignalStrength(str, enum.Enum):
     NOT_SIGNAL = "not_signal"
     PENDING = "pending"
 
+class ClassificationStatus(str, enum.Enum):
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed" # Dead-lettered; heuristic result applied
+
+class JobStatus(str, enum.Enum):
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    DEAD = "dead"
+
 class Feed(Base):
     __tablename__ = "feeds"
 
@@ -20,6 +31,19 @@ class Feed(Base):
     category = Column(String, nullable=True) # e.g. "Tech", "Finance"
     active = Column(Boolean, default=True)
     last_fetched_at = Column(DateTime, nullable=True)
+    # Validators from the last successful poll, sent back as a conditional GET
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    content_hash = Column(String, nullable=True) # sha256 of the last body, for servers without validators
+    # Polling schedule, see services/poll_schedule.py
+    next_fetch_at = Column(DateTime, nullable=True)
+    poll_interval_minutes = Column(Integer, nullable=True)
+    # Source health and circuit breaker, see services/feed_health.py
+    consecutive_failures = Column(Integer, default=0)
+    last_error = Column(Text, nullable=True)
+    last_success_at = Column(DateTime, nullable=True)
+    last_failure_at = Column(DateTime, nullable=True)
+    circuit_open_until = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     articles = relationship("Article", back_populates="feed")
@@ -32,19 +56,33 @@ class Setting(Base):
 
 class Article(Base):
     __tablename__ = "articles"
+    # Shaped after the queries that use them (see backend/migrations/m0002_query_indexes.py)
+    __table_args__ = (
+        Index("ix_articles_published_at", "published_at"),
+        Index("ix_articles_category_published", "steepv_category", "published_at"),
+        Index("ix_articles_industry_published", "industry", "published_at"),
+        Index("ix_articles_signal_created", "signal_strength", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     feed_id = Column(Integer, ForeignKey("feeds.id"))
-    title = Column(String, index=True)
+    title = Column(String)
     url = Column(String, unique=True, index=True)
-    summary = Column(Text, nullable=True)
-    content = Column(Text, nullable=True)
+    # Bodies are deferred: loaded on first access (one query for the group), not with every row.
+    # With ARTICLE_BODY_STORE=compressed, summary and content live in ArticleBody instead, see services/article_bodies.py
+    summary = deferred(Column(Text, nullable=True), group="body")
+    content = deferred(Column(Text, nullable=True), group="body")
+    # Normalized at ingest, see services/text_normalizer.py
+    plain_text = deferred(Column(Text, nullable=True), group="body")
+    excerpt = Column(String, nullable=True)
+    word_count = Column(Integer, nullable=True)
     image_url = Column(String, nullable=True)
     published_at = Column(DateTime, nullable=True)
     
     # Categorization
     steepv_category = Column(String, nullable=True) # Social, Tech, Econ, Env, Pol, Values
     industry = Column(String, nullable=True)
+    classification_status = Column(String, default=ClassificationStatus.PENDING.value)
     
     # Curation
     # Curation
@@ -57,6 +95,63 @@ class Article(Base):
 
     feed = relationship("Feed", back_populates="articles")
 
+class ArticleBody(Base):
+    """zlib-compressed summary and content HTML of an article, kept out of the articles row."""
+    __tablename__ = "article_bodies"
+
+    article_id = Column(Integer, ForeignKey("articles.id"), primary_key=True)
+    summary = Column(LargeBinary, nullable=True)
+    content = Column(LargeBinary, nullable=True)
+
+class ClassificationJob(Base):
+    """
+    Durable work queue for AI categorization. Workers claim jobs by taking a
+    time-limited lease; an expired lease makes the job claimable again.
+    """
+    __tablename__ = "classification_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    article_id = Column(Integer, ForeignKey("articles.id"), unique=True, index=True)
+    status = Column(String, default=JobStatus.PENDING.value, index=True)
+    attempts = Column(Integer, default=0)
+    available_at = Column(DateTime, default=datetime.utcnow) # Retry backoff: not claimable before this
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class ClassificationCacheEntry(Base):
+    """
+    Classification results keyed by hash(normalized title+summary, prompt
+    version), see services/classification_cache.py.
+    """
+    __tablename__ = "classification_cache"
+
+    key = Column(String, primary_key=True)
+    prompt_version = Column(String, index=True) # hash of prompt template + model name
+    category = Column(String)
+    industry = Column(String, nullable=True)
+    reasoning = Column(Text, nullable=True)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class TrendBatchSummary(Base):
+    """
+    Cached map-phase summary of one batch of articles, keyed by the batch's
+    article ids and content hashes plus the map prompt version, see
+    services/summary_cache.py.
+    """
+    __tablename__ = "trend_batch_summaries"
+
+    key = Column(String, primary_key=True)
+    prompt_version = Column(String, index=True) # hash of map prompt template + model name
+    content = Column(Text)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
 class User(Base):
     __tablename__ = "users"
 
@@ -80,6 +175,12 @@ class TrendSummary(Base):
 
 class SystemLog(Base):
     __tablename__ = "system_logs"
+    __table_args__ = (
+        Index("ix_system_logs_timestamp", "timestamp"),
+        Index("ix_system_logs_level_timestamp", "level", "timestamp"),
+        Index("ix_system_logs_level_event_timestamp", "level", "event_type", "timestamp"),
+        Index("ix_system_logs_event_timestamp", "event_type", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
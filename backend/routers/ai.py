@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from backend import database
+from backend.services import llm_rate_limiter, summary_cache
+
+router = APIRouter(
+    prefix="/ai",
+    tags=["ai"],
+)
+
+@router.get("/rate-limit")
+def get_rate_limit_metrics():
+    return llm_rate_limiter.metrics()
+
+@router.get("/summary-cache")
+def get_summary_cache_stats(db: Session = Depends(database.get_db)):
+    return summary_cache.cache_stats(db)
@@ -1,24 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from backend import models, schemas, database
+from backend.services import article_bodies, pagination, search
 
 router = APIRouter(
     prefix="/articles",
     tags=["articles"],
 )
 
-@router.get("/", response_model=List[schemas.Article])
+@router.get("/search", response_model=List[schemas.ArticleSearchResult])
+def search_articles(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    category: Optional[str] = None,
+    industry: Optional[str] = None,
+    db: Session = Depends(database.get_read_db)
+):
+    """Full-text search over title, excerpt and body, best match first."""
+    results = search.search_articles(db, q, limit=limit, offset=offset, category=category, industry=industry)
+    return [
+        schemas.ArticleSearchResult(**schemas.ArticleListItem.model_validate(article).model_dump(), score=score, snippet=snippet)
+        for article, score, snippet in results
+    ]
+
+@router.get("/", response_model=List[schemas.ArticleListItem])
 def read_articles(
+    response: Response = None,
     skip: int = 0, 
     limit: int = 100, 
     category: Optional[str] = None,
     industry: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    db: Session = Depends(database.get_db)
+    cursor: Optional[str] = None,
+    db: Session = Depends(database.get_read_db)
 ):
+    """
+    Newest first. Page with `cursor` (the X-Next-Cursor header of the previous
+    page) for stable, constant-cost paging; `skip` is the older offset mode.
+    """
     query = db.query(models.Article)
     
     if category:
@@ -30,5 +53,18 @@ def read_articles(
     if end_date:
         query = query.filter(models.Article.published_at <= end_date)
         
-    articles = query.order_by(models.Article.published_at.desc()).offset(skip).limit(limit).all()
+    try:
+        articles, next_cursor = pagination.page(query, models.Article.published_at, models.Article.id, limit, cursor=cursor, skip=skip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor and response is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
     return articles
+
+@router.get("/{article_id}/content", response_model=schemas.ArticleContent)
+def read_article_content(article_id: int, db: Session = Depends(database.get_read_db)):
+    """The body the list endpoints leave out, from whichever store holds it."""
+    body = article_bodies.get(db, article_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return body
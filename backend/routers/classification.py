@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+from typing import Optional
+from sqlalchemy.orm import Session
+from backend import database
+from backend.services import ai_service, classification_cache, classification_queue, local_classifier
+
+router = APIRouter(
+    prefix="/classification",
+    tags=["classification"],
+)
+
+@router.get("/queue")
+def get_queue_stats(db: Session = Depends(database.get_db)):
+    return classification_queue.queue_stats(db)
+
+@router.post("/queue/requeue-dead")
+def requeue_dead_jobs(db: Session = Depends(database.get_db)):
+    return {"requeued": classification_queue.requeue_dead(db)}
+
+@router.post("/reclassify")
+def reclassify_articles(feed_id: Optional[int] = None, force: bool = False, db: Session = Depends(database.get_db)):
+    """Curated articles are skipped unless force=true."""
+    return {"queued": classification_queue.reclassify(db, feed_id=feed_id, force=force)}
+
+@router.get("/cache")
+def get_cache_stats(db: Session = Depends(database.get_db)):
+    return {**classification_cache.cache_stats(db), "current_versions": ai_service.classification_prompt_versions(db)}
+
+@router.post("/cache/purge-stale")
+def purge_stale_cache(db: Session = Depends(database.get_db)):
+    return {"removed": ai_service.purge_stale_classification_cache(db)}
+
+@router.get("/local-model")
+def get_local_model_stats():
+    return local_classifier.model_stats()
@@ -1,6 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+import json
+import queue
+import threading
 from datetime import datetime, timedelta
 from backend import models, schemas, database
 from backend.services import ai_service
@@ -10,7 +14,7 @@ router = APIRouter(
     tags=["curation"],
 )
 
-@router.patch("/articles/{article_id}", response_model=schemas.Article)
+@router.patch("/articles/{article_id}", response_model=schemas.ArticleListItem)
 def curate_article(
     article_id: int, 
     signal_strength: str, 
@@ -29,17 +33,14 @@ def curate_article(
     db.refresh(article)
     return article
 
-@router.post("/generate-summary", response_model=schemas.TrendSummary)
-def generate_summary(
-    days: int = 7,
-    min_signal_strength: str = "medium", # strong, medium, low
-    background_tasks: BackgroundTasks = None,
-    db: Session = Depends(database.get_db)
-):
-    # Create a placeholder summary immediately
+GENERATING_CONTENT = "Report generation in progress..."
+# Comment lines sent while the report is quiet, so proxies keep the stream open
+STREAM_KEEPALIVE_SECONDS = 15
+
+def _create_placeholder(db: Session, days: int) -> models.TrendSummary:
     trend_summary = models.TrendSummary(
         title=f"Weekly Trend Report - {datetime.utcnow().strftime('%Y-%m-%d')} (Generating...)",
-        content="Report generation in progress...",
+        content=GENERATING_CONTENT,
         start_date=datetime.utcnow() - timedelta(days=days),
         end_date=datetime.utcnow(),
         is_published=False
@@ -47,50 +48,133 @@ def generate_summary(
     db.add(trend_summary)
     db.commit()
     db.refresh(trend_summary)
+    return trend_summary
 
-    # Define the background task function
-    def generate_content_task(summary_id: int, days: int, min_signal: str):
-        # Re-create session for background task
-        db_bg = database.SessionLocal()
-        try:
-            summary = db_bg.query(models.TrendSummary).filter(models.TrendSummary.id == summary_id).first()
-            if not summary:
-                return
+def generate_report(summary_id: int, days: int, min_signal: str, progress=None, on_text=None) -> Optional[models.TrendSummary]:
+    """
+    Fills in the placeholder report `summary_id` in its own session. Without
+    a `progress` callback, progress is written into the placeholder content
+    for clients polling /summaries. Returns the finished row (detached).
+    """
+    db_bg = database.SessionLocal()
+    summary = None
+    try:
+        summary = db_bg.query(models.TrendSummary).filter(models.TrendSummary.id == summary_id).first()
+        if not summary:
+            return None
 
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            allowed_strengths = ["strong"]
-            if min_signal in ["medium", "low"]:
-                allowed_strengths.append("medium")
-            if min_signal == "low":
-                allowed_strengths.append("low")
-                
-            articles = db_bg.query(models.Article).filter(
-                models.Article.created_at >= cutoff_date,
-                models.Article.signal_strength.in_(allowed_strengths)
-            ).all()
-            
-            if not articles:
-                summary.content = "No curated articles found for this period."
-            else:
-                summary.content = ai_service.generate_trend_summary(articles, db_bg)
-                # Update title to remove "(Generating...)"
-                summary.title = f"Weekly Trend Report - {datetime.utcnow().strftime('%Y-%m-%d')}"
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        allowed_strengths = ["strong"]
+        if min_signal in ["medium", "low"]:
+            allowed_strengths.append("medium")
+        if min_signal == "low":
+            allowed_strengths.append("low")
             
-            db_bg.commit()
-        except Exception as e:
-            print(f"Error generating summary: {e}")
+        articles = db_bg.query(models.Article).filter(
+            models.Article.created_at >= cutoff_date,
+            models.Article.signal_strength.in_(allowed_strengths)
+        ).all()
+        
+        if not articles:
+            summary.content = "No curated articles found for this period."
+        else:
+            if progress is None:
+                def progress(event):
+                    # Shown in place of the placeholder text until the report is ready
+                    stage = event["stage"] if event["stage"] != "reduce" else f"reduce level {event['level']}"
+                    summary.content = f"{GENERATING_CONTENT} {stage}: {event['done']}/{event['total']}"
+                    db_bg.commit()
+
+            summary.content = ai_service.generate_trend_summary(articles, db_bg, progress=progress, on_text=on_text)
+            # Update title to remove "(Generating...)"
+            summary.title = f"Weekly Trend Report - {datetime.utcnow().strftime('%Y-%m-%d')}"
+        
+        db_bg.commit()
+    except Exception as e:
+        print(f"Error generating summary: {e}")
+        db_bg.rollback()
+        if summary is not None:
             summary.content = f"Error generating report: {str(e)}"
             db_bg.commit()
-        finally:
-            db_bg.close()
+    finally:
+        if summary is not None:
+            db_bg.refresh(summary)
+            db_bg.expunge(summary)
+        db_bg.close()
+    return summary
+
+@router.post("/generate-summary", response_model=schemas.TrendSummary)
+def generate_summary(
+    days: int = 7,
+    min_signal_strength: str = "medium", # strong, medium, low
+    background_tasks: BackgroundTasks = None,
+    db: Session = Depends(database.get_db)
+):
+    # Create a placeholder summary immediately
+    trend_summary = _create_placeholder(db, days)
 
     # Add task to background
-    background_tasks.add_task(generate_content_task, trend_summary.id, days, min_signal_strength)
+    background_tasks.add_task(generate_report, trend_summary.id, days, min_signal_strength)
     
     return trend_summary
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@router.post("/generate-summary/stream")
+def generate_summary_stream(
+    days: int = 7,
+    min_signal_strength: str = "medium", # strong, medium, low
+    db: Session = Depends(database.get_db)
+):
+    """
+    Generates a report like /generate-summary, but over one Server-Sent
+    Events response instead of polling:
+
+      created   {"id", "title"}                      the placeholder row
+      progress  {"stage", "level", "done", "total"}  map / reduce / final calls
+      text      {"text"}                             final report chunks, in order
+      done      the saved TrendSummary
+      error     {"detail"}
+
+    The report is saved to TrendSummary as usual, also when the client
+    disconnects before it is finished.
+    """
+    trend_summary = _create_placeholder(db, days)
+    events = queue.Queue()
+
+    def run():
+        summary = generate_report(
+            trend_summary.id, days, min_signal_strength,
+            progress=lambda event: events.put(("progress", event)),
+            on_text=lambda text: events.put(("text", {"text": text})),
+        )
+        if summary is None:
+            events.put(("error", {"detail": "Summary not found"}))
+        else:
+            events.put(("done", schemas.TrendSummary.model_validate(summary).model_dump()))
+
+    threading.Thread(target=run, name=f"trend-report-{trend_summary.id}", daemon=True).start()
+
+    def stream():
+        yield _sse("created", {"id": trend_summary.id, "title": trend_summary.title})
+        while True:
+            try:
+                event, data = events.get(timeout=STREAM_KEEPALIVE_SECONDS)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse(event, data)
+            if event in ("done", "error"):
+                return
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
 @router.get("/summaries", response_model=List[schemas.TrendSummary])
-def get_summaries(db: Session = Depends(database.get_db)):
+def get_summaries(db: Session = Depends(database.get_read_db)):
     return db.query(models.TrendSummary).order_by(models.TrendSummary.created_at.desc()).all()
 
 @router.delete("/summaries/{summary_id}")
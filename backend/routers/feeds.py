@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from backend import models, schemas, database
-from backend.services import rss_service
+from backend.services import rss_service, feed_health
 
 router = APIRouter(
     prefix="/feeds",
@@ -31,14 +31,18 @@ def create_feed(feed: schemas.FeedCreate, db: Session = Depends(database.get_db)
 @router.get("/", response_model=List[schemas.Feed])
 def read_feeds(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
     feeds = db.query(models.Feed).offset(skip).limit(limit).all()
-    return feeds
+    return feed_health.annotate(feeds)
+
+@router.get("/health/hosts")
+def read_host_health():
+    return feed_health.host_health()
 
 @router.get("/{feed_id}", response_model=schemas.Feed)
 def read_feed(feed_id: int, db: Session = Depends(database.get_db)):
     feed = db.query(models.Feed).filter(models.Feed.id == feed_id).first()
     if feed is None:
         raise HTTPException(status_code=404, detail="Feed not found")
-    return feed
+    return feed_health.annotate([feed])[0]
 
 @router.delete("/{feed_id}")
 def delete_feed(feed_id: int, db: Session = Depends(database.get_db)):
@@ -77,5 +81,4 @@ def update_feed(feed_id: int, feed_update: schemas.FeedUpdate, db: Session = Dep
 
 @router.post("/fetch-all")
 def fetch_all_feeds(db: Session = Depends(database.get_db)):
-    total_articles = rss_service.update_feeds(db)
-    return {"total_new_articles": total_articles}
+    return rss_service.update_feeds(db)
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
 from backend import models, schemas, database
+from backend.services import log_retention, logger, pagination, search as search_service
 
 router = APIRouter(
     prefix="/logs",
@@ -10,13 +12,16 @@ router = APIRouter(
 
 @router.get("/", response_model=List[schemas.SystemLog])
 def get_logs(
+    response: Response = None,
     skip: int = 0,
     limit: int = 50,
     level: Optional[str] = None,
     event_type: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(database.get_db)
+    cursor: Optional[str] = None,
+    db: Session = Depends(database.get_read_db)
 ):
+    """Newest first; page with `cursor` (from X-Next-Cursor) or the older `skip` offset."""
     query = db.query(models.SystemLog)
     
     if level and level != "ALL":
@@ -26,7 +31,38 @@ def get_logs(
         query = query.filter(models.SystemLog.event_type == event_type)
         
     if search:
-        query = query.filter(models.SystemLog.message.contains(search))
+        query = query.filter(search_service.log_filter(db, search))
         
     # Order by newest first
-    return query.order_by(models.SystemLog.timestamp.desc()).offset(skip).limit(limit).all()
+    try:
+        logs, next_cursor = pagination.page(query, models.SystemLog.timestamp, models.SystemLog.id, limit, cursor=cursor, skip=skip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor and response is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return logs
+
+@router.get("/sink")
+def get_sink_stats():
+    """Counters of the background log writer: written, dropped, filtered and sampled-out events."""
+    return logger.stats()
+
+@router.get("/archive/days")
+def get_archived_days():
+    """Days moved out of system_logs by the retention job, newest first."""
+    return log_retention.archived_days()
+
+@router.get("/archive", response_model=List[schemas.SystemLog])
+def get_archived_logs(
+    start: datetime,
+    end: datetime,
+    level: Optional[str] = None,
+    event_type: Optional[str] = None,
+    search: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Archived events with start <= timestamp < end, newest first (at most 31 days per query)."""
+    try:
+        return log_retention.query_archive(start, end, level=level, event_type=event_type, search=search, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from backend import models, schemas, database
+from backend import schemas, database
+from backend.services import ai_service, poll_schedule, settings_service
 
 router = APIRouter(
     prefix="/settings",
@@ -9,20 +10,18 @@ router = APIRouter(
 
 @router.get("/{key}", response_model=schemas.Setting)
 def read_setting(key: str, db: Session = Depends(database.get_db)):
-    setting = db.query(models.Setting).filter(models.Setting.key == key).first()
-    if setting is None:
+    value = settings_service.get(db, key)
+    if value is None:
         raise HTTPException(status_code=404, detail="Setting not found")
-    return setting
+    return schemas.Setting(key=key, value=value)
 
 @router.post("/", response_model=schemas.Setting)
 def create_or_update_setting(setting: schemas.Setting, db: Session = Depends(database.get_db)):
-    db_setting = db.query(models.Setting).filter(models.Setting.key == setting.key).first()
-    if db_setting:
-        db_setting.value = setting.value
-    else:
-        db_setting = models.Setting(key=setting.key, value=setting.value)
-        db.add(db_setting)
-    
-    db.commit()
-    db.refresh(db_setting)
+    db_setting = settings_service.set_value(db, setting.key, setting.value)
+
+    if setting.key == "feed_schedule":
+        poll_schedule.reschedule_all(db)
+    elif setting.key in ("steepv_prompt", "steepv_batch_prompt", "gemini_model"):
+        # Results cached under the previous prompt or model can no longer be hit
+        ai_service.purge_stale_classification_cache(db)
     return db_setting
@@ -19,6 +19,15 @@ class FeedUpdate(BaseModel):
 class Feed(FeedBase):
     id: int
     last_fetched_at: Optional[datetime] = None
+    next_fetch_at: Optional[datetime] = None
+    poll_interval_minutes: Optional[int] = None
+    consecutive_failures: Optional[int] = 0
+    last_error: Optional[str] = None
+    last_success_at: Optional[datetime] = None
+    last_failure_at: Optional[datetime] = None
+    circuit_open_until: Optional[datetime] = None
+    circuit_state: Optional[str] = None # closed, open or half_open
+    host_circuit_state: Optional[str] = None
     created_at: datetime
 
     class Config:
@@ -32,6 +41,7 @@ class ArticleBase(BaseModel):
     published_at: Optional[datetime] = None
     steepv_category: Optional[str] = None
     industry: Optional[str] = None
+    classification_status: Optional[str] = None
     signal_strength: Optional[str] = "pending"
     ai_reasoning: Optional[str] = None
     admin_notes: Optional[str] = None
@@ -39,12 +49,47 @@ class ArticleBase(BaseModel):
 class Article(ArticleBase):
     id: int
     feed_id: int
+    excerpt: Optional[str] = None
+    word_count: Optional[int] = None
     is_featured: bool
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+class ArticleListItem(BaseModel):
+    """Compact row for list endpoints: the plain-text excerpt instead of raw summary HTML."""
+    id: int
+    feed_id: int
+    title: str
+    url: str
+    excerpt: Optional[str] = None
+    word_count: Optional[int] = None
+    image_url: Optional[str] = None
+    published_at: Optional[datetime] = None
+    steepv_category: Optional[str] = None
+    industry: Optional[str] = None
+    classification_status: Optional[str] = None
+    signal_strength: Optional[str] = "pending"
+    ai_reasoning: Optional[str] = None
+    admin_notes: Optional[str] = None
+    is_featured: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ArticleContent(BaseModel):
+    """An article's body, fetched separately from the list endpoints."""
+    id: int
+    summary: Optional[str] = None
+    content: Optional[str] = None
+    plain_text: Optional[str] = None
+
+class ArticleSearchResult(ArticleListItem):
+    score: float
+    snippet: Optional[str] = None # HTML-escaped, matched terms wrapped in <mark>
+
 class Setting(BaseModel):
     key: str
     value: str
@@ -1,201 +1,339 @@
-from typing import Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 import json
 import re
 import time
-import random
-import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import SimpleNamespace
 from sqlalchemy.orm import Session
 import os
-from backend.services import logger
-from backend import models, database
+from backend.services import logger, classification_cache, common, heuristic_classifier, llm_backends, llm_rate_limiter, local_classifier, settings_service, summary_cache
+
+CLASSIFICATION_BATCH_SIZE = int(os.getenv("CLASSIFICATION_BATCH_SIZE", "20"))
+CLASSIFICATION_BATCH_RETRIES = int(os.getenv("CLASSIFICATION_BATCH_RETRIES", "2"))
+
+TREND_MAP_BATCH_SIZE = int(os.getenv("TREND_MAP_BATCH_SIZE", "10"))
+TREND_MAP_CONCURRENCY = int(os.getenv("TREND_MAP_CONCURRENCY", "4"))
+TREND_REDUCE_GROUP_SIZE = int(os.getenv("TREND_REDUCE_GROUP_SIZE", "5"))
+TREND_REDUCE_MAX_CHARS = int(os.getenv("TREND_REDUCE_MAX_CHARS", "20000"))
+TREND_REDUCE_MAX_LEVELS = 5
 
 STEEPV_CATEGORIES = ["Social", "Technological", "Economic", "Environmental", "Political", "Values"]
 
 def get_gemini_key(db: Session):
-    setting = db.query(models.Setting).filter(models.Setting.key == "gemini_api_key").first()
-    return setting.value if setting else None
+    return settings_service.current(db).gemini_api_key
 
 def get_steepv_prompt(db: Session):
-    setting = db.query(models.Setting).filter(models.Setting.key == "steepv_prompt").first()
-    return setting.value if setting else None
+    return settings_service.current(db).steepv_prompt
+
+def get_steepv_batch_prompt(db: Session):
+    return settings_service.current(db).steepv_batch_prompt
 
 def get_trend_prompt(db: Session):
-    setting = db.query(models.Setting).filter(models.Setting.key == "trend_prompt").first()
-    return setting.value if setting else None
+    return settings_service.current(db).trend_prompt
 
 def get_gemini_model(db: Session):
-    setting = db.query(models.Setting).filter(models.Setting.key == "gemini_model").first()
-    return setting.value if setting else "gemini-2.0-flash-exp"
+    return settings_service.current(db).gemini_model
 
-def generate_content_with_retry(model, prompt, retries=3, initial_delay=5):
+def generate_content_with_retry(model, prompt, retries=3, initial_delay=5, priority=llm_rate_limiter.BACKGROUND):
     """
-    Generates content with retry logic for 429 errors.
+    Generates content through the shared rate limiter, which queues the call
+    in its priority lane and retries 429 errors.
     """
-    delay = initial_delay
-    for attempt in range(retries):
-        try:
-            return model.generate_content(prompt)
-        except Exception as e:
-            error_str = str(e)
-            if "429" in error_str or "Quota exceeded" in error_str:
-                if attempt < retries - 1:
-                    sleep_time = delay + random.uniform(0, 1)
-                    print(f"Quota exceeded. Retrying in {sleep_time:.2f} seconds... (Attempt {attempt + 1}/{retries})")
-                    time.sleep(sleep_time)
-                    delay *= 2  # Exponential backoff
-                    continue
-            raise e
+    if not getattr(model, "rate_limited", True):
+        return model.generate_content(prompt)
+    return llm_rate_limiter.call(lambda: model.generate_content(prompt), prompt, priority=priority, retries=retries, initial_delay=initial_delay)
 
 def categorize_article(title: str, summary: str, db: Session = None, industry: str = "", link: str = "") -> Tuple[str, str, str]:
     """
     Categorizes an article into STEEPV and Industry based on content.
     Returns (steepv_category, industry, reasoning).
     """
-    # Try Gemini first if DB session is provided
-    if db:
-        api_key = get_gemini_key(db)
-        if api_key:
-            try:
-                genai.configure(api_key=api_key)
-                model_name = get_gemini_model(db)
-                model = genai.GenerativeModel(model_name)
-                
-                custom_prompt = get_steepv_prompt(db)
-                
-                default_prompt = f"""
-                Eres un clasificador experto en señales de futuros usando STEEPV.
-                Clasificá la siguiente noticia dentro de una única categoría, eligiendo entre:
-                Social, Technological, Economic, Environmental, Political o Values.
-                
-                Devolvé tu respuesta en exactamente tres objetos JSON separados (uno debajo del otro), sin texto adicional, sin explicaciones fuera del formato, sin comillas ni backticks.
-                
-                Formato:
-                {{
-                "category": "[una sola categoría]"
-                }}
-                {{
-                "reason": "[explicación breve de por qué corresponde a esa categoría]"
-                }}
-                {{
-                "industry": "[identificar la industria específica]"
-                }}
-                
-                Noticia: {title} – {summary}
-                Industria: {industry}
-                Link: {link}
-                """
-                
-                if custom_prompt:
-                    prompt = custom_prompt.format(title=title, summary=summary, industry=industry, link=link)
-                else:
-                    prompt = default_prompt.format(title=title, summary=summary, industry=industry, link=link)
-                
-                response = generate_content_with_retry(model, prompt)
-                text = response.text.strip()
-                
-                # Clean up markdown code blocks if present
-                text = re.sub(r'```json\s*', '', text)
-                text = re.sub(r'```\s*', '', text)
-                
-                # Parse JSON objects
-                # The prompt asks for multiple JSON objects, which is tricky to parse directly as a single JSON.
-                # We'll try to find them with regex or splitting.
-                
-                category = "Uncategorized"
-                industry = "Unknown"
-                reason = ""
-                
-                try:
-                    # Try to parse as a single JSON first if the model was smart enough to combine them or if we change the prompt slightly
-                    # But adhering to the user's strict prompt:
-                    objects = re.findall(r'\{.*?\}', text, re.DOTALL)
-                    for obj_str in objects:
-                        try:
-                            data = json.loads(obj_str)
-                            if "category" in data:
-                                category = data["category"]
-                            if "reason" in data:
-                                reason = data["reason"]
-                            if "industry" in data:
-                                industry = data["industry"]
-                        except:
-                            pass
-                            
-                    return category, industry, reason
-                    
-                except Exception as e:
-                    print(f"JSON Parse Error: {e}")
-                    pass
+    local = categorize_article_local(title, summary, industry=industry)
+    if local:
+        return local
 
-            except Exception as e:
-                print(f"Gemini Error: {e}")
-                # Fallback to heuristic
+    # Try Gemini if DB session is provided
+    if db and llm_available(db):
+        try:
+            return categorize_article_with_gemini(title, summary, db, industry=industry, link=link)
+        except Exception as e:
+            # Fallback to heuristic
+            logger.log_event(db, "ERROR", "AI", "Gemini classification failed, using the keyword fallback", {"error": str(e)})
+
+    return categorize_article_heuristic(title, summary)
+
+def llm_available(db: Session) -> bool:
+    """Whether the configured LLM backend can take calls (for Gemini: an API key is set)."""
+    return llm_backends.current().available(db)
+
+def get_llm_client(db: Session):
+    """A client for the configured backend with the genai.GenerativeModel generate_content interface."""
+    return llm_backends.current().client(db)
+
+def get_llm_model_name(db: Session) -> str:
+    """Model name used in cache versions; backends other than Gemini get their own."""
+    return llm_backends.current().model_name(db)
+
+def _strip_code_fences(text: str) -> str:
+    text = re.sub(r'```json\s*', '', text)
+    return re.sub(r'```\s*', '', text).strip()
+
+def _record_usage(usage: Optional[dict], prompt: str, response):
+    """
+    Accumulates calls and token counts into `usage`. Uses the API's own
+    counts when the response carries them, otherwise ~4 characters per token.
+    """
+    if usage is None:
+        return
+    meta = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(meta, "prompt_token_count", None) or len(prompt) // 4
+    output_tokens = getattr(meta, "candidates_token_count", None) or len(response.text) // 4
+    usage["calls"] = usage.get("calls", 0) + 1
+    usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + prompt_tokens
+    usage["output_tokens"] = usage.get("output_tokens", 0) + output_tokens
+
+ARTICLE_PROMPT = """
+    Eres un clasificador experto en señales de futuros usando STEEPV.
+    Clasificá la siguiente noticia dentro de una única categoría, eligiendo entre:
+    Social, Technological, Economic, Environmental, Political o Values.
     
-    # Heuristic Fallback
-    text = (title + " " + summary).lower()
+    Devolvé tu respuesta en exactamente tres objetos JSON separados (uno debajo del otro), sin texto adicional, sin explicaciones fuera del formato, sin comillas ni backticks.
     
-    # STEEPV Keywords
-    steepv_map = {
-        "Social": ["society", "people", "culture", "demographic", "education", "health"],
-        "Technological": ["ai", "software", "hardware", "digital", "tech", "cyber", "data"],
-        "Economic": ["money", "market", "finance", "trade", "economy", "business", "investment"],
-        "Environmental": ["climate", "carbon", "nature", "green", "energy", "sustainability"],
-        "Political": ["law", "government", "policy", "regulation", "vote", "election"],
-        "Values": ["ethics", "moral", "belief", "religion", "trust"]
-    }
+    Formato:
+    {{
+    "category": "[una sola categoría]"
+    }}
+    {{
+    "reason": "[explicación breve de por qué corresponde a esa categoría]"
+    }}
+    {{
+    "industry": "[identificar la industria específica]"
+    }}
     
-    detected_steepv = "Uncategorized"
-    for category, keywords in steepv_map.items():
-        if any(k in text for k in keywords):
-            detected_steepv = category
-            break
-            
-    # Industry Keywords (Simple heuristic)
-    industry_map = {
-        "Technology": ["tech", "software", "saas"],
-        "Finance": ["bank", "crypto", "stock"],
-        "Healthcare": ["health", "med", "pharma"],
-        "Energy": ["oil", "gas", "solar", "wind"],
-        "Retail": ["shop", "commerce", "store"]
-    }
+    Noticia: {title} – {summary}
+    Industria: {industry}
+    Link: {link}
+    """
+
+def build_article_prompt(db: Session, title: str, summary: str, industry: str = "", link: str = "") -> str:
+    template = get_steepv_prompt(db) or ARTICLE_PROMPT
+    return template.format(title=title, summary=summary, industry=industry, link=link)
+
+def parse_article_response(text: str) -> Tuple[str, str, str]:
+    # The prompt asks for three separate JSON objects, so we pick them out one by one
+    text = _strip_code_fences(text)
     
-    detected_industry = "General"
-    for industry, keywords in industry_map.items():
-        if any(k in text for k in keywords):
-            detected_industry = industry
-            break
+    category = "Uncategorized"
+    industry = "Unknown"
+    reason = ""
+    
+    objects = re.findall(r'\{.*?\}', text, re.DOTALL)
+    for obj_str in objects:
+        try:
+            data = json.loads(obj_str)
+            if "category" in data:
+                category = data["category"]
+            if "reason" in data:
+                reason = data["reason"]
+            if "industry" in data:
+                industry = data["industry"]
+        except:
+            pass
             
-    return detected_steepv, detected_industry, "Heuristic fallback"
+    return category, industry, reason
 
-def generate_trend_summary(articles: list, db: Session, category: str = None, industry: str = None) -> str:
+def categorize_article_with_gemini(title: str, summary: str, db: Session, industry: str = "", link: str = "", model=None, usage: dict = None, use_cache: bool = True) -> Tuple[str, str, str]:
     """
-    Generates a trend summary from a list of articles.
+    Categorizes an article with Gemini. Unlike categorize_article this raises
+    on API errors, so callers with their own retry policy (the
+    classification queue) can see them. Results are read from and written to
+    the classification cache unless use_cache is False.
     """
-    api_key = get_gemini_key(db)
-    if not api_key:
-        return "Gemini API Key not configured."
+    version = classification_prompt_versions(db)["article"]
+    if use_cache:
+        cached = classification_cache.get(db, version, title, summary)
+        if cached:
+            return cached
+
+    model = model or get_llm_client(db)
+    prompt = build_article_prompt(db, title, summary, industry=industry, link=link)
+    response = generate_content_with_retry(model, prompt)
+    _record_usage(usage, prompt, response)
+    result = parse_article_response(response.text)
+    if use_cache and result[0] in STEEPV_CATEGORIES:
+        classification_cache.put(db, version, title, summary, result)
+    return result
+
+BATCH_PROMPT = """
+    Eres un clasificador experto en señales de futuros usando STEEPV.
+    Clasificá cada una de las siguientes noticias dentro de una única categoría, eligiendo entre:
+    Social, Technological, Economic, Environmental, Political o Values.
+    
+    Devolvé únicamente un array JSON, sin texto adicional, sin backticks, con exactamente un objeto por noticia:
+    [
+    {{"id": [id de la noticia], "category": "[una sola categoría]", "reason": "[explicación breve]", "industry": "[industria específica]"}}
+    ]
+    
+    Noticias (JSON):
+    {articles}
+    """
+
+def supports_batch(db: Session) -> bool:
+    """
+    A custom single-article prompt only applies to per-article calls, so it
+    disables batching unless a batch prompt (with an {articles} placeholder)
+    is configured as well.
+    """
+    return bool(get_steepv_batch_prompt(db)) or not get_steepv_prompt(db)
+
+def classification_prompt_versions(db: Session) -> Dict[str, str]:
+    """
+    Cache versions of the effective per-article and batch prompts under the
+    current model; they change whenever a prompt setting or the model does.
+    """
+    model_name = get_llm_model_name(db)
+    return {
+        "article": common.prompt_version(get_steepv_prompt(db) or ARTICLE_PROMPT, model_name),
+        "batch": common.prompt_version(get_steepv_batch_prompt(db) or BATCH_PROMPT, model_name),
+    }
+
+def purge_stale_classification_cache(db: Session) -> int:
+    """Drops cached results made with a previous prompt or model. Commits."""
+    removed = classification_cache.purge_except(db, classification_prompt_versions(db).values())
+    db.commit()
+    return removed
 
+def build_batch_prompt(db: Session, items: List[dict]) -> str:
+    articles = json.dumps([
+        {"id": item["id"], "title": item["title"], "summary": item.get("summary", ""), "industry": item.get("industry") or ""}
+        for item in items
+    ], ensure_ascii=False, indent=1)
+    return (get_steepv_batch_prompt(db) or BATCH_PROMPT).format(articles=articles)
+
+def parse_batch_response(text: str, ids) -> Dict[int, Tuple[str, str, str]]:
+    """
+    Parses the JSON array reply into {id: (category, industry, reason)}.
+    Entries with an unknown id or a category outside STEEPV are dropped, so
+    the caller can re-send just those articles.
+    """
+    text = _strip_code_fences(text)
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end < start:
+        return {}
     try:
-        genai.configure(api_key=api_key)
-        model_name = get_gemini_model(db)
-        model = genai.GenerativeModel(model_name)
-        
-        custom_prompt = get_trend_prompt(db)
-        
-        # Batch processing to avoid token limits and timeouts
-        BATCH_SIZE = 10
-        article_batches = [articles[i:i + BATCH_SIZE] for i in range(0, len(articles), BATCH_SIZE)]
-        
-        batch_summaries = []
-        
-        logger.log_event(db, "INFO", "AI", f"Generating trend summary for {len(articles)} articles", {"category": category, "industry": industry})
-        print(f"Processing {len(articles)} articles in {len(article_batches)} batches...")
-        
-        for i, batch in enumerate(article_batches):
-            print(f"Processing batch {i+1}/{len(article_batches)}...")
-            batch_text = "\n\n".join([f"- {a.title}: {a.summary} (Category: {a.steepv_category}, Industry: {a.industry})" for a in batch])
-            
-            batch_prompt = f"""
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+
+    categories = {c.lower(): c for c in STEEPV_CATEGORIES}
+    ids = set(ids)
+    results = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        try:
+            article_id = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        category = categories.get(str(item.get("category", "")).strip().lower())
+        if article_id not in ids or category is None:
+            continue
+        results[article_id] = (category, item.get("industry") or "Unknown", item.get("reason") or "")
+    return results
+
+def categorize_articles_with_gemini(items: List[dict], db: Session, batch_size: int = None, model=None, usage: dict = None, use_cache: bool = True) -> Dict[int, Tuple[str, str, str]]:
+    """
+    Classifies many articles with one Gemini call per batch.
+
+    items: dicts with "id", "title", "summary" and optionally "industry".
+    Returns {id: (steepv_category, industry, reasoning)}. Articles missing
+    from or invalid in a reply are re-sent in a smaller follow-up batch, up
+    to CLASSIFICATION_BATCH_RETRIES times; ids still missing after that are
+    left out of the result. Raises on API errors. Cached articles are
+    answered without a call unless use_cache is False.
+    """
+    batch_size = batch_size or CLASSIFICATION_BATCH_SIZE
+    version = classification_prompt_versions(db)["batch"]
+    results = {}
+    if use_cache:
+        results = classification_cache.get_many(db, version, {item["id"]: (item["title"], item.get("summary", "")) for item in items})
+    pending = [item for item in items if item["id"] not in results]
+    if not pending:
+        return results
+
+    model = model or get_llm_client(db)
+    fresh = {}
+    for attempt in range(CLASSIFICATION_BATCH_RETRIES + 1):
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i:i + batch_size]
+            prompt = build_batch_prompt(db, batch)
+            response = generate_content_with_retry(model, prompt)
+            _record_usage(usage, prompt, response)
+            fresh.update(parse_batch_response(response.text, [item["id"] for item in batch]))
+        pending = [item for item in pending if item["id"] not in fresh]
+        if not pending:
+            break
+    if use_cache:
+        classification_cache.put_many(db, version, [
+            (item["title"], item.get("summary", ""), fresh[item["id"]]) for item in items if item["id"] in fresh
+        ])
+    results.update(fresh)
+    if usage is not None:
+        usage["unresolved"] = usage.get("unresolved", 0) + len(pending)
+    return results
+
+def categorize_articles(items: List[dict], db: Session = None) -> Dict[int, Tuple[str, str, str]]:
+    """
+    Batch counterpart of categorize_article: the local model where it is
+    confident, Gemini when configured, and the heuristic for anything left.
+    """
+    results = categorize_articles_local(items)
+    remaining = [item for item in items if item["id"] not in results]
+    if remaining and db and llm_available(db) and supports_batch(db):
+        try:
+            results.update(categorize_articles_with_gemini(remaining, db))
+        except Exception as e:
+            logger.log_event(db, "ERROR", "AI", "Gemini batch classification failed, using the keyword fallback", {"error": str(e), "articles": len(remaining)})
+    missing = [item for item in items if item["id"] not in results]
+    fallback = heuristic_classifier.classify_many((item["title"], item.get("summary", "")) for item in missing)
+    results.update(zip((item["id"] for item in missing), fallback))
+    return results
+
+def categorize_article_local(title: str, summary: str, industry: str = "") -> Optional[Tuple[str, str, str]]:
+    """
+    The local model's classification when its confidence clears
+    LOCAL_CLASSIFIER_THRESHOLD, else None (also when no model is trained).
+    The model only predicts STEEPV; the industry is the feed's, or the
+    heuristic's guess.
+    """
+    prediction = local_classifier.confident_label(title, summary)
+    if prediction is None:
+        return None
+    steepv, confidence = prediction
+    if not industry:
+        industry = heuristic_classifier.classify(title, summary)[1]
+    return steepv, industry, f"{local_classifier.REASONING_PREFIX} ({confidence:.0%} confidence)"
+
+def categorize_articles_local(items: List[dict]) -> Dict[int, Tuple[str, str, str]]:
+    """categorize_article_local over items ({id, title, summary, industry}); only confident ones are returned."""
+    results = {}
+    for item in items:
+        result = categorize_article_local(item["title"], item.get("summary", ""), industry=item.get("industry") or "")
+        if result:
+            results[item["id"]] = result
+    return results
+
+def categorize_article_heuristic(title: str, summary: str) -> Tuple[str, str, str]:
+    """
+    Keyword-based fallback used when Gemini is not configured or fails.
+    """
+    return heuristic_classifier.classify(title, summary)
+
+def _article_line(article) -> str:
+    # Only compact columns: reading summary would load the deferred body of every article
+    return f"- {article.title}: {article.excerpt or ''} (Category: {article.steepv_category}, Industry: {article.industry})"
+
+MAP_PROMPT = """
             Analyze these news signals and extract the key emerging trends, themes, and signals.
             Focus on STEEPV categories and Industry impacts.
             Provide a concise summary of the key points found in this batch.
@@ -203,25 +341,40 @@ def generate_trend_summary(articles: list, db: Session, category: str = None, in
             News Signals:
             {batch_text}
             """
+
+def build_map_prompt(batch: list) -> str:
+    return MAP_PROMPT.format(batch_text="\n\n".join(_article_line(a) for a in batch))
+
+def map_batches(articles: list) -> List[list]:
+    """
+    Splits articles into map batches of at most TREND_MAP_BATCH_SIZE. Batches
+    never mix STEEPV categories or industries and are ordered by id, so the
+    same week's articles always form the same batches, whichever report
+    (all, one category, one industry, a rerun) they are part of. That is
+    what lets the summary cache share batch summaries between reports.
+    """
+    by_group = {}
+    for article in articles:
+        by_group.setdefault((article.steepv_category or "", article.industry or ""), []).append(article)
+    batches = []
+    for group_key in sorted(by_group):
+        group = sorted(by_group[group_key], key=lambda a: a.id)
+        batches.extend(group[i:i + TREND_MAP_BATCH_SIZE] for i in range(0, len(group), TREND_MAP_BATCH_SIZE))
+    return batches
+
+def build_reduce_prompt(partials: List[str]) -> str:
+    partial_text = "\n\n---\n\n".join(partials)
+    return f"""
+            You are merging partial analyses of news signals, each written from a different batch of articles.
+            Combine them into one concise list of the key emerging trends, themes, and signals.
+            Merge duplicates, keep the STEEPV category and Industry of each trend, and drop nothing that appears important.
             
-            try:
-                response = generate_content_with_retry(model, batch_prompt, retries=3, initial_delay=5)
-                batch_summaries.append(response.text)
-                # Add a small delay between batches to be nice to the API
-                time.sleep(2)
-            except Exception as e:
-                logger.log_event(db, "ERROR", "AI", f"Error processing batch {i+1} for trend summary", {"error": str(e)})
-                print(f"Error processing batch {i+1}: {e}")
-                continue
-                
-        if not batch_summaries:
-            logger.log_event(db, "ERROR", "AI", "Failed to generate summary: No batches processed successfully.")
-            return "Failed to generate summary: No batches processed successfully."
-            
-        # Final aggregation
-        aggregated_text = "\n\n".join(batch_summaries)
-        
-        default_final_prompt = f"""
+            Partial Analyses:
+            {partial_text}
+            """
+
+def build_final_prompt(custom_prompt: Optional[str], aggregated_text: str, category: str = None, industry: str = None) -> str:
+    default_final_prompt = f"""
         Act as a Foresight Analyst. You have analyzed several batches of news signals and extracted the following key trends and themes.
         Synthesize these findings into a cohesive Weekly Trend Report.
         
@@ -237,18 +390,190 @@ def generate_trend_summary(articles: list, db: Session, category: str = None, in
         Key Trends & Themes from Batches:
         {aggregated_text}
         """
+    
+    final_prompt = custom_prompt.format(articles=aggregated_text) if custom_prompt else default_final_prompt
+    
+    if category:
+        final_prompt += f"\n\nFocus specifically on trends within the '{category}' STEEPV category."
+    if industry:
+        final_prompt += f"\n\nFocus specifically on impacts to the '{industry}' industry."
+    return final_prompt
+
+def reduce_groups(partials: List[str], group_size: int = None, max_chars: int = None) -> List[List[str]]:
+    """
+    Packs partial summaries, in order, into groups of at most `group_size`
+    items and `max_chars` characters (a single oversized partial gets a
+    group of its own).
+    """
+    group_size = group_size or TREND_REDUCE_GROUP_SIZE
+    max_chars = max_chars or TREND_REDUCE_MAX_CHARS
+    groups, current, size = [], [], 0
+    for partial in partials:
+        if current and (len(current) >= group_size or size + len(partial) > max_chars):
+            groups.append(current)
+            current, size = [], 0
+        current.append(partial)
+        size += len(partial)
+    if current:
+        groups.append(current)
+    return groups
+
+def _report_progress(progress: Optional[Callable], stage: str, done: int, total: int, level: int = 0):
+    if progress:
+        progress({"stage": stage, "level": level, "done": done, "total": total})
+
+def _run_concurrently(model, prompts: List[str], priority: int, stage: str, progress: Optional[Callable], level: int = 0, retries: int = 3, initial_delay: float = 5) -> list:
+    """
+    Sends the prompts in parallel (the rate limiter decides how fast they
+    actually go out). Returns one response text or exception per prompt, in order.
+    """
+    results = [None] * len(prompts)
+    _report_progress(progress, stage, 0, len(prompts), level)
+    with ThreadPoolExecutor(max_workers=max(1, min(TREND_MAP_CONCURRENCY, len(prompts))), thread_name_prefix=f"trend-{stage}") as executor:
+        futures = {
+            executor.submit(generate_content_with_retry, model, prompt, retries, initial_delay, priority): i
+            for i, prompt in enumerate(prompts)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                results[futures[future]] = future.result().text
+            except Exception as e:
+                results[futures[future]] = e
+            _report_progress(progress, stage, done, len(prompts), level)
+    return results
+
+class StreamInterrupted(Exception):
+    """A streamed reply failed after part of it reached on_text, so it is not retried."""
+
+def generate_content_streaming(model, prompt, on_text: Callable[[str], None], retries=3, initial_delay=5, priority=llm_rate_limiter.BACKGROUND):
+    """
+    generate_content_with_retry, but the reply is requested as a stream and
+    each text chunk is passed to on_text as it arrives. Returns an object
+    with the full .text (and usage_metadata when the API reports it).
+
+    Only failures before the first chunk are retried: a retry would stream
+    the reply again from its start after text the caller already has.
+    Later failures raise StreamInterrupted.
+    """
+    def stream():
+        response = model.generate_content(prompt, stream=True)
+        chunks = []
+        try:
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. only a finish reason) raise on .text
+                    continue
+                if text:
+                    chunks.append(text)
+                    on_text(text)
+        except Exception as e:
+            if not chunks:
+                raise
+            # Not str(e): a 429 in the message would make the rate limiter retry it
+            raise StreamInterrupted(f"Stream failed after {sum(map(len, chunks))} characters ({type(e).__name__})") from e
+        return SimpleNamespace(text="".join(chunks), usage_metadata=getattr(response, "usage_metadata", None))
+
+    if not getattr(model, "rate_limited", True):
+        return stream()
+    return llm_rate_limiter.call(stream, prompt, priority=priority, retries=retries, initial_delay=initial_delay)
+
+def generate_trend_summary(articles: list, db: Session, category: str = None, industry: str = None, priority: int = llm_rate_limiter.INTERACTIVE, progress: Callable = None, model=None, use_cache: bool = True, stats: dict = None, on_text: Callable[[str], None] = None) -> str:
+    """
+    Generates a trend summary from a list of articles.
+
+    Map: batches of TREND_MAP_BATCH_SIZE articles are summarized in parallel.
+    Reduce: the partial summaries are merged in bounded groups, level by
+    level, until they fit one final synthesis prompt. `progress` receives a
+    {"stage", "level", "done", "total"} dict as calls complete. `priority` is
+    the rate limiter lane; the scheduled weekly reports pass SCHEDULED.
+
+    Map summaries come from the summary cache where possible. `stats`, if
+    given, accumulates map_batches, map_cache_hits and llm_calls. With
+    `on_text`, the final synthesis is streamed and each chunk of the report
+    is passed to it as it is generated.
+    """
+    if model is None and not llm_available(db):
+        return "Gemini API Key not configured."
+
+    try:
+        model = model or get_llm_client(db)
+        
+        custom_prompt = get_trend_prompt(db)
         
-        final_prompt = custom_prompt.format(articles=aggregated_text) if custom_prompt else default_final_prompt
+        # Batch processing to avoid token limits and timeouts
+        article_batches = map_batches(articles)
+        
+        logger.log_event(db, "INFO", "AI", f"Generating trend summary for {len(articles)} articles", {"category": category, "industry": industry, "batches": len(article_batches)})
+        start = time.perf_counter()
+        
+        # Batches summarized by an earlier or overlapping report are reused
+        version = common.prompt_version(MAP_PROMPT, get_llm_model_name(db))
+        keys = [summary_cache.batch_key(version, {a.id: _article_line(a) for a in batch}) for batch in article_batches]
+        cached = summary_cache.get_many(db, keys) if use_cache else {}
+        misses = [i for i, key in enumerate(keys) if key not in cached]
+        
+        results = _run_concurrently(model, [build_map_prompt(article_batches[i]) for i in misses], priority, "map", progress)
+        fresh = {}
+        for i, result in zip(misses, results):
+            if isinstance(result, Exception):
+                logger.log_event(db, "ERROR", "AI", f"Error processing batch {i+1} for trend summary", {"error": str(result)})
+            else:
+                fresh[keys[i]] = result
+        if use_cache:
+            summary_cache.put_many(db, version, fresh)
+            db.commit()
+        partials = [cached[key] if key in cached else fresh[key] for key in keys if key in cached or key in fresh]
+        hits = len(keys) - len(misses)
+        stages = {"map": {
+            "batches": len(article_batches), "cache_hits": hits, "calls": len(misses), "failed": len(misses) - len(fresh),
+            "seconds": round(time.perf_counter() - start, 2),
+        }}
+        if stats is not None:
+            stats["map_batches"] = stats.get("map_batches", 0) + len(article_batches)
+            stats["map_cache_hits"] = stats.get("map_cache_hits", 0) + hits
+            stats["llm_calls"] = stats.get("llm_calls", 0) + len(misses)
+                
+        if not partials:
+            logger.log_event(db, "ERROR", "AI", "Failed to generate summary: No batches processed successfully.")
+            return "Failed to generate summary: No batches processed successfully."
+            
+        # Tree reduce until everything fits one final prompt
+        level = 0
+        groups = reduce_groups(partials)
+        while len(groups) > 1 and len(groups) < len(partials) and level < TREND_REDUCE_MAX_LEVELS:
+            level += 1
+            level_start = time.perf_counter()
+            results = _run_concurrently(model, [build_reduce_prompt(group) for group in groups], priority, "reduce", progress, level)
+            # A failed merge keeps its inputs for the next level rather than losing them
+            partials = []
+            for group, result in zip(groups, results):
+                if isinstance(result, Exception):
+                    logger.log_event(db, "ERROR", "AI", f"Error merging partial summaries at level {level}", {"error": str(result)})
+                    partials.extend(group)
+                else:
+                    partials.append(result)
+            stages[f"reduce_{level}"] = {"calls": len(groups), "seconds": round(time.perf_counter() - level_start, 2)}
+            if stats is not None:
+                stats["llm_calls"] = stats.get("llm_calls", 0) + len(groups)
+            groups = reduce_groups(partials)
         
-        if category:
-            final_prompt += f"\n\nFocus specifically on trends within the '{category}' STEEPV category."
-        if industry:
-            final_prompt += f"\n\nFocus specifically on impacts to the '{industry}' industry."
+        final_prompt = build_final_prompt(custom_prompt, "\n\n".join(partials), category, industry)
         
         # Increase retries and delay for final summary
         try:
-            response = generate_content_with_retry(model, final_prompt, retries=5, initial_delay=10)
-            logger.log_event(db, "INFO", "AI", "Trend summary generated successfully")
+            _report_progress(progress, "final", 0, 1, level + 1)
+            final_start = time.perf_counter()
+            if on_text:
+                response = generate_content_streaming(model, final_prompt, on_text, retries=5, initial_delay=10, priority=priority)
+            else:
+                response = generate_content_with_retry(model, final_prompt, retries=5, initial_delay=10, priority=priority)
+            _report_progress(progress, "final", 1, 1, level + 1)
+            stages["final"] = {"calls": 1, "seconds": round(time.perf_counter() - final_start, 2)}
+            if stats is not None:
+                stats["llm_calls"] = stats.get("llm_calls", 0) + 1
+            logger.log_event(db, "INFO", "AI", "Trend summary generated successfully", {"stages": stages, "seconds": round(time.perf_counter() - start, 2)})
             return response.text
         except Exception as e:
             logger.log_event(db, "ERROR", "AI", "Error generating final trend summary", {"error": str(e)})
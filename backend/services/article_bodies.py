@@ -0,0 +1,127 @@
+"""
+Where article bodies live, and reading them back.
+
+The articles row keeps the compact columns every list, report and summary
+needs (title, excerpt, categories, dates); summary, content and plain_text
+are deferred on the model, so they are only loaded when something reads
+them. With ARTICLE_BODY_STORE=compressed (default inline), new articles
+store summary and content zlib-compressed in article_bodies instead, which
+keeps the articles table small enough to stay cached. plain_text always
+stays in articles: the full-text index (migration m0003) reads it there.
+
+compact() moves the bodies of existing articles into article_bodies; get()
+reads either store, so both can be mixed while that runs.
+"""
+import os
+import zlib
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, undefer_group
+
+from backend import database, models
+
+ARTICLE_BODY_STORE = os.getenv("ARTICLE_BODY_STORE", "inline")
+COMPRESSION_LEVEL = 6
+# Bound the url IN (...) lookup and the rows of one compaction batch
+LOOKUP_CHUNK = 500
+
+Body = models.ArticleBody.__table__
+
+
+def compress(value: Optional[str]) -> Optional[bytes]:
+    return zlib.compress(value.encode("utf-8"), COMPRESSION_LEVEL) if value is not None else None
+
+
+def decompress(value: Optional[bytes]) -> Optional[str]:
+    return zlib.decompress(value).decode("utf-8") if value is not None else None
+
+
+def compressed() -> bool:
+    return ARTICLE_BODY_STORE == "compressed"
+
+
+def split(rows: list) -> Dict[str, dict]:
+    """
+    For the compressed store: takes summary and content out of article rows
+    about to be inserted and returns them by url, ready for store().
+    Returns {} and leaves the rows alone for the inline store.
+    """
+    if not compressed():
+        return {}
+    bodies = {}
+    for row in rows:
+        bodies[row["url"]] = {"summary": compress(row["summary"]), "content": compress(row["content"])}
+        row["summary"] = row["content"] = None
+    return bodies
+
+
+def store(db: Session, bodies: Dict[str, dict]) -> int:
+    """
+    Inserts the bodies split() took out, once their articles exist. An
+    article another fetcher inserted first already has its body; that row
+    is skipped. Does not commit. Returns the number of bodies stored.
+    """
+    if not bodies:
+        return 0
+    insert = database.dialect_insert(db)
+    urls = list(bodies)
+    stored = 0
+    for i in range(0, len(urls), LOOKUP_CHUNK):
+        ids = db.execute(
+            select(models.Article.id, models.Article.url).where(models.Article.url.in_(urls[i:i + LOOKUP_CHUNK]))
+        ).all()
+        rows = [{"article_id": article_id, **bodies[url]} for article_id, url in ids]
+        if rows:
+            stmt = insert(Body).values(rows).on_conflict_do_nothing(index_elements=["article_id"])
+            stored += db.execute(stmt).rowcount
+    return stored
+
+
+def get(db: Session, article_id: int) -> Optional[dict]:
+    """summary, content and plain_text of an article from whichever store holds them, or None if it does not exist."""
+    article = (
+        db.query(models.Article)
+        .options(undefer_group("body"))
+        .filter(models.Article.id == article_id)
+        .first()
+    )
+    if article is None:
+        return None
+    body = {"id": article.id, "summary": article.summary, "content": article.content, "plain_text": article.plain_text}
+    stored = db.get(models.ArticleBody, article_id)
+    if stored is not None:
+        body["summary"] = decompress(stored.summary)
+        body["content"] = decompress(stored.content)
+    return body
+
+
+def compact(db: Session, batch: int = LOOKUP_CHUNK) -> int:
+    """
+    Moves summary and content of every article still holding them inline
+    into article_bodies, one committed batch at a time. Returns the number
+    of articles moved.
+    """
+    insert = database.dialect_insert(db)
+    Article = models.Article.__table__
+    moved = 0
+    while True:
+        rows = db.execute(
+            select(Article.c.id, Article.c.summary, Article.c.content)
+            .where((Article.c.summary.isnot(None)) | (Article.c.content.isnot(None)))
+            .order_by(Article.c.id)
+            .limit(batch)
+        ).all()
+        if not rows:
+            return moved
+        stmt = insert(Body).values([
+            {"article_id": row.id, "summary": compress(row.summary), "content": compress(row.content)}
+            for row in rows
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["article_id"],
+            set_={"summary": stmt.excluded.summary, "content": stmt.excluded.content},
+        ))
+        db.execute(Article.update().where(Article.c.id.in_([row.id for row in rows])).values(summary=None, content=None))
+        db.commit()
+        moved += len(rows)
@@ -0,0 +1,123 @@
+"""
+Persistent cache of classification results.
+
+Entries are keyed by a hash of the normalized title and summary plus the
+prompt version, itself a hash of the effective prompt template and the model
+name. Re-ingesting an article, seeing it under a second URL or re-running
+classification with an unchanged prompt is then answered from the table
+instead of paying for another Gemini call; editing the prompt or switching
+model changes the version, so old entries simply stop matching and are
+purged by purge_except().
+
+The table is capped at CLASSIFICATION_CACHE_MAX_ENTRIES rows; the least
+recently used entries are evicted first. None of these functions commit.
+"""
+import hashlib
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend import database, models
+from backend.services import common, text_normalizer
+
+MAX_ENTRIES = int(os.getenv("CLASSIFICATION_CACHE_MAX_ENTRIES", "50000"))
+
+Entry = models.ClassificationCacheEntry
+
+_counters = common.Counters("hits", "misses", "writes", "evictions", "invalidated")
+
+
+def counters() -> dict:
+    return _counters.snapshot()
+
+
+def cache_key(version: str, title: str, summary: str) -> str:
+    text = text_normalizer.html_to_text(f"{title}\n{summary}").lower()
+    return hashlib.sha256(f"{version}\n{text}".encode("utf-8")).hexdigest()
+
+
+def get_many(db: Session, version: str, items: Dict[int, Tuple[str, str]]) -> Dict[int, Tuple[str, str, str]]:
+    """
+    Looks up {id: (title, summary)} and returns {id: (category, industry, reasoning)}
+    for the hits. Hits refresh the entry's last_used_at for LRU eviction.
+    """
+    if not items:
+        return {}
+    keys = {item_id: cache_key(version, title, summary) for item_id, (title, summary) in items.items()}
+    found = {
+        entry.key: entry for entry in
+        db.query(Entry).filter(Entry.key.in_(set(keys.values()))).all()
+    }
+
+    results = {
+        item_id: (found[key].category, found[key].industry, found[key].reasoning)
+        for item_id, key in keys.items() if key in found
+    }
+    if found:
+        db.query(Entry).filter(Entry.key.in_(list(found))).update({
+            Entry.hits: Entry.hits + 1,
+            Entry.last_used_at: datetime.utcnow(),
+        }, synchronize_session=False)
+    _counters.bump("hits", len(results))
+    _counters.bump("misses", len(items) - len(results))
+    return results
+
+
+def get(db: Session, version: str, title: str, summary: str) -> Optional[Tuple[str, str, str]]:
+    return get_many(db, version, {0: (title, summary)}).get(0)
+
+
+def put_many(db: Session, version: str, entries: Iterable[Tuple[str, str, Tuple[str, str, str]]]):
+    """Stores (title, summary, result) triples, then evicts down to MAX_ENTRIES."""
+    now = datetime.utcnow()
+    rows = {}
+    for title, summary, (category, industry, reasoning) in entries:
+        key = cache_key(version, title, summary)
+        rows[key] = {
+            "key": key, "prompt_version": version, "category": category, "industry": industry,
+            "reasoning": reasoning, "hits": 0, "created_at": now, "last_used_at": now,
+        }
+    if not rows:
+        return
+
+    insert = database.dialect_insert(db)
+    db.execute(insert(Entry.__table__).values(list(rows.values())).on_conflict_do_nothing(index_elements=["key"]))
+    _counters.bump("writes", len(rows))
+    evict(db)
+
+
+def put(db: Session, version: str, title: str, summary: str, result: Tuple[str, str, str]):
+    put_many(db, version, [(title, summary, result)])
+
+
+def evict(db: Session, max_entries: int = None) -> int:
+    max_entries = MAX_ENTRIES if max_entries is None else max_entries
+    excess = db.query(func.count(Entry.key)).scalar() - max_entries
+    if excess <= 0:
+        return 0
+    oldest = db.query(Entry.key).order_by(Entry.last_used_at).limit(excess).subquery()
+    removed = db.query(Entry).filter(Entry.key.in_(oldest.select())).delete(synchronize_session=False)
+    _counters.bump("evictions", removed)
+    return removed
+
+
+def purge_except(db: Session, versions: Iterable[str]) -> int:
+    """Drops every entry whose prompt version is not in `versions`."""
+    removed = db.query(Entry).filter(Entry.prompt_version.notin_(list(versions))).delete(synchronize_session=False)
+    _counters.bump("invalidated", removed)
+    return removed
+
+
+def cache_stats(db: Session) -> dict:
+    stats = counters()
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        "entries": db.query(func.count(Entry.key)).scalar(),
+        "max_entries": MAX_ENTRIES,
+        "versions": dict(db.query(Entry.prompt_version, func.count(Entry.key)).group_by(Entry.prompt_version).all()),
+        "hit_rate": round(stats["hits"] / lookups, 3) if lookups else None,
+        "counters": stats,
+    }
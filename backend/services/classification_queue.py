@@ -0,0 +1,386 @@
+"""
+Durable, DB-backed queue for AI categorization.
+
+Ingestion inserts articles with a pending classification job and returns
+immediately. A pool of worker threads claims jobs with a time-limited lease,
+classifies each claimed batch with a single Gemini call, retries failures with exponential backoff
+and dead-letters jobs that keep failing (the article then gets the
+heuristic result so it is never left blank).
+
+Claims are conditional UPDATEs, so several workers (or processes) can drain
+the same queue without taking the same job twice; a crashed worker's lease
+simply expires and the job becomes claimable again.
+"""
+import os
+import random
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, exists, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+from backend import database, models
+from backend.services import ai_service, common, logger
+
+WORKER_COUNT = int(os.getenv("CLASSIFICATION_WORKERS", "2"))
+# One claim feeds one batched Gemini call, see ai_service.categorize_articles_with_gemini
+CLAIM_BATCH_SIZE = int(os.getenv("CLASSIFICATION_CLAIM_BATCH", str(ai_service.CLASSIFICATION_BATCH_SIZE)))
+LEASE_SECONDS = int(os.getenv("CLASSIFICATION_LEASE_SECONDS", "300"))
+MAX_ATTEMPTS = int(os.getenv("CLASSIFICATION_MAX_ATTEMPTS", "5"))
+RETRY_BASE_SECONDS = int(os.getenv("CLASSIFICATION_RETRY_BASE_SECONDS", "30"))
+
+Job = models.ClassificationJob
+
+_counters = common.Counters("claimed", "completed", "retried", "dead_lettered", "lease_lost")
+_run_lock = threading.Lock()
+
+
+def counters() -> dict:
+    return _counters.snapshot()
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(Job.status == models.JobStatus.PENDING.value, Job.available_at <= now),
+        and_(Job.status == models.JobStatus.LEASED.value, Job.lease_expires_at < now),
+    )
+
+
+def enqueue_pending(db: Session, feed_id: int = None) -> int:
+    """
+    Creates a job for every pending article that does not have one yet, in a
+    single INSERT ... SELECT. Does not commit.
+    """
+    jobs = Job.__table__
+    articles = models.Article.__table__
+    now = datetime.utcnow()
+
+    pending_articles = select(
+        articles.c.id,
+        literal(models.JobStatus.PENDING.value),
+        literal(0),
+        literal(now),
+        literal(now),
+        literal(now),
+    ).where(
+        articles.c.classification_status == models.ClassificationStatus.PENDING.value,
+        ~exists().where(jobs.c.article_id == articles.c.id),
+    )
+    if feed_id is not None:
+        pending_articles = pending_articles.where(articles.c.feed_id == feed_id)
+
+    insert = database.dialect_insert(db)
+    stmt = insert(jobs).from_select(
+        ["article_id", "status", "attempts", "available_at", "created_at", "updated_at"],
+        pending_articles,
+    ).on_conflict_do_nothing(index_elements=["article_id"])
+    return db.execute(stmt).rowcount
+
+
+def claim(db: Session, worker_id: str, limit: int = CLAIM_BATCH_SIZE, lease_seconds: int = LEASE_SECONDS) -> list:
+    """
+    Leases up to `limit` claimable jobs for this worker and commits the lease.
+    """
+    now = datetime.utcnow()
+    candidate_ids = [
+        row[0] for row in
+        db.query(Job.id).filter(_claimable(now)).order_by(Job.available_at).limit(limit * 2).all()
+    ]
+
+    claimed = []
+    for job_id in candidate_ids:
+        # Only succeeds if no other worker leased the job in the meantime
+        updated = db.query(Job).filter(Job.id == job_id, _claimable(now)).update({
+            Job.status: models.JobStatus.LEASED.value,
+            Job.lease_owner: worker_id,
+            Job.lease_expires_at: now + timedelta(seconds=lease_seconds),
+            Job.attempts: Job.attempts + 1,
+            Job.updated_at: now,
+        }, synchronize_session=False)
+        if updated:
+            claimed.append(job_id)
+        if len(claimed) >= limit:
+            break
+    db.commit()
+
+    if not claimed:
+        return []
+    _counters.bump("claimed", len(claimed))
+    return db.query(Job).filter(Job.id.in_(claimed)).all()
+
+
+def _release(db: Session, job: models.ClassificationJob, worker_id: str, values: dict) -> bool:
+    values = {**values, Job.lease_owner: None, Job.lease_expires_at: None, Job.updated_at: datetime.utcnow()}
+    updated = db.query(Job).filter(
+        Job.id == job.id,
+        Job.status == models.JobStatus.LEASED.value,
+        Job.lease_owner == worker_id,
+    ).update(values, synchronize_session=False)
+    if not updated:
+        _counters.bump("lease_lost")
+    return bool(updated)
+
+
+def _apply_result(article: models.Article, result: tuple, status: models.ClassificationStatus):
+    steepv, ai_industry, reason = result
+    article.steepv_category = steepv
+    # Keep the feed's category as industry when it was set at ingest time
+    if not article.industry:
+        article.industry = ai_industry
+    article.ai_reasoning = reason
+    article.classification_status = status.value
+
+
+def complete(db: Session, job: models.ClassificationJob, worker_id: str, result: tuple):
+    if _release(db, job, worker_id, {Job.status: models.JobStatus.DONE.value, Job.last_error: None}):
+        article = db.get(models.Article, job.article_id)
+        if article is not None:
+            _apply_result(article, result, models.ClassificationStatus.DONE)
+        _counters.bump("completed")
+    db.commit()
+
+
+def fail(db: Session, job: models.ClassificationJob, worker_id: str, error: str):
+    """
+    Schedules a retry with exponential backoff, or dead-letters the job once
+    it has used up MAX_ATTEMPTS.
+    """
+    if job.attempts >= MAX_ATTEMPTS:
+        if _release(db, job, worker_id, {Job.status: models.JobStatus.DEAD.value, Job.last_error: error}):
+            article = db.get(models.Article, job.article_id)
+            if article is not None:
+                _apply_result(article, ai_service.categorize_article_heuristic(article.title or "", _prompt_text(article)), models.ClassificationStatus.FAILED)
+            _counters.bump("dead_lettered")
+            db.commit()
+            logger.log_event(db, "ERROR", "AI", f"Classification dead-lettered for article {job.article_id}", {"job_id": job.id, "attempts": job.attempts, "error": error})
+            return
+    else:
+        delay = RETRY_BASE_SECONDS * (2 ** (job.attempts - 1)) + random.uniform(0, RETRY_BASE_SECONDS)
+        if _release(db, job, worker_id, {
+            Job.status: models.JobStatus.PENDING.value,
+            Job.available_at: datetime.utcnow() + timedelta(seconds=delay),
+            Job.last_error: error,
+        }):
+            _counters.bump("retried")
+    db.commit()
+
+
+def _prompt_text(article: models.Article) -> str:
+    # Rows ingested before normalization existed may not have an excerpt yet
+    return article.excerpt or article.summary or ""
+
+
+def process_job(db: Session, job: models.ClassificationJob, worker_id: str, try_local: bool = True):
+    article = db.get(models.Article, job.article_id)
+    if article is None:
+        # Article was deleted after it was queued
+        _release(db, job, worker_id, {Job.status: models.JobStatus.DONE.value})
+        db.commit()
+        return
+
+    try:
+        result = None
+        if try_local:
+            result = ai_service.categorize_article_local(article.title or "", _prompt_text(article), industry=article.industry or "")
+        if result is None:
+            if ai_service.llm_available(db):
+                result = ai_service.categorize_article_with_gemini(article.title or "", _prompt_text(article), db)
+            else:
+                result = ai_service.categorize_article_heuristic(article.title or "", _prompt_text(article))
+    except Exception as e:
+        db.rollback()
+        fail(db, job, worker_id, str(e))
+        return
+    complete(db, job, worker_id, result)
+
+
+def process_batch(db: Session, jobs: list, worker_id: str):
+    """
+    Classifies a claimed batch with a single Gemini call. Articles the local
+    model is confident about are completed first and left out of the call.
+    Jobs whose article is missing from the reply (after ai_service's own
+    re-sends) go through the normal retry path; an API error fails the rest
+    of the batch.
+    """
+    articles = {
+        article.id: article for article in
+        db.query(models.Article).filter(models.Article.id.in_([job.article_id for job in jobs])).all()
+    }
+    live = []
+    for job in jobs:
+        if job.article_id in articles:
+            live.append(job)
+        else:
+            # Article was deleted after it was queued
+            _release(db, job, worker_id, {Job.status: models.JobStatus.DONE.value})
+    db.commit()
+    if not live:
+        return
+
+    items = [
+        {"id": article.id, "title": article.title or "", "summary": _prompt_text(article), "industry": article.industry}
+        for article in (articles[job.article_id] for job in live)
+    ]
+    local = ai_service.categorize_articles_local(items)
+    for job in live:
+        if job.article_id in local:
+            complete(db, job, worker_id, local[job.article_id])
+    live = [job for job in live if job.article_id not in local]
+    items = [item for item in items if item["id"] not in local]
+    if not live:
+        return
+
+    if not (ai_service.llm_available(db) and ai_service.supports_batch(db)):
+        for job in live:
+            process_job(db, job, worker_id, try_local=False)
+        return
+
+    try:
+        results = ai_service.categorize_articles_with_gemini(items, db)
+    except Exception as e:
+        db.rollback()
+        for job in live:
+            fail(db, job, worker_id, str(e))
+        return
+
+    for job in live:
+        if job.article_id in results:
+            complete(db, job, worker_id, results[job.article_id])
+        else:
+            fail(db, job, worker_id, "No valid classification in batch response")
+
+
+def worker_loop(worker_id: str) -> int:
+    """
+    Claims and processes jobs until nothing is claimable. Returns the number
+    of jobs handled.
+    """
+    db = database.SessionLocal()
+    handled = 0
+    try:
+        while True:
+            jobs = claim(db, worker_id)
+            if not jobs:
+                return handled
+            process_batch(db, jobs, worker_id)
+            handled += len(jobs)
+    finally:
+        db.close()
+
+
+def run_workers(num_workers: int = None) -> dict:
+    """
+    Drains the queue with a pool of worker threads. Overlapping calls in the
+    same process return immediately instead of piling up.
+    """
+    if not _run_lock.acquire(blocking=False):
+        return {"skipped": True}
+    try:
+        db = database.SessionLocal()
+        try:
+            # Pick up pending articles that never got a job (e.g. inserted by scripts)
+            enqueue_pending(db)
+            db.commit()
+        finally:
+            db.close()
+
+        before = counters()
+        num_workers = num_workers or WORKER_COUNT
+        base_id = f"{socket.gethostname()}-{os.getpid()}"
+        with ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="classifier") as executor:
+            handled = sum(executor.map(worker_loop, [f"{base_id}-{i}" for i in range(num_workers)]))
+
+        after = counters()
+        run = {key: after[key] - before[key] for key in after}
+        run["handled"] = handled
+        if handled:
+            db = database.SessionLocal()
+            try:
+                logger.log_event(db, "INFO", "AI", f"Classification queue run: {run['completed']} classified, {run['retried']} retried, {run['dead_lettered']} dead-lettered", run)
+            finally:
+                db.close()
+        return run
+    finally:
+        _run_lock.release()
+
+
+def queue_stats(db: Session) -> dict:
+    now = datetime.utcnow()
+    depth = {status.value: 0 for status in models.JobStatus}
+    depth.update(dict(db.query(Job.status, func.count(Job.id)).group_by(Job.status).all()))
+
+    ready = db.query(func.count(Job.id)).filter(_claimable(now)).scalar()
+    oldest_open = db.query(func.min(Job.created_at)).filter(
+        Job.status.in_([models.JobStatus.PENDING.value, models.JobStatus.LEASED.value])
+    ).scalar()
+    completed_last_hour = db.query(func.count(Job.id)).filter(
+        Job.status == models.JobStatus.DONE.value,
+        Job.updated_at >= now - timedelta(hours=1),
+    ).scalar()
+
+    return {
+        "depth": depth,
+        "ready": ready,
+        "oldest_open_seconds": round((now - oldest_open).total_seconds()) if oldest_open else None,
+        "completed_last_hour": completed_last_hour,
+        "throughput_per_minute": round(completed_last_hour / 60, 2),
+        "workers": WORKER_COUNT,
+        "counters": counters(),
+    }
+
+
+def reclassify(db: Session, feed_id: int = None, force: bool = False) -> int:
+    """
+    Queues articles for classification again, e.g. after a prompt change.
+    Articles whose prompt did not change are answered from the
+    classification cache, so only the changed ones cost a Gemini call.
+
+    Curated articles (a signal strength set or admin notes written) keep
+    their categories unless force is True.
+    """
+    targets = select(models.Article.id)
+    if feed_id is not None:
+        targets = targets.where(models.Article.feed_id == feed_id)
+    if not force:
+        targets = targets.where(
+            or_(models.Article.signal_strength.is_(None), models.Article.signal_strength == models.SignalStrength.PENDING.value),
+            models.Article.admin_notes.is_(None),
+        )
+    count = db.query(models.Article).filter(models.Article.id.in_(targets)).update(
+        {models.Article.classification_status: models.ClassificationStatus.PENDING.value},
+        synchronize_session=False,
+    )
+    now = datetime.utcnow()
+    db.query(Job).filter(Job.article_id.in_(targets)).update({
+        Job.status: models.JobStatus.PENDING.value,
+        Job.attempts: 0,
+        Job.available_at: now,
+        Job.lease_owner: None,
+        Job.lease_expires_at: None,
+        Job.last_error: None,
+        Job.updated_at: now,
+    }, synchronize_session=False)
+    enqueue_pending(db, feed_id=feed_id)
+    db.commit()
+    return count
+
+
+def requeue_dead(db: Session) -> int:
+    """
+    Gives every dead-lettered job a fresh set of attempts.
+    """
+    dead_article_ids = select(Job.article_id).where(Job.status == models.JobStatus.DEAD.value)
+    db.query(models.Article).filter(models.Article.id.in_(dead_article_ids)).update(
+        {models.Article.classification_status: models.ClassificationStatus.PENDING.value},
+        synchronize_session=False,
+    )
+    count = db.query(Job).filter(Job.status == models.JobStatus.DEAD.value).update({
+        Job.status: models.JobStatus.PENDING.value,
+        Job.attempts: 0,
+        Job.available_at: datetime.utcnow(),
+        Job.updated_at: datetime.utcnow(),
+    }, synchronize_session=False)
+    db.commit()
+    return count
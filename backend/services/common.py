@@ -0,0 +1,27 @@
+"""
+Small helpers shared by the services: the in-process counters behind their
+stats endpoints, and the prompt version hash the LLM result caches key on.
+"""
+import hashlib
+import threading
+
+
+class Counters:
+    """Named counters, safe to bump from worker threads."""
+
+    def __init__(self, *keys: str):
+        self._values = dict.fromkeys(keys, 0)
+        self._lock = threading.Lock()
+
+    def bump(self, key: str, amount: int = 1):
+        with self._lock:
+            self._values[key] += amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+
+def prompt_version(template: str, model_name: str) -> str:
+    """Short hash of a prompt template and model name: editing either starts a new cache version."""
+    return hashlib.sha256(f"{model_name}\n{template}".encode("utf-8")).hexdigest()[:16]
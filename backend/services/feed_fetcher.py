@@ -0,0 +1,137 @@
+"""
+Concurrent feed downloader.
+
+Feeds are downloaded on a bounded thread pool with a global concurrency limit
+and a per-host limit, so one slow source no longer holds up the whole refresh
+and we never hammer a single server with parallel requests. Parsing and
+persisting stay with the caller (it owns the DB session).
+"""
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Some servers block requests without a browser-like User-Agent
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+MAX_CONCURRENT_FETCHES = int(os.getenv("FEED_FETCH_CONCURRENCY", "8"))
+MAX_FETCHES_PER_HOST = int(os.getenv("FEED_FETCH_PER_HOST", "2"))
+FETCH_TIMEOUT_SECONDS = float(os.getenv("FEED_FETCH_TIMEOUT", "20"))
+
+
+@dataclass
+class FetchResult:
+    feed_id: int
+    url: str
+    status: Optional[int] = None
+    body: Optional[bytes] = None
+    # Case-insensitive, as servers differ in how they spell header names
+    headers: Mapping[str, str] = field(default_factory=CaseInsensitiveDict)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.body is not None
+
+    @property
+    def host_failure(self) -> bool:
+        """Whether the failure points at the server rather than this feed: no response at all, or a 5xx."""
+        return self.error is not None and (self.status is None or self.status >= 500)
+
+    @cached_property
+    def content_hash(self) -> Optional[str]:
+        """sha256 of the body, the change-detection fallback for servers without validators."""
+        return hashlib.sha256(self.body).hexdigest() if self.body is not None else None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("Last-Modified")
+
+
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def _host_semaphore(url: str) -> threading.BoundedSemaphore:
+    host = urlparse(url).netloc.lower()
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(MAX_FETCHES_PER_HOST)
+            _host_semaphores[host] = semaphore
+        return semaphore
+
+
+def fetch_feed(feed_id: int, url: str, session: requests.Session = None, etag: str = None, last_modified: str = None) -> FetchResult:
+    """
+    Downloads a single feed document. Never raises: network and HTTP errors
+    are reported on the returned FetchResult.
+
+    When validators from the previous poll are given the request is
+    conditional, and an unchanged feed comes back as a bodiless 304.
+    """
+    result = FetchResult(feed_id=feed_id, url=url)
+    http = session or requests
+    headers = {"User-Agent": USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    start = time.perf_counter()
+    try:
+        with _host_semaphore(url):
+            response = http.get(url, headers=headers, timeout=FETCH_TIMEOUT_SECONDS)
+        result.status = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers)
+        if response.status_code >= 400:
+            result.error = f"HTTP {response.status_code}"
+        elif response.status_code != 304:
+            result.body = response.content
+    except Exception as e:
+        result.error = str(e)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def fetch_feeds(feeds: Iterable[Tuple[int, str, Optional[str], Optional[str]]], max_workers: int = None) -> Iterator[FetchResult]:
+    """
+    Downloads many feeds concurrently and yields each FetchResult as soon as
+    its download finishes, so the caller can parse and persist while the
+    remaining downloads are still in flight.
+
+    Args:
+        feeds: (feed_id, url, etag, last_modified) tuples
+        max_workers: Global concurrency limit, defaults to FEED_FETCH_CONCURRENCY
+    """
+    feeds = list(feeds)
+    if not feeds:
+        return
+    workers = max(1, min(max_workers or MAX_CONCURRENT_FETCHES, len(feeds)))
+    with requests.Session() as session:
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-fetch") as executor:
+            futures = [
+                executor.submit(fetch_feed, feed_id, url, session, etag, last_modified)
+                for feed_id, url, etag, last_modified in feeds
+            ]
+            for future in as_completed(futures):
+                yield future.result()
@@ -0,0 +1,161 @@
+"""
+Failure tracking and circuit breaker for feed sources.
+
+Per feed (persisted on the Feed row): consecutive failures, last error,
+last success/failure time and circuit_open_until. After FAILURE_THRESHOLD
+consecutive failures the circuit opens and the feed is skipped for a
+cool-down that doubles with every further failure (capped at MAX_COOLDOWN).
+Once the cool-down passes the circuit is half-open: the next run fetches the
+feed once as a probe, which either closes the circuit or re-opens it for
+longer.
+
+Per host (in memory): the same breaker keyed by hostname, so when a whole
+server is down its other feeds are skipped too instead of each paying the
+full timeout. Only host-level failures count here (connection errors,
+timeouts, 5xx): a 404 on one retired feed or a feed that does not parse
+must not take the publisher's other feeds down with it. A half-open host
+admits a single probe feed per run.
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from backend import models
+
+FAILURE_THRESHOLD = int(os.getenv("FEED_FAILURE_THRESHOLD", "3"))
+BASE_COOLDOWN = timedelta(minutes=int(os.getenv("FEED_COOLDOWN_MINUTES", "30")))
+MAX_COOLDOWN = timedelta(hours=int(os.getenv("FEED_MAX_COOLDOWN_HOURS", "24")))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def cooldown_for(failures: int) -> timedelta:
+    return min(BASE_COOLDOWN * (2 ** max(0, failures - FAILURE_THRESHOLD)), MAX_COOLDOWN)
+
+
+def _state(failures: int, open_until: Optional[datetime], now: datetime) -> str:
+    if failures < FAILURE_THRESHOLD:
+        return CLOSED
+    if open_until and open_until > now:
+        return OPEN
+    return HALF_OPEN
+
+
+def feed_state(feed: models.Feed, now: datetime = None) -> str:
+    return _state(feed.consecutive_failures or 0, feed.circuit_open_until, now or datetime.utcnow())
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+_hosts: Dict[str, dict] = {}
+_hosts_lock = threading.Lock()
+
+
+def host_state(url: str, now: datetime = None) -> str:
+    with _hosts_lock:
+        host = _hosts.get(host_of(url))
+        if host is None:
+            return CLOSED
+        return _state(host["consecutive_failures"], host["circuit_open_until"], now or datetime.utcnow())
+
+
+def host_health() -> Dict[str, dict]:
+    now = datetime.utcnow()
+    with _hosts_lock:
+        return {
+            name: {**host, "circuit_state": _state(host["consecutive_failures"], host["circuit_open_until"], now)}
+            for name, host in _hosts.items()
+        }
+
+
+def _record_host(url: str, error: Optional[str], now: datetime):
+    with _hosts_lock:
+        host = _hosts.setdefault(host_of(url), {
+            "consecutive_failures": 0, "last_error": None, "last_success_at": None,
+            "last_failure_at": None, "circuit_open_until": None,
+        })
+        if error is None:
+            host.update(consecutive_failures=0, last_success_at=now, circuit_open_until=None)
+            return
+        host["consecutive_failures"] += 1
+        host.update(last_error=error, last_failure_at=now)
+        if host["consecutive_failures"] >= FAILURE_THRESHOLD:
+            host["circuit_open_until"] = now + cooldown_for(host["consecutive_failures"])
+
+
+def record_success(feed: models.Feed):
+    """Closes the feed's (and its host's) circuit. Does not commit."""
+    now = datetime.utcnow()
+    feed.consecutive_failures = 0
+    feed.last_success_at = now
+    feed.circuit_open_until = None
+    _record_host(feed.url, None, now)
+
+
+def record_failure(feed: models.Feed, error: str, host_failure: bool = False):
+    """
+    Counts a failure and opens the circuit past the threshold; with
+    host_failure the feed's host is charged as well. Does not commit.
+    """
+    now = datetime.utcnow()
+    feed.consecutive_failures = (feed.consecutive_failures or 0) + 1
+    feed.last_error = error
+    feed.last_failure_at = now
+    if feed.consecutive_failures >= FAILURE_THRESHOLD:
+        feed.circuit_open_until = now + cooldown_for(feed.consecutive_failures)
+    if host_failure:
+        _record_host(feed.url, error, now)
+
+
+def partition(feeds: list, now: datetime = None):
+    """
+    Splits feeds into (to_fetch, skipped). Open-circuit feeds and feeds on
+    open hosts are skipped; each half-open host lets one probe feed through.
+    """
+    now = now or datetime.utcnow()
+    to_fetch, skipped = [], []
+    probing_hosts = set()
+    for feed in feeds:
+        if feed_state(feed, now) == OPEN:
+            skipped.append(feed)
+            continue
+        state = host_state(feed.url, now)
+        if state == OPEN:
+            skipped.append(feed)
+        elif state == HALF_OPEN:
+            if host_of(feed.url) in probing_hosts:
+                skipped.append(feed)
+            else:
+                probing_hosts.add(host_of(feed.url))
+                to_fetch.append(feed)
+        else:
+            to_fetch.append(feed)
+    return to_fetch, skipped
+
+
+def skipped_until(feed: models.Feed, now: datetime = None) -> Optional[datetime]:
+    """When a skipped feed's (or its host's) cool-down ends, if it is open."""
+    now = now or datetime.utcnow()
+    until = []
+    if feed_state(feed, now) == OPEN:
+        until.append(feed.circuit_open_until)
+    with _hosts_lock:
+        host = _hosts.get(host_of(feed.url))
+        if host and _state(host["consecutive_failures"], host["circuit_open_until"], now) == OPEN:
+            until.append(host["circuit_open_until"])
+    return max(until) if until else None
+
+
+def annotate(feeds: list) -> list:
+    """Fills in the non-persisted breaker fields on Feed rows for the API."""
+    now = datetime.utcnow()
+    for feed in feeds:
+        feed.circuit_state = feed_state(feed, now)
+        feed.host_circuit_state = host_state(feed.url, now)
+    return feeds
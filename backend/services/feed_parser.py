@@ -0,0 +1,331 @@
+"""
+Turns raw feed bytes into compact entry records for the ingestion stage.
+
+Two parsers produce the same record shape:
+
+- full: feedparser over the whole document. Tolerant of broken feeds, but
+  builds every entry in memory.
+- incremental: a streaming ElementTree pass over RSS 2.0/1.0 and Atom that
+  yields entries in document order and stops after a few consecutive entries
+  that are already known or older than the cutoff. Memory and CPU are then
+  bounded by the number of new items instead of the feed size (this matters
+  for feeds like arXiv CS with hundreds of daily entries).
+
+The incremental parser falls back to the full one on any XML error. Its
+HTML goes through feedparser's own URI resolver and sanitizer, so both
+parsers store the same markup.
+
+Parsing is pure-Python CPU work, so submit_parse() runs it on a process pool
+(FEED_PARSE_WORKERS, defaulting to the available cores; 0 parses inline).
+Workers receive raw bytes and return only the compact records, which keeps
+the GIL in the API process free for requests and lets a fetch-all use every
+core.
+"""
+import email.utils
+import io
+import multiprocessing
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+from urllib.parse import urljoin
+
+import feedparser
+from feedparser.mixin import _FeedParserMixin
+from feedparser.sanitizer import _sanitize_html
+from feedparser.urls import resolve_relative_uris
+
+from backend.services import text_normalizer
+
+PARSE_MODE = os.getenv("FEED_PARSE_MODE", "auto") # auto, incremental or full
+INCREMENTAL_MIN_BYTES = int(os.getenv("FEED_INCREMENTAL_MIN_BYTES", str(256 * 1024)))
+EARLY_EXIT_AFTER = 3 # Consecutive known/old entries before we stop reading
+
+
+def _available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError: # Not available on macOS
+        return os.cpu_count() or 1
+
+
+PARSE_WORKERS = int(os.getenv("FEED_PARSE_WORKERS", str(_available_cores())))
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+RSS1_NS = "http://purl.org/rss/1.0/"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+MEDIA_NS = "http://search.yahoo.com/mrss/"
+
+ENTRY_TAGS = {"item", f"{{{RSS1_NS}}}item", f"{{{ATOM_NS}}}entry"}
+# Atom type attribute values, as feedparser maps them
+CONTENT_TYPES = {"text": "text/plain", "html": "text/html", "xhtml": "application/xhtml+xml"}
+HTML_TYPES = {"text/html", "application/xhtml+xml"}
+
+
+def entry_to_record(entry) -> dict:
+    """
+    Flattens a feedparser entry into the plain dict the ingestion stage works on.
+    """
+    # Parse date
+    published_at = None
+    if hasattr(entry, 'published_parsed') and entry.published_parsed:
+        published_at = datetime(*entry.published_parsed[:6])
+    elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+        published_at = datetime(*entry.updated_parsed[:6])
+
+    # Content extraction
+    content = ''
+    if 'content' in entry:
+        content = entry.content[0].value
+    elif 'summary' in entry:
+        content = entry.summary
+    else:
+        content = entry.get('description', '')
+
+    # Image extraction
+    image_url = None
+    if 'media_content' in entry:
+        media = entry.media_content
+        if media and len(media) > 0:
+            image_url = media[0].get('url')
+    elif 'media_thumbnail' in entry:
+        media = entry.media_thumbnail
+        if media and len(media) > 0:
+            image_url = media[0].get('url')
+    elif 'links' in entry:
+        for link in entry.links:
+            if link.get('type', '').startswith('image/'):
+                image_url = link.get('href')
+                break
+
+    return {
+        "title": entry.get('title', ''),
+        "url": entry.get('link'),
+        "summary": entry.get('summary', ''),
+        "content": content,
+        "image_url": image_url,
+        "published_at": published_at,
+    }
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    # Stored timestamps are naive UTC, like feedparser's *_parsed values
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _inner(elem) -> str:
+    """Text of an element, including markup of inline XHTML children."""
+    if elem is None:
+        return ""
+    if len(elem) == 0:
+        return (elem.text or "").strip()
+    if elem.get("type") == "xhtml" and len(elem) == 1:
+        # Atom wraps xhtml content in a <div> that is not part of the content
+        elem = elem[0]
+    for child in elem.iter():
+        if isinstance(child.tag, str) and "}" in child.tag:
+            child.tag = child.tag.split("}", 1)[1]
+    parts = [elem.text or ""]
+    parts.extend(ET.tostring(child, encoding="unicode") for child in elem)
+    return "".join(parts).strip()
+
+
+def _markup(elem, base_url: str, default_type: str, guess_html: bool = False) -> str:
+    """
+    _inner() cleaned the way feedparser cleans it in full mode: HTML gets its
+    relative links resolved against the feed URL and unsafe markup (script,
+    style, on* attributes, ...) removed. guess_html treats plain text that
+    looks like HTML as HTML, which feedparser does for everything but Atom.
+    """
+    text = _inner(elem)
+    if not text:
+        return text
+    content_type = CONTENT_TYPES.get(elem.get("type", ""), elem.get("type") or default_type)
+    if content_type == "text/plain" and guess_html and _FeedParserMixin.looks_like_html(text):
+        content_type = "text/html"
+    if content_type not in HTML_TYPES:
+        return text
+    text = resolve_relative_uris(text, base_url, "utf-8", content_type)
+    return _sanitize_html(text, "utf-8", content_type)
+
+
+def _element_to_record(elem, base_url: str) -> dict:
+    atom = elem.tag == f"{{{ATOM_NS}}}entry"
+    ns = f"{{{ATOM_NS}}}" if atom else (f"{{{RSS1_NS}}}" if elem.tag.startswith(f"{{{RSS1_NS}}}") else "")
+
+    link = None
+    image_url = None
+    if atom:
+        for link_elem in elem.findall(f"{ns}link"):
+            rel = link_elem.get("rel", "alternate")
+            if rel == "alternate" and link is None:
+                link = link_elem.get("href")
+            elif rel == "enclosure" and link_elem.get("type", "").startswith("image/") and image_url is None:
+                image_url = link_elem.get("href")
+        summary = _markup(elem.find(f"{ns}summary"), base_url, "text/plain")
+        content = _markup(elem.find(f"{ns}content"), base_url, "text/plain") or summary
+        published_at = _parse_date(elem.findtext(f"{ns}published") or elem.findtext(f"{ns}updated"))
+    else:
+        link = elem.findtext(f"{ns}link") or elem.get(f"{{http://www.w3.org/1999/02/22-rdf-syntax-ns#}}about")
+        summary = _markup(elem.find(f"{ns}description"), base_url, "text/html")
+        content = _markup(elem.find(f"{{{CONTENT_NS}}}encoded"), base_url, "text/html") or summary
+        published_at = _parse_date(elem.findtext("pubDate") or elem.findtext(f"{{{DC_NS}}}date"))
+
+    media = elem.find(f"{{{MEDIA_NS}}}content")
+    if media is None:
+        media = elem.find(f"{{{MEDIA_NS}}}thumbnail")
+    if media is not None:
+        image_url = media.get("url")
+    elif image_url is None:
+        enclosure = elem.find("enclosure")
+        if enclosure is not None and enclosure.get("type", "").startswith("image/"):
+            image_url = enclosure.get("url")
+
+    return {
+        "title": _markup(elem.find(f"{ns}title"), base_url, "text/plain", guess_html=not atom),
+        "url": urljoin(base_url, link.strip()) if link else None,
+        "summary": summary,
+        "content": content,
+        "image_url": image_url,
+        "published_at": published_at,
+    }
+
+
+def iter_entries(body: bytes, base_url: str = "") -> Iterator[dict]:
+    """
+    Streams entry records in document order. Each entry element is detached
+    from the tree once converted, so memory stays flat however long the feed is.
+    Raises ET.ParseError on malformed XML.
+    """
+    stack = []
+    for event, elem in ET.iterparse(io.BytesIO(body), events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag in ENTRY_TAGS:
+            yield _element_to_record(elem, base_url)
+            if stack:
+                stack[-1].remove(elem)
+
+
+def parse_incremental(body: bytes, base_url: str = "", cutoff: datetime = None, known_urls=frozenset()) -> dict:
+    records = []
+    seen = 0
+    stale_run = 0
+    early_exit = False
+    for record in iter_entries(body, base_url):
+        seen += 1
+        stale = record["url"] in known_urls or (
+            cutoff is not None and record["published_at"] is not None and record["published_at"] < cutoff
+        )
+        if not stale:
+            records.append(record)
+            stale_run = 0
+            continue
+        stale_run += 1
+        if stale_run >= EARLY_EXIT_AFTER:
+            early_exit = True
+            break
+    return {"records": records, "mode": "incremental", "entries_seen": seen, "early_exit": early_exit, "bozo": None}
+
+
+def parse_full(body: bytes, base_url: str = "", content_type: str = "") -> dict:
+    parsed = feedparser.parse(body, response_headers={"content-location": base_url, "content-type": content_type})
+    records = [entry_to_record(entry) for entry in parsed.entries]
+    bozo = str(parsed.bozo_exception) if parsed.bozo else None
+    return {"records": records, "mode": "full", "entries_seen": len(records), "early_exit": False, "bozo": bozo}
+
+
+def parse_feed(body: bytes, base_url: str = "", content_type: str = "", cutoff: datetime = None, known_urls=frozenset(), mode: str = None) -> dict:
+    """
+    Parses a feed body into {"records", "mode", "entries_seen", "early_exit", "bozo"}.
+    Records carry the normalized plain_text, excerpt and word_count.
+
+    mode: "incremental", "full" or "auto" (incremental for bodies of at least
+    FEED_INCREMENTAL_MIN_BYTES). Defaults to FEED_PARSE_MODE.
+    """
+    start = time.perf_counter()
+    mode = mode or PARSE_MODE
+    result = None
+    if mode == "incremental" or (mode == "auto" and len(body) >= INCREMENTAL_MIN_BYTES):
+        try:
+            result = parse_incremental(body, base_url, cutoff, known_urls)
+        except ET.ParseError:
+            # Broken XML: let feedparser's tolerant parser deal with it
+            pass
+    if result is None:
+        result = parse_full(body, base_url, content_type)
+    # Normalize here so the HTML stripping also runs on the parser pool
+    for record in result["records"]:
+        record.update(text_normalizer.normalize(record["summary"], record["content"]))
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that already runs scheduler and server threads is unsafe
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def submit_parse(body: bytes, base_url: str = "", content_type: str = "", cutoff: datetime = None, known_urls=frozenset(), mode: str = None) -> Future:
+    """
+    Schedules parse_feed on the parser process pool and returns its Future.
+    With FEED_PARSE_WORKERS=0 the parse runs inline and the Future is
+    already resolved.
+    """
+    args = (body, base_url, content_type, cutoff, frozenset(known_urls), mode)
+    if PARSE_WORKERS > 0:
+        try:
+            return _get_pool().submit(parse_feed, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge feed): start a fresh pool next time, parse inline now
+            _reset_pool()
+
+    future = Future()
+    try:
+        future.set_result(parse_feed(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,116 @@
+"""
+Keyword classifier used when Gemini is not configured or fails.
+
+Keywords are compiled once into a single regex that only matches at word
+boundaries, so "ai" no longer matches "said", nor "med" "media". Entries
+ending in "*" are stems ("pharma*" matches "pharmaceutical"), plain words
+also match their plural, and multi-word entries match across whitespace.
+One pass over the text scores every STEEPV and industry label; the label
+with the most hits wins, ties going to the one listed first.
+"""
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# The original fallback's keywords, plus the words it missed in common news
+# phrasing: full forms ("technology", "financial"), phrases ("machine
+# learning"), inflections it got from substring matching ("regulat*",
+# "ethic*", "medic*" in place of "med") and topic words that had no keyword
+# at all ("inflation", "emissions", "parliament", "hospital"). A "*" marks a
+# stem; short words like "ai" and "law" must match whole words.
+STEEPV_KEYWORDS = {
+    "Social": ["society", "people", "culture", "demographic*", "education", "health", "social", "community", "communities", "migration", "population", "workforce"],
+    "Technological": ["ai", "artificial intelligence", "machine learning", "software", "hardware", "digital", "tech", "technology", "cyber*", "data", "robot*", "semiconductor*", "quantum", "algorithm*"],
+    "Economic": ["money", "market*", "finance", "financial", "trade", "econom*", "business*", "investment*", "inflation", "gdp", "revenue*"],
+    "Environmental": ["climate", "carbon", "nature", "green", "energy", "sustainab*", "emission*", "renewable*", "biodiversity", "pollution"],
+    "Political": ["law", "laws", "government*", "policy", "policies", "regulat*", "vote*", "voting", "election*", "parliament", "senate", "legislat*"],
+    "Values": ["ethic*", "moral*", "belief*", "religion*", "religious", "trust", "privacy", "fairness", "values"],
+}
+
+INDUSTRY_KEYWORDS = {
+    "Technology": ["tech", "technology", "software", "saas", "cloud", "startup*"],
+    "Finance": ["bank*", "crypto*", "stock*", "fintech", "insurance", "investor*"],
+    "Healthcare": ["health", "healthcare", "medic*", "pharma*", "hospital*", "clinical"],
+    "Energy": ["oil", "gas", "solar", "wind", "electricity", "battery", "batteries", "nuclear"],
+    "Retail": ["shop*", "commerce", "e-commerce", "store*", "retail*", "consumer*"],
+}
+
+UNCATEGORIZED = "Uncategorized"
+GENERAL_INDUSTRY = "General"
+REASONING = "Heuristic fallback"
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation over `words` shaped as a trie, which re matches far faster than a flat list."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node) -> str:
+        ends = "" in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if ends else body
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern matcher for several taxonomies at once. All keywords are
+    compiled into one trie-shaped regex anchored at word starts; each match
+    also takes the rest of its word, which decides whether it counts: stems
+    accept any ending, plain words only an exact match or a plural "s".
+    Only the (few) matches are looked at in Python, never every token.
+    """
+
+    def __init__(self, taxonomies: List[Dict[str, List[str]]]):
+        self.labels = [list(keywords) for keywords in taxonomies]
+        self.keywords = {}
+        for t, keywords in enumerate(taxonomies):
+            for l, (label, words) in enumerate(keywords.items()):
+                for word in words:
+                    stem = word.endswith("*")
+                    literal = " ".join(word.rstrip("*").lower().split())
+                    self.keywords.setdefault(literal, []).append((t, l, stem))
+        trie = _trie_pattern(self.keywords).replace(re.escape(" "), r"\s+")
+        self.pattern = re.compile(r"(?<![\w-])(" + trie + r")([\w-]*)")
+
+    def scores(self, text: str) -> List[List[int]]:
+        """Hit counts per label, per taxonomy."""
+        counts = [[0] * len(labels) for labels in self.labels]
+        keywords = self.keywords
+        for literal, rest in self.pattern.findall(text.lower()):
+            hits = keywords.get(literal)
+            if hits is None:
+                # Phrases are stored with single spaces but match any run of whitespace
+                hits = keywords[" ".join(literal.split())]
+            for t, l, stem in hits:
+                if stem or rest in ("", "s"):
+                    counts[t][l] += 1
+        return counts
+
+    def best(self, text: str, defaults: List[str]) -> List[str]:
+        """The top label per taxonomy (first listed wins ties), or its default."""
+        results = []
+        for labels, counts, default in zip(self.labels, self.scores(text), defaults):
+            top = max(range(len(counts)), key=counts.__getitem__)
+            results.append(labels[top] if counts[top] else default)
+        return results
+
+
+_matcher = KeywordMatcher([STEEPV_KEYWORDS, INDUSTRY_KEYWORDS])
+
+
+def classify(title: str, summary: str) -> Tuple[str, str, str]:
+    """Returns (steepv_category, industry, reasoning)."""
+    steepv, industry = _matcher.best(f"{title} {summary}", [UNCATEGORIZED, GENERAL_INDUSTRY])
+    return steepv, industry, REASONING
+
+
+def classify_many(items: Iterable[Tuple[str, str]]) -> List[Tuple[str, str, str]]:
+    """Classifies (title, summary) pairs; results are in input order."""
+    return [classify(title or "", summary or "") for title, summary in items]
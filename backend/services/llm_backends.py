@@ -0,0 +1,255 @@
+"""
+The LLM behind ai_service. LLM_BACKEND picks one:
+
+  gemini     google.generativeai with the key and model from settings (default)
+  standin    the local HTTP stand-in (backend/standin_llm_server.py) at
+             LLM_STANDIN_URL, with configurable latency, errors and 429s
+  heuristic  answered in-process by HeuristicModel, no network at all
+
+Each backend hands out a client shaped like genai.GenerativeModel
+(generate_content(prompt, stream=False) returning an object with .text),
+so batching, caching, rate limiting and response parsing in ai_service run
+unchanged whichever one is configured. Backends other than Gemini report
+a model name of their own, so their results never share cache entries
+with Gemini's.
+"""
+import json
+import os
+import re
+import threading
+from types import SimpleNamespace
+from typing import List, Optional
+
+import google.generativeai as genai
+import requests
+from sqlalchemy.orm import Session
+
+from backend.services import heuristic_classifier, settings_service
+
+BACKEND = os.getenv("LLM_BACKEND", "gemini")
+STANDIN_URL = os.getenv("LLM_STANDIN_URL", "http://127.0.0.1:8090")
+STANDIN_TIMEOUT = float(os.getenv("LLM_STANDIN_TIMEOUT", "120"))
+
+DIGEST_MAX_CHARS = 2500
+DIGEST_LINE_CHARS = 200
+STREAM_CHUNK_CHARS = 80
+
+
+def _usage(prompt: str, text: str) -> SimpleNamespace:
+    prompt_tokens, output_tokens = len(prompt) // 4, len(text) // 4
+    return SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=output_tokens, total_token_count=prompt_tokens + output_tokens)
+
+
+def _batch_items(prompt: str) -> Optional[List[dict]]:
+    """The article list of a batch classification prompt: the first JSON array of objects with an id."""
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"\[\s*\{", prompt):
+        try:
+            value, _ = decoder.raw_decode(prompt, match.start())
+        except ValueError:
+            continue
+        if isinstance(value, list) and value and all(isinstance(item, dict) and "id" in item for item in value):
+            return value
+    return None
+
+
+class HeuristicModel:
+    """
+    Answers the prompts ai_service sends in the format Gemini is asked for:
+    classification prompts with keyword classifier labels, summary prompts
+    with an extractive digest of their bullet lines. Not rate limited.
+    """
+    rate_limited = False
+
+    def __init__(self, digest_chars: int = DIGEST_MAX_CHARS):
+        self.digest_chars = digest_chars
+
+    def reply(self, prompt: str) -> str:
+        items = _batch_items(prompt)
+        if items is not None:
+            answers = []
+            for item in items:
+                category, industry, reason = heuristic_classifier.classify(str(item.get("title", "")), str(item.get("summary", "")))
+                answers.append({"id": item["id"], "category": category, "reason": reason, "industry": industry})
+            return json.dumps(answers, ensure_ascii=False)
+        if '"category"' in prompt:
+            article = re.search(r"Noticia: (.*?)\n\s*Industria:", prompt, re.DOTALL)
+            category, industry, reason = heuristic_classifier.classify(article.group(1) if article else prompt, "")
+            return "\n".join(json.dumps(obj, ensure_ascii=False) for obj in ({"category": category}, {"reason": reason}, {"industry": industry}))
+        return self.digest(prompt)
+
+    def digest(self, prompt: str) -> str:
+        lines, seen, size = [], set(), 0
+        for line in prompt.splitlines():
+            line = line.strip()
+            if not line.startswith("- ") or line in seen:
+                continue
+            line = line[:DIGEST_LINE_CHARS]
+            if size + len(line) > self.digest_chars:
+                break
+            seen.add(line)
+            lines.append(line)
+            size += len(line) + 1
+        return "Key signals:\n" + "\n".join(lines)
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        text = self.reply(prompt)
+        if stream:
+            return iter([SimpleNamespace(text=text[i:i + STREAM_CHUNK_CHARS]) for i in range(0, len(text), STREAM_CHUNK_CHARS)])
+        return SimpleNamespace(text=text, usage_metadata=_usage(prompt, text))
+
+
+class _StreamedReply:
+    """Iterates the NDJSON chunks of a streamed stand-in reply; usage_metadata is set once it is consumed."""
+
+    def __init__(self, response: requests.Response):
+        self.response = response
+        self.usage_metadata = None
+
+    def __iter__(self):
+        with self.response:
+            for line in self.response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if "usage" in data:
+                    self.usage_metadata = SimpleNamespace(**data["usage"])
+                elif "error" in data:
+                    raise RuntimeError(f"Stand-in stream failed: {data['error']}")
+                else:
+                    yield SimpleNamespace(text=data["text"])
+
+
+class StandInModel:
+    """
+    Client for the stand-in server. HTTP errors are raised as
+    requests.HTTPError, whose message and Retry-After header the rate
+    limiter reads exactly like a Gemini quota error.
+    """
+
+    def __init__(self, url: str, model_name: str, timeout: float = STANDIN_TIMEOUT):
+        self.url = url.rstrip("/")
+        self.model_name = model_name
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        # One connection pool per thread; the map phase calls from several threads at once
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        response = self._session().post(
+            f"{self.url}/v1/generate",
+            json={"model": self.model_name, "prompt": prompt, "stream": stream},
+            stream=stream,
+            timeout=self.timeout,
+        )
+        if response.status_code >= 400:
+            response.close()
+        response.raise_for_status()
+        if stream:
+            return _StreamedReply(response)
+        data = response.json()
+        return SimpleNamespace(text=data["text"], usage_metadata=SimpleNamespace(**data["usage"]))
+
+
+class GeminiBackend:
+    name = "gemini"
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def available(self, db: Session) -> bool:
+        return bool(settings_service.current(db).gemini_api_key)
+
+    def model_name(self, db: Session) -> str:
+        return settings_service.current(db).gemini_model
+
+    def client(self, db: Session):
+        """
+        Returns a GenerativeModel for the configured key and model, reusing the
+        one built the last time the same pair was asked for.
+        """
+        settings = settings_service.current(db)
+        if not settings.gemini_api_key:
+            raise ValueError("Gemini API Key not configured.")
+
+        cache_key = (settings.gemini_api_key, settings.gemini_model)
+        with self._lock:
+            client = self._clients.get(cache_key)
+            if client is None:
+                # genai.configure is process-wide, so the cache only holds clients for the current key
+                if any(api_key != settings.gemini_api_key for api_key, _ in self._clients):
+                    self._clients.clear()
+                genai.configure(api_key=settings.gemini_api_key)
+                client = self._clients[cache_key] = genai.GenerativeModel(settings.gemini_model)
+            return client
+
+
+class StandInBackend:
+    name = "standin"
+
+    def __init__(self, url: str = STANDIN_URL):
+        self.url = url
+        self._client = None
+
+    def available(self, db: Session) -> bool:
+        return True
+
+    def model_name(self, db: Session) -> str:
+        return f"standin:{settings_service.current(db).gemini_model}"
+
+    def client(self, db: Session):
+        model_name = settings_service.current(db).gemini_model
+        client = self._client
+        if client is None or client.model_name != model_name:
+            client = self._client = StandInModel(self.url, model_name)
+        return client
+
+
+class HeuristicBackend:
+    name = "heuristic"
+
+    def __init__(self):
+        self.model = HeuristicModel()
+
+    def available(self, db: Session) -> bool:
+        return True
+
+    def model_name(self, db: Session) -> str:
+        return "heuristic"
+
+    def client(self, db: Session):
+        return self.model
+
+
+BACKENDS = {"gemini": GeminiBackend, "standin": StandInBackend, "heuristic": HeuristicBackend}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _create(name: str, **options):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{name}', expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name](**options)
+
+
+def configure(name: str, **options):
+    """Switches the process to another backend, e.g. configure("standin", url=...) in a benchmark."""
+    global _backend
+    backend = _create(name, **options)
+    with _backend_lock:
+        _backend = backend
+
+
+def current():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = _create(BACKEND)
+        return _backend
@@ -0,0 +1,229 @@
+"""
+Shared rate limiting for every LLM call made by this process.
+
+Two token buckets hold the budgets: requests per minute (LLM_REQUESTS_PER_MINUTE)
+and tokens per minute (LLM_TOKENS_PER_MINUTE). A call reserves one request
+and an estimate of its tokens before it is sent, and the estimate is settled
+against the usage the API reports afterwards.
+
+Waiting callers queue by lane: INTERACTIVE (someone is watching, e.g. a
+manual trend report) goes before SCHEDULED (the weekly reports), which goes
+before BACKGROUND (the classification queue). Within a lane, calls run in
+arrival order.
+
+A 429 pauses the whole limiter for the Retry-After the API asked for, or
+for a jittered exponential backoff when it did not say. Concurrent callers
+then back off together instead of each tripping the quota again.
+
+Budgets are per process: with several API or worker processes, divide the
+quota between them.
+"""
+import heapq
+import itertools
+import os
+import random
+import re
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "15"))
+TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "1000000"))
+OUTPUT_TOKENS_ESTIMATE = int(os.getenv("LLM_OUTPUT_TOKENS_ESTIMATE", "512"))
+MAX_BACKOFF_SECONDS = 120
+
+INTERACTIVE = 0
+SCHEDULED = 1
+BACKGROUND = 2
+LANE_NAMES = {INTERACTIVE: "interactive", SCHEDULED: "scheduled", BACKGROUND: "background"}
+
+
+def estimate_tokens(prompt: str) -> int:
+    # ~4 characters per token, plus room for the reply
+    return len(prompt) // 4 + OUTPUT_TOKENS_ESTIMATE
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    text = str(error)
+    return (
+        "429" in text or "Quota exceeded" in text or "RESOURCE_EXHAUSTED" in text
+        or type(error).__name__ in ("ResourceExhausted", "TooManyRequests")
+    )
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    The delay the server asked for, if any: a Retry-After header on an HTTP
+    error, or the retry_delay / "retry in Ns" hint in a Gemini quota error.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After") if hasattr(headers, "get") else None
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    match = re.search(r"retry in ([\d.]+)\s*s", str(error), re.IGNORECASE) or re.search(r"retry_delay\s*\{\s*seconds:\s*(\d+)", str(error))
+    return float(match.group(1)) if match else None
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: int = REQUESTS_PER_MINUTE, tokens_per_minute: int = TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.paused_until = 0.0
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._metrics = {
+            lane: {"calls": 0, "throttled": 0, "retries": 0, "errors": 0, "wait_total": 0.0, "wait_max": 0.0, "recent_waits": deque(maxlen=500)}
+            for lane in LANE_NAMES
+        }
+
+    def acquire(self, tokens: int, priority: int = BACKGROUND) -> float:
+        """
+        Blocks until this caller is first in line and both budgets allow the
+        call, then reserves one request and `tokens`. Returns the seconds waited.
+        """
+        start = time.monotonic()
+        entry = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    timeout = None # Not our turn: wait to be notified
+                    if self._waiters[0] == entry:
+                        now = time.monotonic()
+                        self.requests.refill(now)
+                        self.tokens.refill(now)
+                        timeout = max(self.paused_until - now, self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                        if timeout <= 0:
+                            self.requests.level -= 1
+                            self.tokens.level -= min(tokens, self.tokens.capacity)
+                            break
+                    self._cond.wait(timeout)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+        waited = time.monotonic() - start
+        with self._cond:
+            lane = self._metrics[priority]
+            lane["calls"] += 1
+            lane["wait_total"] += waited
+            lane["wait_max"] = max(lane["wait_max"], waited)
+            lane["recent_waits"].append(waited)
+        return waited
+
+    def settle(self, estimated: int, actual: int):
+        """Returns (or charges) the difference between a reservation and real usage."""
+        with self._cond:
+            self.tokens.level = min(self.tokens.capacity, self.tokens.level + estimated - actual)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        with self._cond:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def call(self, fn: Callable, prompt: str, priority: int = BACKGROUND, retries: int = 3, initial_delay: float = 5):
+        """
+        Runs fn() (one LLM request for `prompt`) under the budgets, retrying
+        rate-limit errors up to `retries` attempts in total.
+        """
+        estimated = estimate_tokens(prompt)
+        for attempt in range(retries):
+            self.acquire(estimated, priority)
+            try:
+                response = fn()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    self._bump(priority, "errors")
+                    raise
+                self._bump(priority, "throttled")
+                if attempt >= retries - 1:
+                    raise
+                delay = retry_after_seconds(e)
+                if delay is not None:
+                    delay += random.uniform(0, 1)
+                else:
+                    delay = min(MAX_BACKOFF_SECONDS, initial_delay * (2 ** attempt)) * random.uniform(0.5, 1.5)
+                print(f"LLM rate limited. Pausing {delay:.1f}s before retry {attempt + 2}/{retries}")
+                self.pause(delay)
+                self._bump(priority, "retries")
+                continue
+
+            meta = getattr(response, "usage_metadata", None)
+            actual = getattr(meta, "total_token_count", None)
+            if actual:
+                self.settle(estimated, actual)
+            return response
+
+    def _bump(self, priority: int, key: str):
+        with self._cond:
+            self._metrics[priority][key] += 1
+
+    def metrics(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            lanes = {}
+            for priority, lane in self._metrics.items():
+                waits = sorted(lane["recent_waits"])
+                lanes[LANE_NAMES[priority]] = {
+                    "calls": lane["calls"],
+                    "throttled": lane["throttled"],
+                    "retries": lane["retries"],
+                    "errors": lane["errors"],
+                    "wait_avg_seconds": round(lane["wait_total"] / lane["calls"], 3) if lane["calls"] else 0.0,
+                    "wait_p50_seconds": round(statistics.median(waits), 3) if waits else 0.0,
+                    "wait_p95_seconds": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 3) if waits else 0.0,
+                    "wait_max_seconds": round(lane["wait_max"], 3),
+                }
+            return {
+                "requests_per_minute": int(self.requests.capacity),
+                "tokens_per_minute": int(self.tokens.capacity),
+                "requests_available": round(self.requests.level, 2),
+                "tokens_available": round(self.tokens.level),
+                "queued": len(self._waiters),
+                "paused_for_seconds": round(max(0.0, self.paused_until - now), 1),
+                "lanes": lanes,
+            }
+
+
+limiter = RateLimiter()
+
+
+def configure(requests_per_minute: int, tokens_per_minute: int = TOKENS_PER_MINUTE):
+    """Replaces the process-wide limiter, e.g. for benchmarks with other budgets."""
+    global limiter
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+
+
+def call(fn: Callable, prompt: str, priority: int = BACKGROUND, retries: int = 3, initial_delay: float = 5):
+    return limiter.call(fn, prompt, priority=priority, retries=retries, initial_delay=initial_delay)
+
+
+def metrics() -> dict:
+    return limiter.metrics()
@@ -0,0 +1,271 @@
+"""
+Local first-pass STEEPV classifier: TF-IDF features over title and summary
+with a multinomial logistic regression, in pure Python.
+
+It is trained offline from the articles table (see
+backend/train_local_classifier.py) and saved as a gzipped JSON artifact at
+LOCAL_CLASSIFIER_PATH. At classification time predict() returns a label and
+its probability; callers only go to Gemini when that probability is below
+LOCAL_CLASSIFIER_THRESHOLD. Without an artifact, predict() returns None and
+nothing changes.
+"""
+import gzip
+import json
+import math
+import os
+import random
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from backend import models
+from backend.services import common, heuristic_classifier
+
+MODEL_PATH = os.getenv("LOCAL_CLASSIFIER_PATH", "./local_classifier.json.gz")
+THRESHOLD = float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.8"))
+
+MIN_DF = 2
+MAX_FEATURES = 20000
+EPOCHS = 12
+LEARNING_RATE = 0.5
+L2 = 1e-5
+WEIGHT_PRECISION = 4
+REASONING_PREFIX = "Local model"
+
+_TOKEN = re.compile(r"[^\W\d_]{2,}", re.UNICODE)
+STOPWORDS = set("""
+the and for that with this from are was were has have had but not you your its their they them his her our
+will would can could into over more than about after before also just new says said who what when where how
+los las del por para con una uno que como más sus este esta son fue han pero sin sobre entre
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    words = [w for w in _TOKEN.findall(text.lower()) if w not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _features(tokens: List[str], index: Dict[str, int], idf: List[float]) -> Dict[int, float]:
+    """Sublinear TF-IDF, L2-normalized, as a sparse {feature index: value} dict."""
+    counts = Counter(t for t in tokens if t in index)
+    vector = {index[t]: (1 + math.log(c)) * idf[index[t]] for t, c in counts.items()}
+    norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+    return {i: v / norm for i, v in vector.items()}
+
+
+def _softmax(scores: List[float]) -> List[float]:
+    top = max(scores)
+    exps = [math.exp(s - top) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
+
+
+class LocalClassifier:
+    def __init__(self, labels: List[str], vocabulary: List[str], idf: List[float], weights: List[Dict[int, float]], bias: List[float], meta: dict = None):
+        self.labels = labels
+        self.vocabulary = vocabulary
+        self.index = {term: i for i, term in enumerate(vocabulary)}
+        self.idf = idf
+        self.weights = weights
+        self.bias = bias
+        self.meta = meta or {}
+
+    def probabilities(self, title: str, summary: str) -> List[float]:
+        x = _features(tokenize(f"{title} {summary}"), self.index, self.idf)
+        return _softmax([
+            b + sum(w.get(i, 0.0) * v for i, v in x.items())
+            for w, b in zip(self.weights, self.bias)
+        ])
+
+    def predict(self, title: str, summary: str) -> Tuple[str, float]:
+        probs = self.probabilities(title, summary)
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self.labels[best], probs[best]
+
+    def to_dict(self) -> dict:
+        return {
+            "labels": self.labels,
+            "vocabulary": self.vocabulary,
+            "idf": [round(v, WEIGHT_PRECISION) for v in self.idf],
+            # Sparse and rounded: near-zero weights are dropped to keep the artifact small
+            "weights": [
+                {str(i): round(v, WEIGHT_PRECISION) for i, v in w.items() if abs(v) >= 10 ** -WEIGHT_PRECISION}
+                for w in self.weights
+            ],
+            "bias": [round(b, WEIGHT_PRECISION) for b in self.bias],
+            "meta": self.meta,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LocalClassifier":
+        weights = [{int(i): v for i, v in w.items()} for w in data["weights"]]
+        return cls(data["labels"], data["vocabulary"], data["idf"], weights, data["bias"], data.get("meta"))
+
+
+def train(samples: List[Tuple[str, str, str]], epochs: int = EPOCHS, seed: int = 13) -> LocalClassifier:
+    """Fits the vectorizer and model on (title, summary, label) samples."""
+    labels = sorted({label for _, _, label in samples})
+    docs = [tokenize(f"{title} {summary}") for title, summary, _ in samples]
+
+    df = Counter(term for tokens in docs for term in set(tokens))
+    vocabulary = [term for term, count in df.most_common(MAX_FEATURES) if count >= MIN_DF]
+    index = {term: i for i, term in enumerate(vocabulary)}
+    n = len(docs)
+    idf = [math.log((1 + n) / (1 + df[term])) + 1 for term in vocabulary]
+
+    xs = [_features(tokens, index, idf) for tokens in docs]
+    ys = [labels.index(label) for _, _, label in samples]
+    weights = [dict() for _ in labels]
+    bias = [0.0] * len(labels)
+
+    order = list(range(n))
+    rng = random.Random(seed)
+    step = 0
+    for epoch in range(epochs):
+        rng.shuffle(order)
+        for j in order:
+            step += 1
+            rate = LEARNING_RATE / (1 + step * L2 * LEARNING_RATE)
+            x, y = xs[j], ys[j]
+            probs = _softmax([b + sum(w.get(i, 0.0) * v for i, v in x.items()) for w, b in zip(weights, bias)])
+            for k, p in enumerate(probs):
+                grad = p - (1.0 if k == y else 0.0)
+                if abs(grad) < 1e-6:
+                    continue
+                w = weights[k]
+                for i, v in x.items():
+                    w[i] = w.get(i, 0.0) * (1 - rate * L2) - rate * grad * v
+                bias[k] -= rate * grad
+
+    meta = {"trained_at": datetime.utcnow().isoformat(), "samples": n, "label_counts": dict(Counter(label for _, _, label in samples))}
+    return LocalClassifier(labels, vocabulary, idf, weights, bias, meta)
+
+
+def evaluate(model: LocalClassifier, samples: Iterable[Tuple[str, str, str]], threshold: float = THRESHOLD) -> dict:
+    """Accuracy overall and above the confidence threshold, plus per-label recall."""
+    total = correct = confident = confident_correct = 0
+    per_label = {}
+    for title, summary, label in samples:
+        predicted, confidence = model.predict(title, summary)
+        hit = predicted == label
+        total += 1
+        correct += hit
+        stats = per_label.setdefault(label, {"support": 0, "correct": 0})
+        stats["support"] += 1
+        stats["correct"] += hit
+        if confidence >= threshold:
+            confident += 1
+            confident_correct += hit
+    return {
+        "samples": total,
+        "accuracy": round(correct / total, 3) if total else None,
+        "threshold": threshold,
+        "coverage": round(confident / total, 3) if total else None, # share that would skip Gemini
+        "accuracy_above_threshold": round(confident_correct / confident, 3) if confident else None,
+        "recall_per_label": {label: round(s["correct"] / s["support"], 3) for label, s in sorted(per_label.items())},
+    }
+
+
+def training_samples(db: Session, steepv_categories: List[str]) -> List[Tuple[int, str, str, str]]:
+    """
+    (id, title, text, label) for articles with a settled STEEPV category:
+    rated by an editor, or classified by Gemini. Labels from the keyword
+    fallback or from this model itself are left out, rated or not: the
+    rating is about the signal, not a check of the category.
+    """
+    Article = models.Article
+    curated = and_(Article.signal_strength.isnot(None), Article.signal_strength != "pending")
+    by_gemini = Article.classification_status == models.ClassificationStatus.DONE.value
+    not_self_labelled = or_(Article.ai_reasoning.is_(None), and_(
+        Article.ai_reasoning != heuristic_classifier.REASONING,
+        Article.ai_reasoning.notlike(f"{REASONING_PREFIX}%"),
+    ))
+    rows = db.query(
+        Article.id, Article.title, Article.excerpt, Article.summary, Article.steepv_category,
+    ).filter(
+        Article.steepv_category.in_(steepv_categories),
+        or_(curated, by_gemini),
+        not_self_labelled,
+    ).order_by(Article.id).all()
+    return [(row.id, row.title or "", row.excerpt or row.summary or "", row.steepv_category) for row in rows]
+
+
+def save(model: LocalClassifier, path: str = None):
+    path = path or MODEL_PATH
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(model.to_dict(), f, separators=(",", ":"))
+    reset()
+
+
+def load(path: str = None) -> LocalClassifier:
+    with gzip.open(path or MODEL_PATH, "rt", encoding="utf-8") as f:
+        return LocalClassifier.from_dict(json.load(f))
+
+
+_model = None
+_model_mtime = None
+_lock = threading.Lock()
+
+_counters = common.Counters("confident", "deferred")
+
+
+def counters() -> dict:
+    return _counters.snapshot()
+
+
+def current() -> Optional[LocalClassifier]:
+    """The artifact at MODEL_PATH, reloaded when the file changes; None if there is none."""
+    global _model, _model_mtime
+    try:
+        mtime = os.path.getmtime(MODEL_PATH)
+    except OSError:
+        return None
+    with _lock:
+        if _model is None or mtime != _model_mtime:
+            _model = load(MODEL_PATH)
+            _model_mtime = mtime
+        return _model
+
+
+def reset():
+    global _model, _model_mtime
+    with _lock:
+        _model = None
+        _model_mtime = None
+
+
+def predict(title: str, summary: str) -> Optional[Tuple[str, float]]:
+    model = current()
+    return model.predict(title, summary) if model else None
+
+
+def confident_label(title: str, summary: str, threshold: float = None) -> Optional[Tuple[str, float]]:
+    """(label, confidence) when the model clears the threshold, else None."""
+    prediction = predict(title, summary)
+    if prediction is None:
+        return None
+    if prediction[1] < (THRESHOLD if threshold is None else threshold):
+        _counters.bump("deferred")
+        return None
+    _counters.bump("confident")
+    return prediction
+
+
+def model_stats() -> dict:
+    model = current()
+    stats = counters()
+    decided = stats["confident"] + stats["deferred"]
+    return {
+        "loaded": model is not None,
+        "path": MODEL_PATH,
+        "threshold": THRESHOLD,
+        "meta": model.meta if model else None,
+        "vocabulary": len(model.vocabulary) if model else None,
+        "local_rate": round(stats["confident"] / decided, 3) if decided else None,
+        "counters": stats,
+    }
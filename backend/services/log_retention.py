@@ -0,0 +1,286 @@
+"""
+Retention for system_logs: old days move out of the table into gzipped
+NDJSON archive files, which can still be queried on demand.
+
+Logs are bucketed by UTC day. A day's rows at a given level are archived
+once the whole day is older than that level's retention
+(LOG_RETENTION_DAYS_BY_LEVEL, e.g. "DEBUG:3,INFO:14,WARNING:30,ERROR:90";
+other levels keep LOG_RETENTION_DAYS). Each archived bucket is one file,
+LOG_ARCHIVE_DIR/system_logs/YYYY-MM/<day>.<level>.<first id>-<last id>.ndjson.gz,
+written completely before its rows are deleted; rerunning after a crash
+rewrites the same file instead of duplicating it.
+
+On PostgreSQL system_logs is partitioned by day (migration m0004). The
+retention run keeps LOG_PARTITION_DAYS_AHEAD partitions ready and drops a
+day's partition once every level in it has been archived, instead of
+deleting its rows. SQLite has no partitions: the table holds the recent
+days and the archive files are the older buckets.
+"""
+import gzip
+import json
+import os
+import re
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, func, not_, or_, select, text
+
+from backend import database, models
+
+LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", "30"))
+LOG_ARCHIVE_DIR = os.getenv("LOG_ARCHIVE_DIR", "./log_archive")
+LOG_PARTITION_DAYS_AHEAD = int(os.getenv("LOG_PARTITION_DAYS_AHEAD", "7"))
+ARCHIVE_CHUNK = 5000
+# Bounds the work one archive query can ask for
+MAX_QUERY_DAYS = 31
+
+
+def _parse_days(value: str) -> Dict[str, int]:
+    days = {}
+    for part in value.split(","):
+        if part.strip():
+            level, count = part.split(":")
+            days[level.strip().upper()] = int(count)
+    return days
+
+
+LOG_RETENTION_DAYS_BY_LEVEL = _parse_days(os.getenv("LOG_RETENTION_DAYS_BY_LEVEL", "DEBUG:3,INFO:14,WARNING:30,ERROR:90"))
+
+OTHER_LEVELS = "OTHER"
+Log = models.SystemLog.__table__
+
+_ARCHIVE_NAME = re.compile(r"^(\d{4}-\d{2}-\d{2})\.(\w+)\.(\d+)-(\d+)\.ndjson\.gz$")
+
+
+def _groups(retention: Dict[str, int], default_days: int) -> list:
+    """(file label, WHERE clause, days kept) for each configured level, plus one for all other levels."""
+    groups = [(level, Log.c.level == level, days) for level, days in retention.items()]
+    groups.append((OTHER_LEVELS, or_(Log.c.level.is_(None), not_(Log.c.level.in_(list(retention)))), default_days))
+    return groups
+
+
+def _day_range(day: date):
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
+
+
+# --- PostgreSQL partitions ---
+
+def partition_name(day: date) -> str:
+    return f"system_logs_p{day:%Y%m%d}"
+
+
+def partitions(conn) -> Dict[date, str]:
+    rows = conn.execute(text("""
+        SELECT child.relname FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        WHERE parent.relname = 'system_logs'
+    """)).scalars()
+    found = {}
+    for name in rows:
+        match = re.match(r"^system_logs_p(\d{8})$", name)
+        if match:
+            found[datetime.strptime(match.group(1), "%Y%m%d").date()] = name
+    return found
+
+
+def create_partition(conn, day: date) -> bool:
+    """
+    Creates the partition for `day`. Returns False if that is impossible
+    because the default partition already holds rows for the day; they stay
+    there and are archived from it like any other rows.
+    """
+    start, end = _day_range(day)
+    try:
+        with conn.begin_nested():
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF system_logs "
+                f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+            ))
+        return True
+    except Exception:
+        return False
+
+
+def ensure_partitions(conn, today: date, days_ahead: int = LOG_PARTITION_DAYS_AHEAD) -> int:
+    existing = partitions(conn)
+    created = 0
+    for offset in range(days_ahead + 1):
+        day = today + timedelta(days=offset)
+        if day not in existing and create_partition(conn, day):
+            created += 1
+    return created
+
+
+# --- Archiving ---
+
+def archive_path(archive_dir: str, day: date, label: str, first_id: int, last_id: int) -> str:
+    return os.path.join(archive_dir, "system_logs", f"{day:%Y-%m}", f"{day:%Y-%m-%d}.{label}.{first_id}-{last_id}.ndjson.gz")
+
+
+def _row_json(row) -> str:
+    return json.dumps({
+        "id": row.id, "timestamp": row.timestamp.isoformat() if row.timestamp else None,
+        "level": row.level, "event_type": row.event_type, "message": row.message, "details": row.details,
+    }, default=str)
+
+
+def _archive_bucket(conn, archive_dir: str, day: date, label: str, where) -> dict:
+    """Writes one (day, level) bucket to its file, then deletes its rows. Returns {"rows", "bytes"}."""
+    start, end = _day_range(day)
+    bucket = and_(Log.c.timestamp >= start, Log.c.timestamp < end, where)
+    os.makedirs(os.path.join(archive_dir, "system_logs", f"{day:%Y-%m}"), exist_ok=True)
+    tmp_path = os.path.join(archive_dir, "system_logs", f"{day:%Y-%m}", f".{day:%Y-%m-%d}.{label}.tmp")
+    first_id = last_id = None
+    count = 0
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as out:
+        # Keyed on id so memory stays bounded however big the day is
+        while True:
+            query = select(Log).where(bucket).order_by(Log.c.id).limit(ARCHIVE_CHUNK)
+            if last_id is not None:
+                query = query.where(Log.c.id > last_id)
+            rows = conn.execute(query).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                out.write(_row_json(row) + "\n")
+            first_id = rows[0].id if first_id is None else first_id
+            last_id = rows[-1].id
+            count += len(rows)
+    if not count:
+        os.remove(tmp_path)
+        return {"rows": 0, "bytes": 0}
+    path = archive_path(archive_dir, day, label, first_id, last_id)
+    os.replace(tmp_path, path)
+    conn.execute(Log.delete().where(bucket, Log.c.id <= last_id))
+    return {"rows": count, "bytes": os.path.getsize(path)}
+
+
+def run(
+    engine=None, now: datetime = None, archive_dir: str = None, dry_run: bool = False,
+    retention: Dict[str, int] = None, default_days: int = None,
+) -> dict:
+    """
+    Archives every (day, level) bucket past its retention and, on
+    PostgreSQL, drops emptied partitions and creates upcoming ones. Each
+    bucket is its own transaction. Returns a report of what was moved.
+    """
+    engine = engine or database.engine
+    archive_dir = archive_dir or LOG_ARCHIVE_DIR
+    retention = LOG_RETENTION_DAYS_BY_LEVEL if retention is None else retention
+    default_days = LOG_RETENTION_DAYS if default_days is None else default_days
+    today = (now or datetime.utcnow()).date()
+    postgres = engine.dialect.name == "postgresql"
+    report = {"archived": {}, "files": 0, "bytes": 0, "partitions_created": 0, "partitions_dropped": 0, "dry_run": dry_run}
+    start = time.perf_counter()
+
+    for label, where, days in _groups(retention, default_days):
+        cutoff = today - timedelta(days=days)
+        with engine.connect() as conn:
+            oldest = conn.execute(select(func.min(Log.c.timestamp)).where(where)).scalar()
+        if oldest is None:
+            continue
+        day = oldest.date()
+        while day < cutoff:
+            with engine.begin() as conn:
+                if dry_run:
+                    day_start, day_end = _day_range(day)
+                    moved = {"rows": conn.execute(select(func.count()).select_from(Log).where(
+                        Log.c.timestamp >= day_start, Log.c.timestamp < day_end, where,
+                    )).scalar(), "bytes": 0}
+                else:
+                    moved = _archive_bucket(conn, archive_dir, day, label, where)
+            if moved["rows"]:
+                report["archived"][label] = report["archived"].get(label, 0) + moved["rows"]
+                report["files"] += 0 if dry_run else 1
+                report["bytes"] += moved["bytes"]
+            day += timedelta(days=1)
+
+    if postgres and not dry_run:
+        # A day is fully archived once the level kept longest has expired
+        last_expired = today - timedelta(days=max([default_days, *retention.values()]))
+        with engine.begin() as conn:
+            for day, name in sorted(partitions(conn).items()):
+                if day < last_expired:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                    report["partitions_dropped"] += 1
+            report["partitions_created"] = ensure_partitions(conn, today)
+
+    report["seconds"] = round(time.perf_counter() - start, 2)
+    return report
+
+
+# --- Reading the archive ---
+
+def _archive_files(archive_dir: str, first_day: date = None, last_day: date = None) -> list:
+    """(day, level, path) for every archive file, optionally limited to a day range."""
+    root = os.path.join(archive_dir, "system_logs")
+    if not os.path.isdir(root):
+        return []
+    found = []
+    for month in sorted(os.listdir(root)):
+        month_dir = os.path.join(root, month)
+        if not os.path.isdir(month_dir):
+            continue
+        for name in sorted(os.listdir(month_dir)):
+            match = _ARCHIVE_NAME.match(name)
+            if not match:
+                continue
+            day = datetime.strptime(match.group(1), "%Y-%m-%d").date()
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            found.append((day, match.group(2), os.path.join(month_dir, name)))
+    return found
+
+
+def archived_days(archive_dir: str = None) -> List[dict]:
+    """One entry per archived day: its levels, file count and compressed size."""
+    days = {}
+    for day, level, path in _archive_files(archive_dir or LOG_ARCHIVE_DIR):
+        entry = days.setdefault(day, {"day": day.isoformat(), "levels": [], "files": 0, "bytes": 0})
+        if level not in entry["levels"]:
+            entry["levels"].append(level)
+        entry["files"] += 1
+        entry["bytes"] += os.path.getsize(path)
+    return [days[day] for day in sorted(days, reverse=True)]
+
+
+def query_archive(
+    start: datetime, end: datetime, level: Optional[str] = None, event_type: Optional[str] = None,
+    search: Optional[str] = None, limit: int = 100, archive_dir: str = None,
+) -> List[dict]:
+    """
+    Archived events with start <= timestamp < end, newest first, filtered
+    like /logs (search is a case-insensitive substring of the message).
+    Raises ValueError for ranges longer than MAX_QUERY_DAYS.
+    """
+    # Stored timestamps are naive UTC
+    start, end = (value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value for value in (start, end))
+    if end <= start:
+        raise ValueError("end must be after start")
+    if end - start > timedelta(days=MAX_QUERY_DAYS):
+        raise ValueError(f"Archive queries are limited to {MAX_QUERY_DAYS} days")
+    needle = search.lower() if search else None
+    matches = []
+    for day, file_level, path in _archive_files(archive_dir or LOG_ARCHIVE_DIR, start.date(), end.date()):
+        # Files of other levels cannot match; the OTHER bucket is checked row by row
+        if level and level != "ALL" and file_level not in (level, OTHER_LEVELS):
+            continue
+        with gzip.open(path, "rt", encoding="utf-8") as lines:
+            for line in lines:
+                event = json.loads(line)
+                timestamp = datetime.fromisoformat(event["timestamp"]) if event["timestamp"] else None
+                if timestamp is None or not (start <= timestamp < end):
+                    continue
+                if level and level != "ALL" and event["level"] != level:
+                    continue
+                if event_type and event_type != "ALL" and event["event_type"] != event_type:
+                    continue
+                if needle and needle not in (event["message"] or "").lower():
+                    continue
+                event["timestamp"] = timestamp
+                matches.append(event)
+    matches.sort(key=lambda event: (event["timestamp"], event["id"]), reverse=True)
+    return matches[:limit]
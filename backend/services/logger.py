@@ -1,27 +1,202 @@
+"""
+System events for the admin logs page, written off the caller's thread.
+
+log_event() never touches the caller's session or transaction. It drops
+events below LOG_MIN_LEVEL, samples event types listed in LOG_SAMPLE_RATES
+(below WARNING only; warnings and errors are always kept) and puts the rest
+on a bounded queue. A background writer drains the queue and bulk-inserts
+batches of up to LOG_BATCH_SIZE rows through its own connection, waiting at
+most LOG_FLUSH_SECONDS to fill one. If the queue is full the event is
+dropped and counted instead of blocking the caller.
+"""
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict
+
 from sqlalchemy.orm import Session
-from backend import models
-import traceback
+
+from backend import database, models
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+LOG_MIN_LEVEL = os.getenv("LOG_MIN_LEVEL", "INFO")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "500"))
+LOG_FLUSH_SECONDS = float(os.getenv("LOG_FLUSH_SECONDS", "0.5"))
+
+
+def _parse_rates(value: str) -> Dict[str, float]:
+    """"FEED:0.1,AI:0.5" -> {"FEED": 0.1, "AI": 0.5}: the share of each type's events kept."""
+    rates = {}
+    for part in value.split(","):
+        if part.strip():
+            event_type, rate = part.split(":")
+            rates[event_type.strip().upper()] = float(rate)
+    return rates
+
+
+LOG_SAMPLE_RATES = _parse_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+
+class EventSink:
+    def __init__(
+        self, min_level: str = LOG_MIN_LEVEL, sample_rates: Dict[str, float] = None,
+        queue_size: int = LOG_QUEUE_SIZE, batch_size: int = LOG_BATCH_SIZE, flush_seconds: float = LOG_FLUSH_SECONDS,
+    ):
+        self.min_level = LEVELS[min_level.upper()]
+        self.sample_rates = dict(LOG_SAMPLE_RATES if sample_rates is None else sample_rates)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._random = random.Random()
+        self._counters = {"queued": 0, "written": 0, "batches": 0, "below_level": 0, "sampled_out": 0, "dropped": 0, "write_errors": 0}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def _bump(self, key: str, amount: int = 1):
+        with self._lock:
+            self._counters[key] += amount
+
+    def emit(self, engine, level: str, event_type: str, message: str, details: dict = None) -> bool:
+        """Queues one event for `engine`'s database. Returns False if it was filtered out or dropped."""
+        rank = LEVELS.get(level, LEVELS["INFO"])
+        if rank < self.min_level:
+            self._bump("below_level")
+            return False
+        rate = self.sample_rates.get(event_type)
+        if rate is not None and rank < LEVELS["WARNING"] and self._random.random() >= rate:
+            self._bump("sampled_out")
+            return False
+        if details is not None:
+            # Serialized now: callers may keep mutating the dict, and datetimes must survive the JSON column
+            details = json.loads(json.dumps(details, default=str))
+        row = {"timestamp": datetime.utcnow(), "level": level, "event_type": event_type, "message": message, "details": details}
+        self._ensure_writer()
+        try:
+            self.queue.put_nowait((engine, row))
+        except queue.Full:
+            self._bump("dropped")
+            return False
+        self._bump("queued")
+        return True
+
+    def _ensure_writer(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="event-sink", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not (self._stopping.is_set() and self.queue.empty()):
+            try:
+                item = self.queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                continue
+            batch, markers = [], []
+            deadline = time.monotonic() + self.flush_seconds
+            while True:
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    break # a flush() is waiting: write what we have now
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for marker in markers:
+                marker.set()
+
+    def _write(self, batch: list):
+        by_engine = {}
+        for engine, row in batch:
+            by_engine.setdefault(engine, []).append(row)
+        for engine, rows in by_engine.items():
+            try:
+                with engine.begin() as conn:
+                    conn.execute(models.SystemLog.__table__.insert(), rows)
+                self._bump("written", len(rows))
+                self._bump("batches")
+            except Exception as e:
+                print(f"FAILED TO WRITE {len(rows)} LOG EVENTS: {e}")
+                self._bump("write_errors")
+                self._bump("dropped", len(rows))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Waits until everything queued so far is written. Returns False on timeout."""
+        if self._thread is None or not self._thread.is_alive():
+            return self.queue.empty()
+        marker = threading.Event()
+        try:
+            self.queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0):
+        """Writes what is queued and stops the writer."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "min_level": next(name for name, rank in LEVELS.items() if rank == self.min_level),
+            "sample_rates": dict(self.sample_rates),
+        }
+
+
+sink = EventSink()
+atexit.register(lambda: sink.shutdown())
+
+
+def configure(**options):
+    """Replaces the process-wide sink, e.g. configure(min_level="DEBUG") in a benchmark. Writes out the old one first."""
+    global sink
+    old, sink = sink, EventSink(**options)
+    old.shutdown()
+
 
 def log_event(db: Session, level: str, event_type: str, message: str, details: dict = None):
     """
-    Logs a system event to the database.
-    
+    Logs a system event. Returns immediately; the row is written shortly
+    after by the background writer.
+
     Args:
-        db: Database session
-        level: INFO, WARNING, ERROR
+        db: Session whose database the event goes to (None for the app's
+            database). Only its engine is used: nothing is added or committed.
+        level: DEBUG, INFO, WARNING, ERROR
         event_type: FEED, AI, SYSTEM, USER
         message: Short description of the event
         details: Optional dictionary with more context
     """
     try:
-        log_entry = models.SystemLog(
-            level=level,
-            event_type=event_type,
-            message=message,
-            details=details
-        )
-        db.add(log_entry)
-        db.commit()
+        sink.emit(db.get_bind() if db is not None else database.engine, level, event_type, message, details)
     except Exception as e:
         print(f"FAILED TO LOG EVENT: {e}")
         # Don't raise exception to avoid breaking the main flow
+
+
+def flush(timeout: float = 5.0) -> bool:
+    return sink.flush(timeout)
+
+
+def stats() -> dict:
+    return sink.stats()
@@ -0,0 +1,61 @@
+"""
+Newest-first pagination for list endpoints, by offset or by keyset cursor.
+
+Rows are ordered by (sort column DESC, id DESC) with NULL sort values last,
+so the order is total and stable. A cursor is an opaque token for the last
+row of a page: the next page is the rows strictly after it in that order,
+found with an index range scan however deep the page is, and rows inserted
+meanwhile never shift it. Offset paging is kept for existing clients.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(value: Optional[datetime], row_id: int) -> str:
+    raw = json.dumps([value.isoformat() if value is not None else None, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Raises ValueError for anything encode_cursor did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        return (datetime.fromisoformat(value) if value is not None else None), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def page(query: Query, sort_column, id_column, limit: int, cursor: str = None, skip: int = 0) -> Tuple[List, Optional[str]]:
+    """
+    One page of `query`, newest first. With a cursor, the rows after it
+    (skip is ignored); otherwise the page at offset `skip`. Returns the rows
+    and the cursor for the next page, or None if this page was the last.
+    """
+    order = sort_column.desc()
+    if query.session.get_bind().dialect.name == "postgresql":
+        # SQLite already sorts NULLs last in DESC order, and an explicit clause would keep it off the index
+        order = order.nulls_last()
+
+    if cursor is None:
+        rows = query.order_by(order, id_column.desc()).offset(skip).limit(limit).all()
+    else:
+        value, last_id = decode_cursor(cursor)
+        nulls = query.filter(sort_column.is_(None)).order_by(id_column.desc())
+        if value is None:
+            rows = nulls.filter(id_column < last_id).limit(limit).all()
+        else:
+            # The row-value comparison leaves out NULL sort values; they follow once the dated rows run out
+            rows = query.filter(tuple_(sort_column, id_column) < (value, last_id)).order_by(order, id_column.desc()).limit(limit).all()
+            if len(rows) < limit:
+                rows += nulls.limit(limit - len(rows)).all()
+
+    if not rows or len(rows) < limit:
+        return rows, None
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
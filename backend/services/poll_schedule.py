@@ -0,0 +1,100 @@
+"""
+Per-feed polling schedule.
+
+Every feed carries its own next_fetch_at. A single dispatcher job (see
+scheduler.run_feed_dispatcher) wakes up every minute and refreshes only the
+feeds that are due. In the fixed modes (hourly/daily/weekly) every feed gets
+the same interval; in "adaptive" mode each feed's interval is learned from
+the published_at history of its articles, so busy sources are polled more
+often and quiet ones much less.
+"""
+import os
+import statistics
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from backend import models
+from backend.services import settings_service
+
+FIXED_INTERVALS = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+
+MIN_INTERVAL = timedelta(minutes=int(os.getenv("ADAPTIVE_POLL_MIN_MINUTES", "15")))
+MAX_INTERVAL = timedelta(minutes=int(os.getenv("ADAPTIVE_POLL_MAX_MINUTES", str(24 * 60))))
+DEFAULT_INTERVAL = timedelta(hours=1) # Until a feed has enough history to learn from
+HISTORY_SIZE = 20 # Most recent articles used to estimate a feed's publishing rate
+HISTORY_WINDOW = timedelta(days=30)
+MIN_HISTORY = 3
+POLLS_PER_ITEM = 2 # Poll twice per expected new item so we pick it up within half a gap
+
+
+def get_schedule_mode(db: Session) -> str:
+    value = settings_service.current(db).feed_schedule
+    return value if value == "adaptive" or value in FIXED_INTERVALS else "hourly"
+
+
+def learn_interval(db: Session, feed: models.Feed) -> timedelta:
+    """
+    Estimates a polling interval from the gaps between the feed's most recent
+    publication dates, clamped to [MIN_INTERVAL, MAX_INTERVAL].
+    """
+    since = datetime.utcnow() - HISTORY_WINDOW
+    rows = db.query(models.Article.published_at).filter(
+        models.Article.feed_id == feed.id,
+        models.Article.published_at.isnot(None),
+        models.Article.published_at >= since,
+    ).order_by(models.Article.published_at.desc()).limit(HISTORY_SIZE).all()
+    published = [row[0] for row in rows]
+
+    if len(published) < MIN_HISTORY:
+        # An established feed that published nothing recently is polled at the ceiling;
+        # new feeds and feeds with too little history use the default
+        if not published and feed.created_at and feed.created_at < since:
+            return MAX_INTERVAL
+        return DEFAULT_INTERVAL
+
+    gaps = [(newer - older).total_seconds() for newer, older in zip(published, published[1:])]
+    median_gap = timedelta(seconds=statistics.median(gaps))
+    return max(MIN_INTERVAL, min(MAX_INTERVAL, median_gap / POLLS_PER_ITEM))
+
+
+def _interval_for(db: Session, feed: models.Feed, mode: str) -> timedelta:
+    if mode == "adaptive":
+        return learn_interval(db, feed)
+    return FIXED_INTERVALS.get(mode, DEFAULT_INTERVAL)
+
+
+def schedule_next(db: Session, feed: models.Feed, mode: str, now: datetime = None):
+    """
+    Sets feed.next_fetch_at (and the learned interval in adaptive mode).
+    Does not commit.
+    """
+    now = now or datetime.utcnow()
+    interval = _interval_for(db, feed, mode)
+    feed.poll_interval_minutes = int(interval.total_seconds() // 60)
+    feed.next_fetch_at = now + interval
+
+
+def reschedule_all(db: Session):
+    """
+    Re-plans every feed from its last fetch under the current schedule mode,
+    so a changed feed_schedule setting applies on the next dispatcher run.
+    """
+    mode = get_schedule_mode(db)
+    for feed in db.query(models.Feed).all():
+        schedule_next(db, feed, mode, now=feed.last_fetched_at or datetime.utcnow())
+    db.commit()
+
+
+def due_feeds(db: Session, now: datetime = None) -> List[models.Feed]:
+    now = now or datetime.utcnow()
+    return db.query(models.Feed).filter(
+        models.Feed.active == True,
+        or_(models.Feed.next_fetch_at.is_(None), models.Feed.next_fetch_at <= now),
+    ).order_by(models.Feed.next_fetch_at).all()
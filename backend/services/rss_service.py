@@ -1,121 +1,285 @@
-import feedparser
+import time
+from concurrent.futures import as_completed
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from backend import models, schemas
-from backend.services import ai_service, logger
+from backend import models, schemas, database
+from backend.services import logger, feed_fetcher, feed_parser, feed_health, classification_queue, poll_schedule, text_normalizer, article_bodies
 
-def fetch_feed_articles(feed_url: str):
-    # Some servers block requests without a User-Agent
-    return feedparser.parse(feed_url, agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+INSERT_CHUNK_ROWS = 50 # Keeps multi-row INSERTs under SQLite's bound-parameter limit
+URL_LOOKUP_CHUNK = 500
+KNOWN_URLS_FOR_EARLY_EXIT = 50 # Most recent article URLs of a feed the incremental parser stops at
 
-def update_single_feed(db: Session, feed: models.Feed):
+def recent_article_urls(db: Session, feed: models.Feed, limit: int = KNOWN_URLS_FOR_EARLY_EXIT) -> set:
+    rows = db.query(models.Article.url).filter(models.Article.feed_id == feed.id).order_by(models.Article.id.desc()).limit(limit).all()
+    return {row[0] for row in rows}
+
+def find_existing_urls(db: Session, urls) -> set:
+    """
+    Resolves which of the given URLs are already stored, using chunked IN
+    queries instead of one lookup per entry.
+    """
+    urls = list(urls)
+    existing = set()
+    for i in range(0, len(urls), URL_LOOKUP_CHUNK):
+        chunk = urls[i:i + URL_LOOKUP_CHUNK]
+        rows = db.query(models.Article.url).filter(models.Article.url.in_(chunk)).all()
+        existing.update(row[0] for row in rows)
+    return existing
+
+def _insert_ignoring_duplicates(db: Session, table, rows: list, conflict_column: str) -> int:
+    """
+    Bulk INSERT ... ON CONFLICT DO NOTHING. Rows that lose a race against a
+    concurrent fetcher are silently skipped. Returns the number of rows inserted.
+    """
+    insert = database.dialect_insert(db)
+    inserted = 0
+    for i in range(0, len(rows), INSERT_CHUNK_ROWS):
+        stmt = insert(table).values(rows[i:i + INSERT_CHUNK_ROWS]).on_conflict_do_nothing(index_elements=[conflict_column])
+        inserted += db.execute(stmt).rowcount
+    return inserted
+
+def store_entries(db: Session, feed: models.Feed, records: list, cutoff: datetime) -> dict:
+    """
+    Filters parsed entries down to new, current-week articles and bulk
+    inserts them with a pending classification job each. Categorization
+    happens later in the classification queue workers, so ingestion is never
+    gated on Gemini. Does not commit; the caller commits once per feed.
+
+    Returns counts of new, existing and old entries.
+    """
+    stats = {"new": 0, "existing": 0, "old": 0}
+
+    candidates = {}
+    for record in records:
+        if not record["url"]:
+            continue
+        # Filter for current week
+        if record["published_at"] and record["published_at"] < cutoff:
+            stats["old"] += 1
+            continue
+        candidates.setdefault(record["url"], record)
+
+    existing = find_existing_urls(db, candidates.keys())
+    stats["existing"] = len(existing)
+
+    now = datetime.utcnow()
+    rows = []
+    for url, record in candidates.items():
+        if url in existing:
+            continue
+        if "excerpt" not in record:
+            record = {**record, **text_normalizer.normalize(record["summary"], record["content"])}
+
+        rows.append({
+            "feed_id": feed.id,
+            "title": record["title"],
+            "url": url,
+            "summary": record["summary"],
+            "content": record["content"],
+            "plain_text": record["plain_text"],
+            "excerpt": record["excerpt"],
+            "word_count": record["word_count"],
+            "image_url": record["image_url"],
+            "published_at": record["published_at"],
+            # Use feed's category as industry, the classifier fills it in if not set
+            "industry": feed.category or None,
+            "is_featured": False,
+            "signal_strength": models.SignalStrength.PENDING.value,
+            "classification_status": models.ClassificationStatus.PENDING.value,
+            "created_at": now,
+        })
+
+    if rows:
+        bodies = article_bodies.split(rows)
+        stats["new"] = _insert_ignoring_duplicates(db, models.Article.__table__, rows, "url")
+        article_bodies.store(db, bodies)
+        classification_queue.enqueue_pending(db, feed_id=feed.id)
+    return stats
+
+def _mark_unchanged(db: Session, feed: models.Feed):
+    feed.last_fetched_at = datetime.utcnow()
+    feed_health.record_success(feed)
+    db.commit()
+    logger.log_event(db, "DEBUG", "FEED", f"Feed unchanged since last poll: {feed.name}", {"feed_id": feed.id})
+    return {"new_articles": 0, "unchanged": True}
+
+def update_single_feed(db: Session, feed: models.Feed, fetch_result: feed_fetcher.FetchResult = None):
+    """
+    Fetches (unless a FetchResult is given) and ingests one feed.
+    Returns the number of new articles.
+    """
+    return ingest_feed(db, feed, fetch_result)["new_articles"]
+
+def _start_of_week() -> datetime:
     # Calculate start of current week (Monday)
     today = datetime.utcnow()
     start_of_week = today - timedelta(days=today.weekday())
-    start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
-    
+    return start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def _fail(db: Session, feed: models.Feed, e: Exception, fetch_result: feed_fetcher.FetchResult = None) -> dict:
+    """
+    Rolls back the feed's work and counts the failure. Only a failed
+    download of fetch_result that points at the server counts against the
+    feed's host; parse and persist errors stay with the feed.
+    """
+    db.rollback()
+    feed_health.record_failure(feed, str(e), host_failure=fetch_result is not None and fetch_result.host_failure)
+    db.commit()
+    logger.log_event(db, "ERROR", "FEED", f"Error fetching feed {feed.name}: {str(e)}", {"feed_id": feed.id, "error_details": str(e), "consecutive_failures": feed.consecutive_failures})
+    return {"new_articles": 0, "unchanged": False}
+
+def _precheck(db: Session, feed: models.Feed, fetch_result: feed_fetcher.FetchResult):
+    """
+    Settles feeds that need no parsing: 304 answers and bodies whose hash
+    matches the last poll. Returns their stats, or None if the body must be
+    parsed. Raises for failed downloads.
+    """
+    if fetch_result.not_modified:
+        return _mark_unchanged(db, feed)
+    if not fetch_result.ok:
+        raise Exception(fetch_result.error)
+    # Fallback for servers without validators: compare the body hash
+    if feed.content_hash == fetch_result.content_hash:
+        return _mark_unchanged(db, feed)
+    return None
+
+def _submit_parse(db: Session, feed: models.Feed, fetch_result: feed_fetcher.FetchResult, cutoff: datetime):
+    return feed_parser.submit_parse(
+        fetch_result.body,
+        base_url=feed.url,
+        content_type=fetch_result.headers.get("Content-Type", ""),
+        cutoff=cutoff,
+        known_urls=recent_article_urls(db, feed),
+    )
+
+def _persist(db: Session, feed: models.Feed, fetch_result: feed_fetcher.FetchResult, parsed: dict, cutoff: datetime) -> dict:
+    if parsed["bozo"]:
+        logger.log_event(db, "WARNING", "FEED", f"Potential issue parsing feed: {feed.name}", {"error": parsed["bozo"]})
+        # Continue if we have entries despite the error (common with encoding issues)
+        if not parsed["records"]:
+            return {"new_articles": 0, "unchanged": False}
+
+    stats = store_entries(db, feed, parsed["records"], cutoff)
+    stats.update(parse_mode=parsed["mode"], entries_seen=parsed["entries_seen"], early_exit=parsed["early_exit"], parse_seconds=parsed["seconds"])
+
+    feed.last_fetched_at = datetime.utcnow()
+    feed.etag = fetch_result.etag
+    feed.last_modified = fetch_result.last_modified
+    feed.content_hash = fetch_result.content_hash
+    feed_health.record_success(feed)
+    # Single commit per feed: new articles and feed metadata together
+    db.commit()
+
+    logger.log_event(db, "INFO", "FEED", f"Fetched {stats['new']} new articles from {feed.name}", {"feed_id": feed.id, **stats})
+    return {"new_articles": stats["new"], "unchanged": False}
+
+def ingest_feed(db: Session, feed: models.Feed, fetch_result: feed_fetcher.FetchResult = None):
+    """
+    Ingests one feed and returns {"new_articles": int, "unchanged": bool}.
+
+    Feeds that answer 304 to the conditional GET, or whose body hashes to the
+    same value as last time, are marked unchanged without parsing or any
+    per-entry queries. Parsing runs on the parser process pool, so request
+    handlers only wait on it instead of spending their own CPU.
+    """
+    cutoff = _start_of_week()
     logger.log_event(db, "INFO", "FEED", f"Fetching feed: {feed.name}", {"url": feed.url})
     
     try:
-        parsed_feed = fetch_feed_articles(feed.url)
-        
-        if parsed_feed.bozo:
-            logger.log_event(db, "WARNING", "FEED", f"Potential issue parsing feed: {feed.name}", {"error": str(parsed_feed.bozo_exception)})
-            # Continue if we have entries despite the error (common with encoding issues)
-            if not parsed_feed.entries:
-                return 0
-
-        new_articles_count = 0
-        
-        # print(f"Fetching {feed.url}...") # Replaced by logger
-        # print(f"Filter date: {start_of_week}") # Replaced by logger
-
-        for entry in parsed_feed.entries:
-            # Check if article exists
-            existing = db.query(models.Article).filter(models.Article.url == entry.link).first()
-            if existing:
-                # print(f"Skipping existing: {entry.title}") # Replaced by logger
-                logger.log_event(db, "DEBUG", "FEED", f"Skipping existing article: {entry.title}", {"feed_id": feed.id, "url": entry.link})
-                continue
-                
-            # Parse date
-            published_at = None
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                published_at = datetime(*entry.published_parsed[:6])
-            elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                published_at = datetime(*entry.updated_parsed[:6])
-                
-            # print(f"Entry: {entry.title}, Date: {published_at}") # Replaced by logger
-
-            # Filter for current week
-            if published_at and published_at < start_of_week:
-                # print(f"Skipping old article: {published_at}") # Replaced by logger
-                logger.log_event(db, "DEBUG", "FEED", f"Skipping old article: {entry.title}", {"feed_id": feed.id, "published_at": published_at})
-                continue
-
-            # Content extraction
-            content = ''
-            if 'content' in entry:
-                content = entry.content[0].value
-            elif 'summary' in entry:
-                content = entry.summary
-            else:
-                content = entry.get('description', '')
-
-            # Image extraction
-            image_url = None
-            if 'media_content' in entry:
-                media = entry.media_content
-                if media and len(media) > 0:
-                    image_url = media[0].get('url')
-            elif 'media_thumbnail' in entry:
-                media = entry.media_thumbnail
-                if media and len(media) > 0:
-                    image_url = media[0].get('url')
-            elif 'links' in entry:
-                for link in entry.links:
-                    if link.get('type', '').startswith('image/'):
-                        image_url = link.get('href')
-                        break
-
-            # AI Categorization for STEEPV
-            steepv, ai_industry, reason = categorize_article(entry.title, entry.get('summary', ''), db)
-            
-            # Use feed's category as industry, fallback to AI if not set
-            industry = feed.category if feed.category else ai_industry
-                
-            article = models.Article(
-                feed_id=feed.id,
-                title=entry.title,
-                url=entry.link,
-                summary=entry.get('summary', ''),
-                content=content,
-                image_url=image_url,
-                published_at=published_at,
-                steepv_category=steepv,
-                industry=industry,
-                ai_reasoning=reason,
-                is_featured=False
-            )
-            db.add(article)
-            new_articles_count += 1
-            logger.log_event(db, "INFO", "FEED", f"New article found: {article.title}", {"feed_id": feed.id})
-            
-        feed.last_fetched_at = datetime.utcnow()
-        db.commit()
-        
-        if new_articles_count > 0:
-            logger.log_event(db, "INFO", "FEED", f"Fetched {new_articles_count} new articles from {feed.name}")
-            
-        return new_articles_count
+        if fetch_result is None:
+            fetch_result = feed_fetcher.fetch_feed(feed.id, feed.url, etag=feed.etag, last_modified=feed.last_modified)
+
+        stats = _precheck(db, feed, fetch_result)
+        if stats is not None:
+            return stats
+        parsed = _submit_parse(db, feed, fetch_result, cutoff).result()
+        return _persist(db, feed, fetch_result, parsed, cutoff)
     except Exception as e:
-        logger.log_event(db, "ERROR", "FEED", f"Error fetching feed {feed.name}: {str(e)}", {"feed_id": feed.id, "error_details": str(e)})
-        # print(f"Error fetching feed {feed.name}: {e}") # Replaced by logger
-        return 0
-
-def update_feeds(db: Session):
-    feeds = db.query(models.Feed).filter(models.Feed.active == True).all()
-    total_new = 0
-    for feed in feeds:
-        total_new += update_single_feed(db, feed)
-    return total_new
+        return _fail(db, feed, e, fetch_result)
+
+def update_feeds(db: Session, feeds: list = None):
+    """
+    Refreshes the given feeds (every active feed by default) as a pipeline:
+    downloads run concurrently (see feed_fetcher), each body is handed to the
+    parser process pool as soon as it arrives, and parsed records are
+    persisted on this session as they come back. Each feed's next poll is
+    scheduled according to the current schedule mode. Feeds behind an open
+    circuit breaker (see feed_health) are skipped until their cool-down ends.
+
+    Returns a run report with the total of new articles, the number of
+    unchanged and skipped feeds, downloaded bytes and per-feed timings.
+    """
+    if feeds is None:
+        feeds = db.query(models.Feed).filter(models.Feed.active == True).all()
+    schedule_mode = poll_schedule.get_schedule_mode(db)
+    cutoff = _start_of_week()
+    feeds_by_id = {feed.id: feed for feed in feeds}
+    report = {"total_new_articles": 0, "unchanged_feeds": 0, "skipped_feeds": 0, "bytes_downloaded": 0, "feeds": []}
+
+    feeds, skipped = feed_health.partition(feeds)
+    for feed in skipped:
+        resume_at = feed_health.skipped_until(feed)
+        if resume_at:
+            # The half-open probe happens on the first dispatcher run after the cool-down
+            feed.next_fetch_at = resume_at
+        else:
+            poll_schedule.schedule_next(db, feed, schedule_mode)
+        report["skipped_feeds"] += 1
+        report["feeds"].append({"feed_id": feed.id, "name": feed.name, "skipped": True, "resume_at": resume_at, "last_error": feed.last_error})
+    # Before fetching, so a failed feed's rollback cannot undo the cool-downs
+    db.commit()
+
+    def finish(feed, result, stats, started):
+        poll_schedule.schedule_next(db, feed, schedule_mode)
+        # Commit now: a later feed's failure rolls the session back
+        db.commit()
+        report["total_new_articles"] += stats["new_articles"]
+        report["unchanged_feeds"] += int(stats["unchanged"])
+        report["bytes_downloaded"] += len(result.body or b"")
+        report["feeds"].append({
+            "feed_id": feed.id,
+            "name": feed.name,
+            "status": result.status,
+            "error": result.error,
+            "unchanged": stats["unchanged"],
+            "new_articles": stats["new_articles"],
+            "fetch_seconds": round(result.elapsed, 3),
+            "process_seconds": round(time.perf_counter() - started, 3),
+        })
+
+    parsing = {} # parse Future -> (feed, fetch result, processing start)
+
+    def store(future):
+        feed, result, started = parsing.pop(future)
+        try:
+            stats = _persist(db, feed, result, future.result(), cutoff)
+        except Exception as e:
+            stats = _fail(db, feed, e)
+        finish(feed, result, stats, started)
+
+    run_start = time.perf_counter()
+    fetch_requests = [(feed.id, feed.url, feed.etag, feed.last_modified) for feed in feeds]
+    for result in feed_fetcher.fetch_feeds(fetch_requests):
+        feed = feeds_by_id[result.feed_id]
+        started = time.perf_counter()
+        try:
+            stats = _precheck(db, feed, result)
+            if stats is None:
+                parsing[_submit_parse(db, feed, result, cutoff)] = (feed, result, started)
+        except Exception as e:
+            stats = _fail(db, feed, e, result)
+        if stats is not None:
+            finish(feed, result, stats, started)
+
+        # Persist whatever finished parsing while downloads are still running
+        for future in [f for f in parsing if f.done()]:
+            store(future)
+
+    for future in as_completed(list(parsing)):
+        store(future)
+
+    report["elapsed_seconds"] = round(time.perf_counter() - run_start, 3)
+    db.commit()
+
+    logger.log_event(db, "INFO", "FEED", f"Feed refresh complete: {report['total_new_articles']} new articles from {len(feeds)} feeds ({report['unchanged_feeds']} unchanged, {report['skipped_feeds']} skipped) in {report['elapsed_seconds']}s", {"feeds": report["feeds"]})
+    return report
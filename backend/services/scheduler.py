@@ -2,7 +2,8 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from sqlalchemy.orm import Session
 from backend import database, models
 from backend.services.rss_service import update_feeds
-from backend.services import ai_service
+from backend.services import ai_service, classification_queue, llm_rate_limiter, log_retention, poll_schedule
+from backend.services.logger import log_event
 import logging
 from datetime import datetime, timedelta
 
@@ -10,28 +11,35 @@ logger = logging.getLogger(__name__)
 
 scheduler = BackgroundScheduler()
 
-def get_schedule_interval(db: Session):
-    setting = db.query(models.Setting).filter(models.Setting.key == "feed_schedule").first()
-    value = setting.value if setting else "hourly"
-    
-    if value == "daily":
-        return {"trigger": "interval", "days": 1}
-    elif value == "weekly":
-        return {"trigger": "interval", "weeks": 1}
-    else: # hourly or default
-        return {"trigger": "interval", "hours": 1}
-
-def run_update_feeds():
+def run_feed_dispatcher():
+    """
+    Refreshes the feeds whose next_fetch_at has passed. Runs every minute and
+    reads the schedule mode on each run, so a schedule change applies
+    without a restart.
+    """
     db = database.SessionLocal()
     try:
-        logger.info("Running scheduled feed update...")
-        count = update_feeds(db)
-        logger.info(f"Scheduled update complete. New articles: {count}")
+        due = poll_schedule.due_feeds(db)
+        if not due:
+            return
+        logger.info(f"Running scheduled feed update for {len(due)} due feeds...")
+        report = update_feeds(db, feeds=due)
+        logger.info(f"Scheduled update complete. New articles: {report['total_new_articles']}, unchanged feeds: {report['unchanged_feeds']} ({report['elapsed_seconds']}s)")
+        for feed_report in report["feeds"]:
+            logger.info(f"  {feed_report['name']}: fetch {feed_report['fetch_seconds']}s, process {feed_report['process_seconds']}s, new {feed_report['new_articles']}")
     except Exception as e:
         logger.error(f"Error in scheduled feed update: {e}")
     finally:
         db.close()
 
+def run_classification_queue():
+    try:
+        run = classification_queue.run_workers()
+        if run.get("handled"):
+            logger.info(f"Classification queue run complete: {run}")
+    except Exception as e:
+        logger.error(f"Error in classification queue run: {e}")
+
 def run_weekly_reports():
     """
     Generates weekly reports for each active category and industry.
@@ -59,6 +67,8 @@ def run_weekly_reports():
         
         report_days = 7
         report_cutoff = datetime.utcnow() - timedelta(days=report_days)
+        # Map-phase cache reuse across this run's reports
+        run_stats = {"reports": 0, "map_batches": 0, "map_cache_hits": 0, "llm_calls": 0}
         
         # Generate Category Reports
         for category in categories:
@@ -70,7 +80,7 @@ def run_weekly_reports():
             
             if len(articles) >= 5: # Minimum articles to justify a report
                 logger.info(f"Generating report for category: {category}")
-                summary_text = ai_service.generate_trend_summary(articles, db, category=category)
+                summary_text = ai_service.generate_trend_summary(articles, db, category=category, priority=llm_rate_limiter.SCHEDULED, stats=run_stats)
                 
                 summary = models.TrendSummary(
                     title=f"Weekly {category} Trends - {datetime.utcnow().strftime('%Y-%m-%d')}",
@@ -81,6 +91,7 @@ def run_weekly_reports():
                 )
                 db.add(summary)
                 db.commit()
+                run_stats["reports"] += 1
         
         # Generate Industry Reports
         for industry in industries:
@@ -92,7 +103,7 @@ def run_weekly_reports():
             
             if len(articles) >= 5:
                 logger.info(f"Generating report for industry: {industry}")
-                summary_text = ai_service.generate_trend_summary(articles, db, industry=industry)
+                summary_text = ai_service.generate_trend_summary(articles, db, industry=industry, priority=llm_rate_limiter.SCHEDULED, stats=run_stats)
                 
                 summary = models.TrendSummary(
                     title=f"Weekly {industry} Outlook - {datetime.utcnow().strftime('%Y-%m-%d')}",
@@ -103,7 +114,10 @@ def run_weekly_reports():
                 )
                 db.add(summary)
                 db.commit()
+                run_stats["reports"] += 1
                 
+        run_stats["map_cache_hit_rate"] = round(run_stats["map_cache_hits"] / run_stats["map_batches"], 3) if run_stats["map_batches"] else None
+        log_event(db, "INFO", "AI", f"Weekly reports: {run_stats['reports']} generated, map cache hit rate {run_stats['map_cache_hit_rate']}", run_stats)
         logger.info("Weekly report generation complete.")
         
     except Exception as e:
@@ -111,21 +125,44 @@ def run_weekly_reports():
     finally:
         db.close()
 
+def run_log_retention():
+    """Moves expired system_logs days to the archive (see services/log_retention.py)."""
+    try:
+        report = log_retention.run()
+        logger.info(f"Log retention complete: {report}")
+        if report["archived"] or report["partitions_dropped"]:
+            log_event(None, "INFO", "SYSTEM", f"Archived {sum(report['archived'].values())} log events in {report['files']} files", report)
+    except Exception as e:
+        logger.error(f"Error in log retention run: {e}")
+
 def start_scheduler():
     # Create a new session to fetch settings
     db = database.SessionLocal()
     try:
-        trigger_args = get_schedule_interval(db)
-        logger.info(f"Starting scheduler with config: {trigger_args}")
+        logger.info(f"Starting scheduler with feed schedule mode: {poll_schedule.get_schedule_mode(db)}")
     finally:
         db.close()
 
-    # Feed Update Job
+    # Feed Dispatcher Job: polls each feed when its own next_fetch_at is due
     scheduler.add_job(
-        func=run_update_feeds, 
-        id="update_feeds_job",
+        func=run_feed_dispatcher,
+        id="feed_dispatcher_job",
         replace_existing=True,
-        **trigger_args
+        trigger="interval",
+        minutes=1,
+        max_instances=1,
+        coalesce=True
+    )
+    
+    # Classification Queue Job: drains pending AI categorization at its own pace
+    scheduler.add_job(
+        func=run_classification_queue,
+        id="classification_queue_job",
+        replace_existing=True,
+        trigger="interval",
+        minutes=1,
+        max_instances=1,
+        coalesce=True
     )
     
     # Weekly Report Job (Every Monday at 9 AM)
@@ -139,6 +176,16 @@ def start_scheduler():
         minute=0
     )
     
+    # Log Retention Job (daily, off-peak)
+    scheduler.add_job(
+        func=run_log_retention,
+        id="log_retention_job",
+        replace_existing=True,
+        trigger="cron",
+        hour=3,
+        minute=30
+    )
+    
     scheduler.start()
 
 def shutdown_scheduler():
@@ -0,0 +1,170 @@
+"""
+Full-text search over articles and system logs.
+
+The indexes come from migration m0003: FTS5 tables on SQLite, GIN-indexed
+tsvectors on PostgreSQL. Queries are reduced to their word
+terms, all of which must match, so user input never reaches the FTS query
+syntax. Article results are ranked (bm25 / ts_rank_cd, title weighted above
+excerpt above body) and carry a snippet; log search matches term prefixes,
+which keeps the old substring search's feel for partial words. Without an
+index (SQLite built without FTS5, other databases) both fall back to LIKE.
+
+Ranking has to score every match, which for a term in most of the corpus is
+most of the table, so only the newest SEARCH_MAX_CANDIDATES matches are
+ranked. On SQLite, log searches for terms with more than LOG_SCAN_THRESHOLD
+matches walk the newest-first index and test each row against the matches
+instead of fetching and sorting all of them.
+"""
+import html
+import os
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend import models
+
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "5000"))
+LOG_SCAN_THRESHOLD = int(os.getenv("SEARCH_LOG_SCAN_THRESHOLD", "5000"))
+MAX_TERMS = 16
+SNIPPET_TOKENS = 24
+# Match delimiters that cannot occur in the stored text; swapped for <mark> after escaping
+_START, _END = "\x02", "\x03"
+_TERM = re.compile(r"\w+")
+
+# Must stay identical to the index expression in migrations/m0003_full_text_search.py
+LOG_TSVECTOR = "to_tsvector('simple', coalesce(system_logs.message, ''))"
+
+_index_cache = {}
+
+
+def terms(query: str) -> List[str]:
+    return _TERM.findall(query.lower())[:MAX_TERMS]
+
+
+def has_index(db: Session, table: str) -> bool:
+    """Whether `table` has the full-text index m0003 creates (cached per database)."""
+    bind = db.get_bind()
+    key = (str(bind.url), table)
+    if key not in _index_cache:
+        if bind.dialect.name == "postgresql":
+            _index_cache[key] = True
+        elif bind.dialect.name == "sqlite":
+            _index_cache[key] = db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": f"{table}_fts"}
+            ).first() is not None
+        else:
+            _index_cache[key] = False
+    return _index_cache[key]
+
+
+def _fts5_query(words: List[str], prefix: bool) -> str:
+    return " ".join(f'"{word}"' + ("*" if prefix else "") for word in words)
+
+
+def _highlight(snippet: Optional[str]) -> Optional[str]:
+    """Escapes the snippet for HTML and marks the matched terms with <mark>."""
+    if not snippet:
+        return None
+    return html.escape(snippet).replace(_START, "<mark>").replace(_END, "</mark>")
+
+
+def search_articles(
+    db: Session, query: str, limit: int = 20, offset: int = 0,
+    category: Optional[str] = None, industry: Optional[str] = None,
+) -> List[Tuple[models.Article, float, Optional[str]]]:
+    """
+    Articles matching every term of `query`, best first, as (article, score,
+    snippet) with higher scores better. The snippet is HTML-escaped text with
+    the matched terms in <mark> tags.
+    """
+    words = terms(query)
+    if not words:
+        return []
+    filters, params = [], {"limit": limit, "offset": offset}
+    if category:
+        filters.append("articles.steepv_category = :category")
+        params["category"] = category
+    if industry:
+        filters.append("articles.industry = :industry")
+        params["industry"] = industry
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite" and has_index(db, "articles"):
+        params.update(match=_fts5_query(words, prefix=False), start=_START, end=_END, tokens=SNIPPET_TOKENS, cap=SEARCH_MAX_CANDIDATES)
+        join = "JOIN articles ON articles.id = articles_fts.rowid" if filters else ""
+        where = "articles_fts MATCH :match" + "".join(" AND " + f for f in filters)
+        # Lowest id among the newest SEARCH_MAX_CANDIDATES matches; walking the id-ordered match list is cheap, scoring is not
+        floor = db.execute(text(
+            f"SELECT articles_fts.rowid FROM articles_fts {join} WHERE {where} ORDER BY articles_fts.rowid DESC LIMIT 1 OFFSET :cap"
+        ), params).scalar()
+        if floor is not None:
+            where += " AND articles_fts.rowid > :floor"
+            params["floor"] = floor
+        rows = db.execute(text(f"""
+            SELECT articles_fts.rowid AS id, -bm25(articles_fts, 10.0, 3.0, 1.0) AS score,
+                   snippet(articles_fts, -1, :start, :end, '…', :tokens) AS snippet
+            FROM articles_fts {join}
+            WHERE {where}
+            ORDER BY score DESC, articles_fts.rowid DESC
+            LIMIT :limit OFFSET :offset
+        """), params).fetchall()
+    elif dialect == "postgresql":
+        params.update(match=" ".join(words), cap=SEARCH_MAX_CANDIDATES, options=f'StartSel="{_START}", StopSel="{_END}", MaxWords=35, MinWords=15')
+        # Headlines are costly, so only the page's rows get one
+        rows = db.execute(text(f"""
+            SELECT page.id, page.score,
+                   ts_headline('english', coalesce(articles.plain_text, articles.excerpt, ''), plainto_tsquery('english', :match), :options) AS snippet
+            FROM (
+                SELECT candidates.id, ts_rank_cd(candidates.search_vector, plainto_tsquery('english', :match)) AS score
+                FROM (
+                    SELECT articles.id, articles.search_vector
+                    FROM articles
+                    WHERE articles.search_vector @@ plainto_tsquery('english', :match) {"".join(" AND " + f for f in filters)}
+                    ORDER BY articles.id DESC
+                    LIMIT :cap
+                ) AS candidates
+                ORDER BY score DESC, candidates.id DESC
+                LIMIT :limit OFFSET :offset
+            ) AS page JOIN articles ON articles.id = page.id
+            ORDER BY page.score DESC, page.id DESC
+        """), params).fetchall()
+    else:
+        like = db.query(models.Article)
+        for word in words:
+            like = like.filter(models.Article.title.ilike(f"%{word}%") | models.Article.plain_text.ilike(f"%{word}%"))
+        if category:
+            like = like.filter(models.Article.steepv_category == category)
+        if industry:
+            like = like.filter(models.Article.industry == industry)
+        articles = like.order_by(models.Article.published_at.desc(), models.Article.id.desc()).offset(offset).limit(limit).all()
+        return [(article, 0.0, article.excerpt and html.escape(article.excerpt)) for article in articles]
+
+    by_id = {a.id: a for a in db.query(models.Article).filter(models.Article.id.in_([row.id for row in rows]))}
+    return [(by_id[row.id], float(row.score), _highlight(row.snippet)) for row in rows if row.id in by_id]
+
+
+def log_filter(db: Session, query: str):
+    """
+    Filter clause for system logs whose message contains every term of
+    `query` as a word prefix. Composes with the level/event_type filters and
+    the logs endpoint's paging.
+    """
+    words = terms(query)
+    dialect = db.get_bind().dialect.name
+    if words and dialect == "sqlite" and has_index(db, "system_logs"):
+        match = _fts5_query(words, prefix=True)
+        matches = db.execute(text(
+            "SELECT count(*) FROM (SELECT rowid FROM system_logs_fts WHERE system_logs_fts MATCH :match LIMIT :cap)"
+        ), {"match": match, "cap": LOG_SCAN_THRESHOLD}).scalar()
+        # Unary + keeps SQLite from looking the matches up by id, so it scans in ORDER BY order instead
+        column = "+system_logs.id" if matches >= LOG_SCAN_THRESHOLD else "system_logs.id"
+        return text(
+            f"{column} IN (SELECT rowid FROM system_logs_fts WHERE system_logs_fts MATCH :log_match)"
+        ).bindparams(log_match=match)
+    if words and dialect == "postgresql":
+        return text(f"{LOG_TSVECTOR} @@ to_tsquery('simple', :log_match)").bindparams(
+            log_match=" & ".join(f"{word}:*" for word in words)
+        )
+    return models.SystemLog.message.contains(query)
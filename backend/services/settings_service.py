@@ -0,0 +1,135 @@
+"""
+In-memory snapshot of the settings table.
+
+Readers get a typed, immutable SettingsSnapshot without touching the
+database. Writes go through set_value(), which updates the row, bumps the
+settings_version counter and replaces the local snapshot in the same step.
+Other processes (scheduler workers, a second API worker) notice the change
+by reading that single counter row, at most every SETTINGS_RECHECK_SECONDS,
+and reload the table only when it moved.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from sqlalchemy import Integer, String, cast
+from sqlalchemy.orm import Session
+
+from backend import models
+
+RECHECK_SECONDS = float(os.getenv("SETTINGS_RECHECK_SECONDS", "5"))
+VERSION_KEY = "settings_version"
+
+DEFAULT_GEMINI_MODEL = "gemini-2.0-flash-exp"
+DEFAULT_FEED_SCHEDULE = "hourly"
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    version: int = 0
+    gemini_api_key: Optional[str] = None
+    gemini_model: str = DEFAULT_GEMINI_MODEL
+    steepv_prompt: Optional[str] = None
+    steepv_batch_prompt: Optional[str] = None
+    trend_prompt: Optional[str] = None
+    feed_schedule: str = DEFAULT_FEED_SCHEDULE
+    values: Dict[str, str] = field(default_factory=dict)
+
+    def get(self, key: str, default: str = None) -> Optional[str]:
+        return self.values.get(key, default)
+
+    @classmethod
+    def from_values(cls, values: Dict[str, str]) -> "SettingsSnapshot":
+        return cls(
+            version=int(values.get(VERSION_KEY) or 0),
+            gemini_api_key=values.get("gemini_api_key") or None,
+            gemini_model=values.get("gemini_model") or DEFAULT_GEMINI_MODEL,
+            steepv_prompt=values.get("steepv_prompt") or None,
+            steepv_batch_prompt=values.get("steepv_batch_prompt") or None,
+            trend_prompt=values.get("trend_prompt") or None,
+            feed_schedule=values.get("feed_schedule") or DEFAULT_FEED_SCHEDULE,
+            values=dict(values),
+        )
+
+
+_snapshot: Optional[SettingsSnapshot] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+_counters = {"reads": 0, "version_checks": 0, "reloads": 0}
+
+
+def _read_version(db: Session) -> int:
+    value = db.query(models.Setting.value).filter(models.Setting.key == VERSION_KEY).scalar()
+    return int(value or 0)
+
+
+def _load(db: Session) -> SettingsSnapshot:
+    _counters["reloads"] += 1
+    return SettingsSnapshot.from_values(dict(db.query(models.Setting.key, models.Setting.value).all()))
+
+
+def current(db: Session) -> SettingsSnapshot:
+    """
+    Returns the settings snapshot. Costs no query at all inside the recheck
+    window, one cheap version read after it and a full load only when
+    another process changed a setting.
+    """
+    global _snapshot, _checked_at
+    with _lock:
+        _counters["reads"] += 1
+        now = time.monotonic()
+        if _snapshot is None:
+            _snapshot = _load(db)
+            _checked_at = now
+        elif now - _checked_at >= RECHECK_SECONDS:
+            _counters["version_checks"] += 1
+            if _read_version(db) != _snapshot.version:
+                _snapshot = _load(db)
+            _checked_at = now
+        return _snapshot
+
+
+def get(db: Session, key: str, default: str = None) -> Optional[str]:
+    return current(db).get(key, default)
+
+
+def set_value(db: Session, key: str, value: str) -> models.Setting:
+    """
+    Writes a setting, bumps the version counter and refreshes the local
+    snapshot (write-through). Commits.
+    """
+    global _snapshot, _checked_at
+    setting = db.query(models.Setting).filter(models.Setting.key == key).first()
+    if setting:
+        setting.value = value
+    else:
+        setting = models.Setting(key=key, value=value)
+        db.add(setting)
+
+    bumped = db.query(models.Setting).filter(models.Setting.key == VERSION_KEY).update(
+        {models.Setting.value: cast(cast(models.Setting.value, Integer) + 1, String)},
+        synchronize_session=False,
+    )
+    if not bumped:
+        db.add(models.Setting(key=VERSION_KEY, value="1"))
+    db.commit()
+    db.refresh(setting)
+
+    with _lock:
+        _snapshot = _load(db)
+        _checked_at = time.monotonic()
+    return setting
+
+
+def invalidate():
+    """Forces a full reload on the next read, e.g. after editing the table by hand."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
+
+def stats() -> dict:
+    with _lock:
+        return {**_counters, "version": _snapshot.version if _snapshot else None}
@@ -0,0 +1,89 @@
+"""
+Cache of map-phase batch summaries for trend reports.
+
+A batch summary is keyed by the sorted ids and content hashes of its
+articles, the map prompt version and the model. The weekly per-category
+and per-industry reports, a manual report over the same week and any rerun
+then share batch summaries, and only pay for the reduce and final
+synthesis calls.
+
+Batches are formed per STEEPV category and industry (see
+ai_service.map_batches), so a category report and an industry report are
+both made of the same batches as a report over everything.
+
+Entries older than TREND_CACHE_MAX_AGE_DAYS are purged when new ones are
+written. None of these functions commit.
+"""
+import hashlib
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend import database, models
+from backend.services import common
+
+MAX_AGE = timedelta(days=int(os.getenv("TREND_CACHE_MAX_AGE_DAYS", "30")))
+
+Entry = models.TrendBatchSummary
+
+_counters = common.Counters("hits", "misses", "writes", "expired")
+
+
+def counters() -> dict:
+    return _counters.snapshot()
+
+
+def batch_key(version: str, article_lines: Dict[int, str]) -> str:
+    """article_lines: {article id: the text the map prompt contains for it}."""
+    parts = [
+        f"{article_id}:{hashlib.sha1(line.encode('utf-8')).hexdigest()}"
+        for article_id, line in sorted(article_lines.items())
+    ]
+    return hashlib.sha256(f"{version}\n{';'.join(parts)}".encode("utf-8")).hexdigest()
+
+
+def get_many(db: Session, keys: List[str]) -> Dict[str, str]:
+    if not keys:
+        return {}
+    found = dict(db.query(Entry.key, Entry.content).filter(Entry.key.in_(set(keys))).all())
+    if found:
+        db.query(Entry).filter(Entry.key.in_(list(found))).update({
+            Entry.hits: Entry.hits + 1,
+            Entry.last_used_at: datetime.utcnow(),
+        }, synchronize_session=False)
+    hits = sum(1 for key in keys if key in found)
+    _counters.bump("hits", hits)
+    _counters.bump("misses", len(keys) - hits)
+    return found
+
+
+def put_many(db: Session, version: str, summaries: Dict[str, str]):
+    if not summaries:
+        return
+    now = datetime.utcnow()
+    insert = database.dialect_insert(db)
+    db.execute(insert(Entry.__table__).values([
+        {"key": key, "prompt_version": version, "content": content, "hits": 0, "created_at": now, "last_used_at": now}
+        for key, content in summaries.items()
+    ]).on_conflict_do_nothing(index_elements=["key"]))
+    _counters.bump("writes", len(summaries))
+    expire(db)
+
+
+def expire(db: Session) -> int:
+    removed = db.query(Entry).filter(Entry.last_used_at < datetime.utcnow() - MAX_AGE).delete(synchronize_session=False)
+    _counters.bump("expired", removed)
+    return removed
+
+
+def cache_stats(db: Session) -> dict:
+    stats = counters()
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        "entries": db.query(func.count(Entry.key)).scalar(),
+        "hit_rate": round(stats["hits"] / lookups, 3) if lookups else None,
+        "counters": stats,
+    }
@@ -0,0 +1,78 @@
+"""
+Ingestion-time normalization of feed HTML.
+
+Feed summaries and bodies are raw HTML. We derive three compact fields once
+at ingest: sanitized plain text, a bounded-length excerpt and a word count.
+List endpoints and LLM prompt builders use these instead of the raw markup.
+"""
+import html
+import re
+from html.parser import HTMLParser
+from typing import Optional
+
+EXCERPT_MAX_CHARS = 300
+
+_SKIP_TAGS = {"script", "style", "noscript", "iframe", "svg", "head"}
+_BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "tr", "section", "article"}
+_WHITESPACE = re.compile(r"\s+")
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(value: Optional[str]) -> str:
+    """Strips markup, scripts and styles and collapses whitespace."""
+    if not value:
+        return ""
+    if "<" not in value:
+        return _WHITESPACE.sub(" ", html.unescape(value)).strip()
+    parser = _TextExtractor()
+    try:
+        parser.feed(value)
+        parser.close()
+    except Exception:
+        # Badly broken markup: fall back to a crude tag strip
+        return _WHITESPACE.sub(" ", html.unescape(re.sub(r"<[^>]*>", " ", value))).strip()
+    return _WHITESPACE.sub(" ", "".join(parser.parts)).strip()
+
+
+def make_excerpt(text: str, max_chars: int = EXCERPT_MAX_CHARS) -> str:
+    """Cuts plain text at a word boundary, adding an ellipsis when shortened."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0].rstrip(" ,;:.-")
+    return f"{cut}…"
+
+
+def normalize(summary: Optional[str], content: Optional[str]) -> dict:
+    """
+    Returns {"plain_text", "excerpt", "word_count"} for an article. The
+    excerpt prefers the summary; plain text and word count cover the body.
+    """
+    plain_text = html_to_text(content) or html_to_text(summary)
+    summary_text = html_to_text(summary) or plain_text
+    return {
+        "plain_text": plain_text,
+        "excerpt": make_excerpt(summary_text),
+        "word_count": len(plain_text.split()),
+    }
@@ -0,0 +1,172 @@
+"""
+Local stand-in for the Gemini API, for load tests and offline development.
+Select it with LLM_BACKEND=standin (and LLM_STANDIN_URL if not the default).
+
+Replies come from llm_backends.HeuristicModel, so classification and trend
+report prompts get answers ai_service can parse. On top of that each request
+can be slowed down and failed on purpose:
+
+  --latency / --jitter      seconds per call, plus --per-1k-tokens of prompt
+  --error-rate              share of calls answered with a 500
+  --throttle-rate           share of calls answered with a random 429
+  --rpm                     a real quota: calls beyond it within a minute get
+                            429 with a Retry-After header, like Gemini's free tier
+
+  POST /v1/generate  {"prompt", "stream"}  -> {"text", "usage"}, or NDJSON chunks when streaming
+  GET  /stats                              -> request counts by outcome
+
+Usage: python -m backend.standin_llm_server [--port 8090] [--latency 0.8] [--rpm 15] [--throttle-rate 0.05] [--error-rate 0.01]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.services.llm_backends import HeuristicModel, STREAM_CHUNK_CHARS
+
+
+class StandIn:
+    def __init__(self, latency=0.8, jitter=0.2, per_1k_tokens=0.05, error_rate=0.0, throttle_rate=0.0, rpm=0, retry_after=2.0, stream_delay=0.02, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.per_1k_tokens = per_1k_tokens
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rpm = rpm
+        self.retry_after = retry_after
+        self.stream_delay = stream_delay
+        self.random = random.Random(seed)
+        self.model = HeuristicModel()
+        self.window = deque()
+        self.stats = {"requests": 0, "ok": 0, "errors": 0, "throttled": 0, "quota_exceeded": 0}
+        self.lock = threading.Lock()
+
+    def _bump(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def admit(self):
+        """None to serve the request, or (status, retry-after seconds, message) to reject it."""
+        with self.lock:
+            self.stats["requests"] += 1
+            roll = self.random.random()
+            if self.rpm:
+                now = time.monotonic()
+                while self.window and now - self.window[0] >= 60:
+                    self.window.popleft()
+                if len(self.window) >= self.rpm:
+                    self.stats["quota_exceeded"] += 1
+                    return 429, max(0.1, 60 - (now - self.window[0])), "Quota exceeded for requests per minute"
+                self.window.append(now)
+        if roll < self.throttle_rate:
+            self._bump("throttled")
+            return 429, self.retry_after, "Resource has been exhausted (e.g. check quota)"
+        if roll < self.throttle_rate + self.error_rate:
+            self._bump("errors")
+            return 500, None, "Internal error"
+        return None
+
+    def delay(self, prompt: str) -> float:
+        return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)) + len(prompt) / 4000 * self.per_1k_tokens
+
+
+def make_handler(standin: StandIn):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _json(self, status: int, body: dict, headers: dict = None):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                with standin.lock:
+                    stats = dict(standin.stats)
+                self._json(200, stats)
+            else:
+                self._json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if self.path != "/v1/generate":
+                self._json(404, {"error": "Not found"})
+                return
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            prompt = request.get("prompt", "")
+
+            rejected = standin.admit()
+            if rejected:
+                status, retry_after, message = rejected
+                headers = {"Retry-After": f"{retry_after:.1f}"} if retry_after is not None else {}
+                self._json(status, {"error": {"code": status, "message": message}}, headers)
+                return
+
+            time.sleep(standin.delay(prompt))
+            text = standin.model.reply(prompt)
+            usage = {"prompt_token_count": len(prompt) // 4, "candidates_token_count": len(text) // 4}
+            usage["total_token_count"] = usage["prompt_token_count"] + usage["candidates_token_count"]
+            standin._bump("ok")
+            if not request.get("stream"):
+                self._json(200, {"text": text, "usage": usage})
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            lines = [{"text": text[i:i + STREAM_CHUNK_CHARS]} for i in range(0, len(text), STREAM_CHUNK_CHARS)] + [{"usage": usage}]
+            for line in lines:
+                data = (json.dumps(line) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+                time.sleep(standin.stream_delay)
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+def serve(standin: StandIn, host: str = "127.0.0.1", port: int = 8090) -> ThreadingHTTPServer:
+    """Starts the server on a daemon thread and returns it (port 0 picks a free one)."""
+    server = ThreadingHTTPServer((host, port), make_handler(standin))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="standin-llm", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.8)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--per-1k-tokens", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=0, help="Requests per minute before 429s (0 for no quota)")
+    parser.add_argument("--retry-after", type=float, default=2.0, help="Retry-After seconds on a random 429")
+    args = parser.parse_args()
+
+    server = serve(StandIn(
+        latency=args.latency, jitter=args.jitter, per_1k_tokens=args.per_1k_tokens,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate, rpm=args.rpm, retry_after=args.retry_after,
+    ), args.host, args.port)
+    print(f"Stand-in LLM listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Tests run against a throwaway SQLite file, never foresight.db: DATABASE_URL
+is set before anything imports backend.database. Feed parsing runs inline.
+"""
+import os
+import tempfile
+
+_fd, DB_PATH = tempfile.mkstemp(suffix=".db", prefix="foresight-test-")
+os.close(_fd)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("FEED_PARSE_WORKERS", "0")
+
+import threading  # noqa: E402
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # noqa: E402
+
+import pytest  # noqa: E402
+
+from backend import database, migrations  # noqa: E402
+from backend.services import logger  # noqa: E402
+
+migrations.upgrade(database.engine)
+
+
+@pytest.fixture
+def db():
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        logger.flush()
+        session.close()
+
+
+class FeedServer:
+    """
+    Serves a fixed feed on a local port with the given status. `headers`
+    are sent exactly as spelled; a request whose If-None-Match matches
+    `etag` gets a 304. Every request's headers are kept in `requests`.
+    """
+
+    def __init__(self, body: bytes, headers: dict, etag: str = None, status: int = 200):
+        self.body, self.headers, self.etag, self.status = body, headers, etag, status
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                if server.etag and self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(server.status)
+                for name, value in server.headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(server.body)))
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/feed.xml"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def feed_server():
+    servers = []
+
+    def start(body: bytes, headers: dict, etag: str = None, status: int = 200) -> FeedServer:
+        servers.append(FeedServer(body, headers, etag, status))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    logger.flush()
+    database.engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from backend import models
+from backend.services import classification_queue
+
+
+def add_article(db, feed, key: str, **fields) -> models.Article:
+    article = models.Article(
+        feed_id=feed.id, title=key, url=f"https://example.com/reclassify/{key}", is_featured=False,
+        created_at=datetime.utcnow(), classification_status=models.ClassificationStatus.DONE.value, **fields,
+    )
+    db.add(article)
+    return article
+
+
+def test_reclassify_skips_curated_articles_unless_forced(db):
+    feed = models.Feed(name="Reclassify", url="https://example.com/reclassify.xml")
+    db.add(feed)
+    db.commit()
+    plain = add_article(db, feed, "plain", signal_strength=models.SignalStrength.PENDING.value)
+    rated = add_article(db, feed, "rated", signal_strength=models.SignalStrength.STRONG.value)
+    noted = add_article(db, feed, "noted", signal_strength=models.SignalStrength.PENDING.value, admin_notes="keep")
+    db.commit()
+
+    assert classification_queue.reclassify(db, feed_id=feed.id) == 1
+    db.expire_all()
+    assert plain.classification_status == models.ClassificationStatus.PENDING.value
+    assert rated.classification_status == models.ClassificationStatus.DONE.value
+    assert noted.classification_status == models.ClassificationStatus.DONE.value
+    queued = {job.article_id for job in db.query(models.ClassificationJob).filter(models.ClassificationJob.status == models.JobStatus.PENDING.value)}
+    assert queued == {plain.id}
+
+    assert classification_queue.reclassify(db, feed_id=feed.id, force=True) == 3
+    db.expire_all()
+    assert {a.classification_status for a in (plain, rated, noted)} == {models.ClassificationStatus.PENDING.value}
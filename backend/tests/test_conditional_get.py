@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from backend import models
+from backend.services import rss_service
+
+ETAG = '"feed-v1"'
+LAST_MODIFIED = "Wed, 14 Oct 2026 10:00:00 GMT"
+
+
+def rss(url: str) -> bytes:
+    published = datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")
+    return (
+        "<?xml version='1.0'?><rss version='2.0'><channel><title>t</title>"
+        f"<item><title>First</title><link>{url}</link><description>Hello</description><pubDate>{published}</pubDate></item>"
+        "</channel></rss>"
+    ).encode()
+
+
+def test_lowercase_validators_give_a_304_on_the_next_poll(db, feed_server):
+    server = feed_server(rss("https://example.com/conditional-get"), {"etag": ETAG, "last-modified": LAST_MODIFIED, "content-type": "application/rss+xml"}, etag=ETAG)
+    feed = models.Feed(name="Conditional", url=server.url)
+    db.add(feed)
+    db.commit()
+
+    first = rss_service.ingest_feed(db, feed)
+    assert first == {"new_articles": 1, "unchanged": False}
+    assert (feed.etag, feed.last_modified) == (ETAG, LAST_MODIFIED)
+
+    second = rss_service.ingest_feed(db, feed)
+    assert second == {"new_articles": 0, "unchanged": True}
+    assert server.requests[1].get("If-None-Match") == ETAG
+    assert server.requests[1].get("If-Modified-Since") == LAST_MODIFIED
+    # The 304 keeps the validators for the poll after
+    assert (feed.etag, feed.last_modified) == (ETAG, LAST_MODIFIED)
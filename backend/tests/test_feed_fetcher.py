@@ -0,0 +1,15 @@
+from backend.services import feed_fetcher
+
+RSS = b"<?xml version='1.0'?><rss version='2.0'><channel><title>t</title></channel></rss>"
+
+
+def test_validators_are_read_from_lowercase_headers(feed_server):
+    server = feed_server(RSS, {"etag": '"v1"', "last-modified": "Wed, 14 Oct 2026 10:00:00 GMT", "content-type": "application/rss+xml"})
+
+    result = feed_fetcher.fetch_feed(1, server.url)
+
+    assert result.ok
+    assert result.etag == '"v1"'
+    assert result.last_modified == "Wed, 14 Oct 2026 10:00:00 GMT"
+    assert result.headers.get("Content-Type") == "application/rss+xml"
+
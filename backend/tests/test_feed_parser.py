@@ -0,0 +1,54 @@
+import re
+
+import pytest
+
+from backend.services import feed_parser
+
+BASE_URL = "https://example.com/feed.xml"
+
+RSS = b"""<?xml version='1.0'?>
+<rss version='2.0' xmlns:content='http://purl.org/rss/1.0/modules/content/'><channel><title>t</title>
+<item>
+  <title>Hello &lt;b onclick="x()"&gt;world&lt;/b&gt;&lt;script&gt;alert(1)&lt;/script&gt;</title>
+  <link>https://example.com/a</link>
+  <description>&lt;p onclick="steal()"&gt;Intro&lt;script&gt;alert(1)&lt;/script&gt;&lt;style&gt;p{color:red}&lt;/style&gt; text &lt;a href="/rel" onmouseover="x()"&gt;link&lt;/a&gt;&lt;/p&gt;</description>
+  <content:encoded><![CDATA[<div><p style="color:red" onload="bad()">Body</p><script>alert(1)</script><iframe src="https://evil.example"></iframe><img src="/i.png" onerror="x()"></div>]]></content:encoded>
+  <pubDate>Wed, 14 Oct 2026 10:00:00 GMT</pubDate>
+</item>
+<item>
+  <title>AT&amp;T plain title</title>
+  <link>https://example.com/b</link>
+  <description>Plain &amp; simple</description>
+  <pubDate>Wed, 14 Oct 2026 09:00:00 GMT</pubDate>
+</item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version='1.0' encoding='utf-8'?>
+<feed xmlns='http://www.w3.org/2005/Atom'><title>t</title>
+<entry>
+  <title type='html'>Hi &lt;i&gt;there&lt;/i&gt;&lt;script&gt;alert(1)&lt;/script&gt;</title>
+  <link rel='alternate' href='https://example.com/c'/>
+  <summary type='html'>&lt;p onclick="steal()"&gt;Summary&lt;style&gt;p{}&lt;/style&gt;&lt;/p&gt;</summary>
+  <content type='xhtml'><div xmlns='http://www.w3.org/1999/xhtml'><p onmouseover='x()'>Body <a href='/rel'>link</a></p><script>alert(1)</script></div></content>
+  <updated>2026-10-14T10:00:00Z</updated>
+</entry>
+<entry>
+  <title>Text &lt;b&gt; stays text</title>
+  <link rel='alternate' href='https://example.com/d'/>
+  <summary>Plain summary</summary>
+  <updated>2026-10-14T09:00:00Z</updated>
+</entry>
+</feed>"""
+
+
+@pytest.mark.parametrize("body", [RSS, ATOM], ids=["rss", "atom"])
+def test_incremental_and_full_parsers_produce_the_same_records(body):
+    full = feed_parser.parse_feed(body, base_url=BASE_URL, mode="full")
+    incremental = feed_parser.parse_feed(body, base_url=BASE_URL, mode="incremental")
+
+    assert full["mode"] == "full" and incremental["mode"] == "incremental"
+    assert incremental["records"] == full["records"]
+    # Titles that do not look like HTML stay plain text, in both modes
+    for record in incremental["records"]:
+        for field in ("summary", "content"):
+            assert not re.search(r"<script|<style|<iframe|\son\w+=", record[field])
@@ -0,0 +1,107 @@
+import random
+
+from backend.benchmarks.bench_heuristic import legacy_heuristic
+from backend.services import heuristic_classifier
+
+# Words that contain no keyword of either taxonomy, even as a substring
+NEUTRAL = "the of to in and on new week year first after before report city region plan group board".split()
+
+
+def whole_word_keywords(taxonomy: dict, taxonomy_index: int) -> dict:
+    """
+    {label: keywords} for keywords the substring scan alone assigns to their
+    own label and to nothing in the other taxonomy ("tech" and "health" are in both).
+    """
+    defaults = (heuristic_classifier.UNCATEGORIZED, heuristic_classifier.GENERAL_INDUSTRY)
+    other = 1 - taxonomy_index
+    found = {}
+    for label, words in taxonomy.items():
+        for word in words:
+            word = word.rstrip("*")
+            result = legacy_heuristic(word, "")
+            if result[taxonomy_index] == label and result[other] == defaults[other]:
+                found.setdefault(label, []).append(word)
+    return found
+
+
+def corpus(count: int = 500, seed: int = 11) -> list:
+    """Texts with keywords of one STEEPV and one industry label among neutral words, some plural, some empty."""
+    rng = random.Random(seed)
+    steepv = whole_word_keywords(heuristic_classifier.STEEPV_KEYWORDS, 0)
+    industry = whole_word_keywords(heuristic_classifier.INDUSTRY_KEYWORDS, 1)
+    texts = []
+    for i in range(count):
+        words = [rng.choice(NEUTRAL) for _ in range(rng.randint(5, 20))]
+        if i % 10:
+            category_words = steepv[rng.choice(sorted(steepv))]
+            industry_words = industry[rng.choice(sorted(industry))]
+            for word in rng.sample(category_words, k=min(2, len(category_words))) + [rng.choice(industry_words)]:
+                words.insert(rng.randrange(len(words) + 1), word + ("s" if rng.random() < 0.2 else ""))
+        texts.append((" ".join(words[:4]).capitalize(), " ".join(words[4:])))
+    return texts
+
+
+def test_old_and_new_matchers_agree_on_whole_words():
+    texts = corpus()
+    legacy = [legacy_heuristic(title, summary)[:2] for title, summary in texts]
+    compiled = [result[:2] for result in heuristic_classifier.classify_many(texts)]
+    assert compiled == legacy
+    # The corpus covers every label
+    assert {steepv for steepv, _ in legacy} >= set(heuristic_classifier.STEEPV_KEYWORDS)
+    assert {industry for _, industry in legacy} >= set(heuristic_classifier.INDUSTRY_KEYWORDS)
+
+
+def test_keywords_inside_other_words_no_longer_match():
+    for text in ["She said it was paid", "The media remains", "A lawn and a gasp", "Email campaign domain"]:
+        assert heuristic_classifier.classify(text, "")[:2] == (heuristic_classifier.UNCATEGORIZED, heuristic_classifier.GENERAL_INDUSTRY)
+        assert legacy_heuristic(text, "")[:2] != (heuristic_classifier.UNCATEGORIZED, heuristic_classifier.GENERAL_INDUSTRY)
+
+
+def test_most_hits_wins_across_labels():
+    # The substring scan stopped at the first label with any hit
+    assert heuristic_classifier.classify("Data on climate, carbon and energy", "")[0] == "Environmental"
+    assert legacy_heuristic("Data on climate, carbon and energy", "")[0] == "Technological"
+
+
+def labels(text: str) -> tuple:
+    return heuristic_classifier.classify(text, "")[:2]
+
+
+def test_short_keywords_only_match_whole_words():
+    assert labels("She said so")[0] == heuristic_classifier.UNCATEGORIZED
+    assert labels("The AI said so")[0] == "Technological"
+    assert labels("The media remains")[1] == heuristic_classifier.GENERAL_INDUSTRY
+    assert labels("The medical board")[1] == "Healthcare"
+    assert labels("A lawn")[0] == heuristic_classifier.UNCATEGORIZED
+    assert labels("A law")[0] == "Political"
+
+
+def test_stems_match_inflections():
+    assert labels("Markets rally")[0] == "Economic"
+    assert labels("Regulators step in")[0] == "Political"
+    assert labels("Regulation is coming")[0] == "Political"
+    assert labels("A pharmaceutical merger")[1] == "Healthcare"
+    assert labels("Robotics at scale")[0] == "Technological"
+
+
+def test_plain_words_match_their_plural_only():
+    assert labels("Clouds everywhere")[1] == "Technology"
+    assert labels("A database outage")[0] == heuristic_classifier.UNCATEGORIZED
+    assert labels("Greenery in the city")[0] == heuristic_classifier.UNCATEGORIZED
+
+
+def test_phrases_match_across_whitespace():
+    assert labels("Machine\n   learning in the wild")[0] == "Technological"
+    assert labels("The machine is learning")[0] == heuristic_classifier.UNCATEGORIZED
+
+
+def test_ties_go_to_the_first_listed_label():
+    assert labels("data about society") == ("Social", heuristic_classifier.GENERAL_INDUSTRY)
+    assert labels("society then data") == ("Social", heuristic_classifier.GENERAL_INDUSTRY)
+    assert labels("oil and bank shares")[1] == "Finance"
+
+
+def test_classify_many_matches_single_calls():
+    texts = corpus(count=100, seed=5) + [("Inflation cools", None), (None, "Hospitals struggle"), (None, None)]
+    expected = [heuristic_classifier.classify(title or "", summary or "") for title, summary in texts]
+    assert heuristic_classifier.classify_many(texts) == expected
@@ -0,0 +1,25 @@
+from backend import models
+from backend.services import heuristic_classifier, local_classifier
+
+
+def test_training_samples_skip_self_produced_labels_even_when_rated(db):
+    feed = models.Feed(name="Training", url="https://example.com/training.xml")
+    db.add(feed)
+    db.commit()
+    articles = {
+        reasoning: models.Article(
+            feed_id=feed.id, title=reasoning, url=f"https://example.com/training/{i}", steepv_category="Social",
+            signal_strength="strong", classification_status="done", ai_reasoning=reasoning,
+        )
+        for i, reasoning in enumerate([
+            "Mentions a shift in consumer habits",
+            heuristic_classifier.REASONING,
+            f"{local_classifier.REASONING_PREFIX} (92% confidence)",
+        ])
+    }
+    db.add_all(articles.values())
+    db.commit()
+
+    ids = {row[0] for row in local_classifier.training_samples(db, ["Social"])}
+
+    assert [reasoning for reasoning, article in articles.items() if article.id in ids] == ["Mentions a shift in consumer habits"]
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import ai_service
+
+
+class RateLimited(Exception):
+    def __str__(self):
+        return "429 Too Many Requests"
+
+
+class FlakyStreamModel:
+    """Streams `chunks` per call; the first call raises a 429 after `fail_after` chunks."""
+
+    def __init__(self, chunks, fail_after):
+        self.chunks, self.fail_after, self.calls = chunks, fail_after, 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        first = self.calls == 1
+
+        def response():
+            for i, text in enumerate(self.chunks):
+                if first and i == self.fail_after:
+                    raise RateLimited()
+                yield SimpleNamespace(text=text)
+
+        return response()
+
+
+def test_failure_before_any_text_is_retried():
+    model, received = FlakyStreamModel(["Hello ", "world"], fail_after=0), []
+
+    response = ai_service.generate_content_streaming(model, "prompt", received.append, retries=3, initial_delay=0)
+
+    assert model.calls == 2
+    assert received == ["Hello ", "world"]
+    assert response.text == "Hello world"
+
+
+def test_failure_after_partial_text_is_not_retried():
+    model, received = FlakyStreamModel(["Hello ", "world"], fail_after=1), []
+
+    with pytest.raises(ai_service.StreamInterrupted):
+        ai_service.generate_content_streaming(model, "prompt", received.append, retries=3, initial_delay=0)
+
+    assert model.calls == 1
+    assert received == ["Hello "]
@@ -0,0 +1,50 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from backend import models
+from backend.services import ai_service, scheduler
+
+CATEGORIES = ["Social", "Economic"]
+INDUSTRIES = ["Cache Test Retail", "Cache Test Energy"]
+
+
+class EchoModel:
+    rate_limited = False
+
+    def generate_content(self, prompt):
+        return SimpleNamespace(text=f"Summary of {len(prompt)} characters")
+
+
+def test_weekly_industry_reports_reuse_the_category_reports_batches(db, monkeypatch):
+    feed = models.Feed(name="Trend cache", url="https://example.com/trend-cache.xml")
+    db.add(feed)
+    db.commit()
+    db.add_all([
+        models.Article(
+            feed_id=feed.id, title=f"{category} signal {i} in {industry}", url=f"https://example.com/trend-cache/{category}/{industry}/{i}",
+            excerpt="Something is changing", steepv_category=category, industry=industry, signal_strength="medium",
+            classification_status="done", created_at=datetime.utcnow(),
+        )
+        for category in CATEGORIES for industry in INDUSTRIES for i in range(6)
+    ])
+    db.commit()
+
+    monkeypatch.setattr(ai_service, "llm_available", lambda db: True)
+    monkeypatch.setattr(ai_service, "get_llm_client", lambda db: EchoModel())
+    generate, reports = ai_service.generate_trend_summary, {}
+
+    def recording(articles, db, **kwargs):
+        stats = {}
+        text = generate(articles, db, **{**kwargs, "stats": stats})
+        reports[kwargs.get("category") or kwargs.get("industry")] = stats
+        return text
+
+    monkeypatch.setattr(ai_service, "generate_trend_summary", recording)
+    scheduler.run_weekly_reports()
+
+    for industry in INDUSTRIES:
+        stats = reports[industry]
+        assert stats["map_batches"] == len(CATEGORIES)
+        assert stats["map_cache_hits"] == stats["map_batches"]
+        # Only the final synthesis goes to the model
+        assert stats["llm_calls"] == 1
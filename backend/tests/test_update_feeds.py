@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+from backend import models
+from backend.services import feed_fetcher, feed_health, rss_service
+from backend.tests.test_conditional_get import rss
+
+
+def test_a_failing_feed_keeps_the_other_feeds_schedules(db, feed_server, monkeypatch):
+    # One download at a time, so the good feed is stored before the 404 rolls back
+    monkeypatch.setattr(feed_fetcher, "MAX_CONCURRENT_FETCHES", 1)
+    good_server = feed_server(rss("https://example.com/update-feeds-good"), {"Content-Type": "application/rss+xml"})
+    bad_server = feed_server(b"", {}, status=404)
+    good = models.Feed(name="Good", url=good_server.url)
+    bad = models.Feed(name="Gone", url=bad_server.url)
+    db.add_all([good, bad])
+    db.commit()
+
+    report = rss_service.update_feeds(db, [good, bad])
+
+    assert report["total_new_articles"] == 1
+    db.expire_all()
+    assert good.next_fetch_at is not None
+    assert bad.next_fetch_at is not None
+    assert bad.consecutive_failures == 1
+
+
+def test_a_failing_feed_keeps_the_skipped_feeds_cool_downs(db, feed_server):
+    bad_server = feed_server(b"", {}, status=404)
+    resume_at = datetime.utcnow() + timedelta(hours=1)
+    skipped = models.Feed(
+        name="Cooling down", url="http://skipped.invalid/feed.xml",
+        consecutive_failures=feed_health.FAILURE_THRESHOLD, circuit_open_until=resume_at,
+    )
+    bad = models.Feed(name="Gone", url=bad_server.url)
+    db.add_all([skipped, bad])
+    db.commit()
+
+    report = rss_service.update_feeds(db, [skipped, bad])
+
+    assert report["skipped_feeds"] == 1
+    db.expire_all()
+    assert skipped.next_fetch_at == resume_at
+
+
+def test_only_server_failures_count_against_the_host(db, feed_server):
+    gone_server = feed_server(b"", {}, status=404)
+    down_server = feed_server(b"", {}, status=503)
+    gone = models.Feed(name="Retired path", url=gone_server.url)
+    down = models.Feed(name="Server down", url=down_server.url)
+    db.add_all([gone, down])
+    db.commit()
+
+    for _ in range(feed_health.FAILURE_THRESHOLD):
+        rss_service.ingest_feed(db, gone)
+        rss_service.ingest_feed(db, down)
+
+    assert feed_health.feed_state(gone) == feed_health.OPEN
+    assert feed_health.host_state(gone.url) == feed_health.CLOSED
+    assert feed_health.feed_state(down) == feed_health.OPEN
+    assert feed_health.host_state(down.url) == feed_health.OPEN
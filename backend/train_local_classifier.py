@@ -0,0 +1,80 @@
+"""
+Trains and evaluates the local STEEPV classifier (services/local_classifier).
+
+  python -m backend.train_local_classifier train [--out PATH]
+      Fits on every settled article and writes the artifact that the
+      classification path loads (LOCAL_CLASSIFIER_PATH by default).
+
+  python -m backend.train_local_classifier evaluate [--holdout 5]
+      Fits on all but every Nth article (by id) and reports accuracy on the
+      rest, with the share of articles that would skip Gemini and the
+      accuracy on those at several thresholds. Nothing is written.
+"""
+import argparse
+import os
+import time
+
+from backend import database
+from backend.services import ai_service, local_classifier
+
+THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.9, 0.95]
+
+
+def load_samples():
+    db = database.SessionLocal()
+    try:
+        return local_classifier.training_samples(db, ai_service.STEEPV_CATEGORIES)
+    finally:
+        db.close()
+
+
+def train(args):
+    samples = load_samples()
+    if not samples:
+        print("No settled articles to train on")
+        return
+    start = time.perf_counter()
+    model = local_classifier.train([(title, text, label) for _, title, text, label in samples], epochs=args.epochs)
+    local_classifier.save(model, args.out)
+    print(f"Trained on {len(samples)} articles in {time.perf_counter() - start:.1f}s: {model.meta['label_counts']}")
+    print(f"Vocabulary {len(model.vocabulary)} terms, artifact {os.path.getsize(args.out) / 1024:.0f} KiB at {args.out}")
+
+
+def evaluate(args):
+    samples = load_samples()
+    train_set = [(title, text, label) for article_id, title, text, label in samples if article_id % args.holdout]
+    test_set = [(title, text, label) for article_id, title, text, label in samples if not article_id % args.holdout]
+    if not train_set or not test_set:
+        print(f"Not enough settled articles to evaluate ({len(samples)})")
+        return
+    model = local_classifier.train(train_set, epochs=args.epochs)
+    print(f"Trained on {len(train_set)}, evaluated on {len(test_set)} held-out articles")
+
+    report = local_classifier.evaluate(model, test_set)
+    print(f"Accuracy {report['accuracy']:.1%}")
+    print("Recall per label: " + ", ".join(f"{label} {recall:.0%}" for label, recall in report["recall_per_label"].items()))
+    print(f"{'threshold':>9} {'skip Gemini':>12} {'accuracy there':>15}")
+    for threshold in THRESHOLDS:
+        report = local_classifier.evaluate(model, test_set, threshold)
+        accuracy = report["accuracy_above_threshold"]
+        marker = "  <- LOCAL_CLASSIFIER_THRESHOLD" if threshold == local_classifier.THRESHOLD else ""
+        accuracy = "-" if accuracy is None else f"{accuracy:.1%}"
+        print(f"{threshold:>9.2f} {report['coverage']:>12.1%} {accuracy:>15}{marker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or evaluate the local STEEPV classifier")
+    parser.add_argument("--epochs", type=int, default=local_classifier.EPOCHS)
+    commands = parser.add_subparsers(dest="command", required=True)
+    train_parser = commands.add_parser("train", help="Fit on all settled articles and save the artifact")
+    train_parser.add_argument("--out", default=local_classifier.MODEL_PATH)
+    train_parser.set_defaults(run=train)
+    evaluate_parser = commands.add_parser("evaluate", help="Hold out every Nth article and report accuracy")
+    evaluate_parser.add_argument("--holdout", type=int, default=5, help="Hold out articles whose id is divisible by N")
+    evaluate_parser.set_defaults(run=evaluate)
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,8 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
 import random
 
-DATABASE_URL = "sqlite:///./foresight.db"
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from backend.database import SessionLocal
+
 db = SessionLocal()
 
 categories = ["Social", "Technological", "Economic", "Environmental", "Political", "Values"]
@@ -143,7 +143,7 @@ export default function CurationPage() {
                                         {/* Summary + Link */}
                                         <div className="space-y-2">
                                             <p className="text-sm text-muted-foreground leading-relaxed">
-                                                {article.summary}
+                                                {article.excerpt ?? article.summary}
                                             </p>
                                             <a
                                                 href={article.url}
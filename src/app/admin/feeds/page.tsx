@@ -215,6 +215,7 @@ export default function FeedsPage() {
                                 <TableHead>URL</TableHead>
                                 <TableHead>Category</TableHead>
                                 <TableHead>Last Checked</TableHead>
+                                <TableHead>Health</TableHead>
                                 <TableHead className="text-right">Actions</TableHead>
                             </TableRow>
                         </TableHeader>
@@ -276,6 +277,23 @@ export default function FeedsPage() {
                                             ? formatDistanceToNow(new Date(feed.last_fetched_at), { addSuffix: true })
                                             : "Never"}
                                     </TableCell>
+                                    <TableCell className="text-sm">
+                                        {feed.circuit_state === "open" || feed.host_circuit_state === "open" ? (
+                                            <Badge variant="destructive" title={feed.last_error || undefined}>
+                                                Skipped{feed.circuit_open_until
+                                                    ? ` until ${formatDistanceToNow(new Date(feed.circuit_open_until), { addSuffix: true })}`
+                                                    : ""}
+                                            </Badge>
+                                        ) : feed.circuit_state === "half_open" || feed.host_circuit_state === "half_open" ? (
+                                            <Badge variant="secondary" title={feed.last_error || undefined}>Probing</Badge>
+                                        ) : feed.consecutive_failures > 0 ? (
+                                            <Badge variant="outline" title={feed.last_error || undefined}>
+                                                {feed.consecutive_failures} failed
+                                            </Badge>
+                                        ) : (
+                                            <span className="text-muted-foreground">OK</span>
+                                        )}
+                                    </TableCell>
                                     <TableCell className="text-right">
                                         <div className="flex gap-2 justify-end">
                                             {editingId === feed.id ? (
@@ -1,9 +1,10 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { fetchLogs } from "@/lib/api";
+import { fetchLogsPage } from "@/lib/api";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
+import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table";
@@ -24,12 +25,15 @@ export default function LogsPage() {
     const [loading, setLoading] = useState(true);
     const [levelFilter, setLevelFilter] = useState("ALL");
     const [search, setSearch] = useState("");
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     const loadLogs = async () => {
         setLoading(true);
         try {
-            const data = await fetchLogs(0, 100, levelFilter, undefined, search);
-            setLogs(data);
+            const page = await fetchLogsPage(100, levelFilter, undefined, search);
+            setLogs(page.logs);
+            setNextCursor(page.nextCursor);
         } catch (error) {
             console.error("Failed to fetch logs", error);
         } finally {
@@ -37,6 +41,20 @@ export default function LogsPage() {
         }
     };
 
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const page = await fetchLogsPage(100, levelFilter, undefined, search, nextCursor);
+            setLogs((current) => [...current, ...page.logs]);
+            setNextCursor(page.nextCursor);
+        } catch (error) {
+            console.error("Failed to fetch logs", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         const debounce = setTimeout(() => {
             loadLogs();
@@ -127,6 +145,14 @@ export default function LogsPage() {
                                     )}
                                 </TableBody>
                             </Table>
+                            {nextCursor && (
+                                <div className="flex justify-center p-4 border-t">
+                                    <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+                                        {loadingMore && <Loader2 className="w-4 h-4 mr-2 animate-spin" />}
+                                        Load more
+                                    </Button>
+                                </div>
+                            )}
                         </div>
                     )}
                 </CardContent>
@@ -151,6 +151,7 @@ export default function SettingsPage() {
                                 <SelectItem value="hourly">Hourly</SelectItem>
                                 <SelectItem value="daily">Daily</SelectItem>
                                 <SelectItem value="weekly">Weekly</SelectItem>
+                                <SelectItem value="adaptive">Adaptive (per feed, learned from publishing rate)</SelectItem>
                             </SelectContent>
                         </Select>
                     </div>
@@ -1,7 +1,7 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { generateTrendSummary, getTrendSummaries } from "@/lib/api";
+import { streamTrendSummary, getTrendSummaries } from "@/lib/api";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
 import { format } from "date-fns";
@@ -28,7 +28,7 @@ export default function TrendsPage() {
     const handleGenerate = async () => {
         setGenerating(true);
         try {
-            await generateTrendSummary();
+            await streamTrendSummary();
             loadSummaries();
         } catch (error) {
             console.error(error);
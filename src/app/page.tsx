@@ -290,7 +290,7 @@ export default function PublicPage() {
                             </CardHeader>
                             <CardContent className="flex-1">
                               <p className="text-muted-foreground text-sm line-clamp-3 mb-4">
-                                {article.summary}
+                                {article.excerpt ?? article.summary}
                               </p>
                               {article.ai_reasoning && (
                                 <div className="bg-muted/50 p-3 rounded text-xs text-muted-foreground italic">
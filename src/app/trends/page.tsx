@@ -1,7 +1,7 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { getTrendSummaries, deleteTrendSummary, generateTrendSummary } from "@/lib/api";
+import { getTrendSummaries, deleteTrendSummary, streamTrendSummary, TrendReportProgress } from "@/lib/api";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader } from "@/components/ui/card";
 import { Loader2, FileText, Calendar, Trash2, AlertTriangle, Sparkles } from "lucide-react";
@@ -19,6 +19,15 @@ import {
 } from "@/components/ui/alert-dialog";
 import { toast } from "sonner";
 
+const GENERATING_CONTENT = "Report generation in progress...";
+
+const describeProgress = (progress: TrendReportProgress | null) => {
+    if (!progress) return "AI is analyzing signals and synthesizing trends. This may take a minute.";
+    if (progress.stage === "map") return `Summarizing article batches: ${progress.done} of ${progress.total}`;
+    if (progress.stage === "reduce") return `Merging summaries (level ${progress.level}): ${progress.done} of ${progress.total}`;
+    return "Writing the final report...";
+};
+
 interface TrendSummary {
     id: number;
     content: string; // Fixed from summary_text to match backend
@@ -31,6 +40,8 @@ export default function TrendsPage() {
     const [loading, setLoading] = useState(true);
     const [generating, setGenerating] = useState(false);
     const [deletingId, setDeletingId] = useState<number | null>(null);
+    const [streamingId, setStreamingId] = useState<number | null>(null);
+    const [progress, setProgress] = useState<TrendReportProgress | null>(null);
 
     const loadSummaries = async () => {
         setLoading(true);
@@ -50,7 +61,7 @@ export default function TrendsPage() {
         // Poll for updates if any report is generating
         const interval = setInterval(() => {
             setSummaries(currentSummaries => {
-                const hasGenerating = currentSummaries.some(s => s.content === "Report generation in progress...");
+                const hasGenerating = currentSummaries.some(s => s.content.startsWith(GENERATING_CONTENT));
                 if (hasGenerating) {
                     loadSummaries();
                 }
@@ -76,17 +87,28 @@ export default function TrendsPage() {
 
     const handleGenerate = async () => {
         setGenerating(true);
+        setProgress(null);
+        let reportId: number | null = null;
         try {
-            await generateTrendSummary();
-            toast.success("Report generation started in background");
-            // Refresh list after a short delay to show the "Generating..." placeholder
-            setTimeout(() => {
-                loadSummaries();
-            }, 1000);
+            // Progress and the report text arrive over one stream instead of polling
+            const report = await streamTrendSummary(7, "medium", {
+                onCreated: ({ id, title }) => {
+                    reportId = id;
+                    setStreamingId(id);
+                    setSummaries(prev => [{ id, title, content: "", created_at: new Date().toISOString() }, ...prev]);
+                },
+                onProgress: setProgress,
+                onText: (text) => setSummaries(prev => prev.map(s => s.id === reportId ? { ...s, content: s.content + text } : s)),
+            });
+            setSummaries(prev => prev.map(s => s.id === report.id ? report : s));
+            toast.success("Report generated");
         } catch (error) {
-            toast.error("Failed to start report generation");
+            toast.error("Failed to generate report");
+            loadSummaries();
         } finally {
             setGenerating(false);
+            setStreamingId(null);
+            setProgress(null);
         }
     };
 
@@ -166,11 +188,13 @@ export default function TrendsPage() {
                                 </div>
 
                                 <div className="lg:col-span-9 prose prose-invert prose-lg max-w-none">
-                                    {summary.content === "Report generation in progress..." ? (
+                                    {summary.content.startsWith(GENERATING_CONTENT) || (summary.id === streamingId && !summary.content) ? (
                                         <div className="bg-card/50 backdrop-blur-sm p-12 rounded-xl border border-border/50 flex flex-col items-center justify-center text-center animate-pulse">
                                             <Loader2 className="w-12 h-12 animate-spin text-accent mb-4" />
                                             <h3 className="text-xl font-bold mb-2">Generating Intelligence Report...</h3>
-                                            <p className="text-muted-foreground">AI is analyzing signals and synthesizing trends. This may take a minute.</p>
+                                            <p className="text-muted-foreground">
+                                                {summary.id === streamingId ? describeProgress(progress) : summary.content.slice(GENERATING_CONTENT.length).trim() || describeProgress(null)}
+                                            </p>
                                         </div>
                                     ) : (
                                         <div className="bg-card/50 backdrop-blur-sm p-8 rounded-xl border border-border/50">
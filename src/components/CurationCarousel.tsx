@@ -7,7 +7,7 @@ import { Card, CardContent, CardFooter, CardHeader } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge";
 import { Button } from "@/components/ui/button";
 import { Popover, PopoverContent, PopoverTrigger } from "@/components/ui/popover";
-import { curateArticle } from "@/lib/api";
+import { curateArticle, fetchArticleContent } from "@/lib/api";
 import { toast } from "sonner";
 
 import { Article } from "@/types";
@@ -24,8 +24,26 @@ export default function CurationCarousel({ articles, onUpdate, onArticleUpdate }
     const [currentIndex, setCurrentIndex] = useState(0);
     const [direction, setDirection] = useState(0);
 
+    const [fullText, setFullText] = useState<{ id: number; text: string } | null>(null);
+    const [loadingFullText, setLoadingFullText] = useState(false);
+
     const currentArticle = articles[currentIndex];
     const displaySignalStrength = currentArticle?.signal_strength;
+    const showingFullText = fullText !== null && fullText.id === currentArticle?.id;
+
+    // The list endpoint only sends the excerpt; the body is fetched on demand
+    const loadFullText = useCallback(async () => {
+        if (!currentArticle) return;
+        setLoadingFullText(true);
+        try {
+            const body = await fetchArticleContent(currentArticle.id);
+            setFullText({ id: currentArticle.id, text: body.plain_text || currentArticle.excerpt || "" });
+        } catch (error) {
+            toast.error("Failed to load the full article");
+        } finally {
+            setLoadingFullText(false);
+        }
+    }, [currentArticle]);
 
     const handleNext = useCallback(() => {
         if (currentIndex < articles.length - 1) {
@@ -288,9 +306,14 @@ export default function CurationCarousel({ articles, onUpdate, onArticleUpdate }
                                         <img src={currentArticle.image_url} alt="Article thumbnail" className="w-full h-64 object-cover hover:scale-105 transition-transform duration-700" />
                                     </div>
                                 )}
-                                <p className="text-lg leading-relaxed text-card-foreground/90 font-serif">
-                                    {currentArticle.summary}
+                                <p className="text-lg leading-relaxed text-card-foreground/90 font-serif whitespace-pre-line">
+                                    {showingFullText ? fullText.text : (currentArticle.excerpt ?? currentArticle.summary)}
                                 </p>
+                                {!showingFullText && (
+                                    <Button variant="ghost" size="sm" onClick={loadFullText} disabled={loadingFullText} className="mt-4 px-0 text-primary">
+                                        {loadingFullText ? "Loading..." : "Show full text"}
+                                    </Button>
+                                )}
                             </CardContent>
 
                             <CardFooter className="pt-4 pb-6 pl-8 border-t border-border/50 flex justify-between items-center bg-muted/10">
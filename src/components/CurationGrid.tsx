@@ -105,7 +105,7 @@ export default function CurationGrid({ articles, onUpdate, onArticleUpdate }: Cu
                         </h3>
 
                         <p className="text-muted-foreground text-sm leading-relaxed line-clamp-3 mb-4 flex-1">
-                            {article.summary}
+                            {article.excerpt ?? article.summary}
                         </p>
 
                         <div className="pt-4 border-t border-border/30 flex justify-between items-center mt-auto">
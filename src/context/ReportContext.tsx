@@ -1,7 +1,7 @@
 "use client";
 
 import { createContext, useContext, useState, ReactNode } from "react";
-import { generateTrendSummary } from "@/lib/api";
+import { streamTrendSummary } from "@/lib/api";
 import { toast } from "sonner";
 
 interface ReportContextType {
@@ -24,7 +24,7 @@ export function ReportProvider({ children }: { children: ReactNode }) {
             // We don't await this here if we want to unblock immediately, 
             // but since we want to track status, we await it. 
             // Because this component is at the Layout level, it won't unmount on navigation.
-            await generateTrendSummary(days, minSignal);
+            await streamTrendSummary(days, minSignal);
             toast.success("Trend report generated successfully!");
         } catch (error) {
             console.error("Report generation failed", error);
@@ -21,6 +21,13 @@ export async function fetchArticles(category?: string, industry?: string, startD
     return res.json();
 }
 
+// The full summary/content HTML, which the list endpoints leave out
+export async function fetchArticleContent(id: number) {
+    const res = await fetch(`${API_BASE_URL}/articles/${id}/content`);
+    if (!res.ok) throw new Error("Failed to fetch article content");
+    return res.json();
+}
+
 export async function createFeed(url: string, name?: string, category?: string) {
     const res = await fetch(`${API_BASE_URL}/feeds/`, {
         method: "POST",
@@ -110,6 +117,56 @@ export async function generateTrendSummary(days: number = 7, minSignal: string =
     return res.json();
 }
 
+export interface TrendReportProgress {
+    stage: "map" | "reduce" | "final";
+    level: number;
+    done: number;
+    total: number;
+}
+
+export interface TrendReportStreamHandlers {
+    onCreated?: (summary: { id: number; title: string }) => void;
+    onProgress?: (progress: TrendReportProgress) => void;
+    onText?: (text: string) => void;
+}
+
+// Generates a report over Server-Sent Events; resolves with the saved summary
+export async function streamTrendSummary(days: number = 7, minSignal: string = "medium", handlers: TrendReportStreamHandlers = {}) {
+    const res = await fetch(`${API_BASE_URL}/curation/generate-summary/stream?days=${days}&min_signal_strength=${minSignal}`, {
+        method: "POST",
+        headers: { Accept: "text/event-stream" },
+    });
+    if (!res.ok || !res.body) throw new Error("Failed to generate summary");
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            let event = "message";
+            let data = "";
+            for (const line of block.split("\n")) {
+                if (line.startsWith("event: ")) event = line.slice(7);
+                else if (line.startsWith("data: ")) data += line.slice(6);
+            }
+            if (!data) continue; // keep-alive comment
+            const payload = JSON.parse(data);
+            if (event === "created") handlers.onCreated?.(payload);
+            else if (event === "progress") handlers.onProgress?.(payload);
+            else if (event === "text") handlers.onText?.(payload.text);
+            else if (event === "done") return payload;
+            else if (event === "error") throw new Error(payload.detail);
+        }
+    }
+    throw new Error("Report stream ended before the report was finished");
+}
+
 export async function fetchLogs(skip = 0, limit = 50, level?: string, eventType?: string, search?: string) {
     const params = new URLSearchParams({ skip: skip.toString(), limit: limit.toString() });
     if (level && level !== "ALL") params.append("level", level);
@@ -121,6 +178,19 @@ export async function fetchLogs(skip = 0, limit = 50, level?: string, eventType?
     return res.json();
 }
 
+// Keyset paging: pass the nextCursor of the previous page to get the one after it
+export async function fetchLogsPage(limit = 50, level?: string, eventType?: string, search?: string, cursor?: string | null) {
+    const params = new URLSearchParams({ limit: limit.toString() });
+    if (level && level !== "ALL") params.append("level", level);
+    if (eventType && eventType !== "ALL") params.append("event_type", eventType);
+    if (search) params.append("search", search);
+    if (cursor) params.append("cursor", cursor);
+
+    const res = await fetch(`${API_BASE_URL}/logs/?${params.toString()}`);
+    if (!res.ok) throw new Error("Failed to fetch logs");
+    return { logs: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") };
+}
+
 export async function getTrendSummaries() {
     const res = await fetch(`${API_BASE_URL}/curation/summaries`);
     if (!res.ok) throw new Error("Failed to fetch summaries");
@@ -1,7 +1,9 @@
 export interface Article {
     id: number;
     title: string;
-    summary: string;
+    summary?: string;
+    excerpt?: string | null;
+    word_count?: number | null;
     link: string;
     published_at: string;
     source: string;